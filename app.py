@@ -3,7 +3,6 @@ from pathlib import Path
 import tempfile
 # External packages
 import streamlit as st
-import cv2
 from PIL import Image
 # Local Modules
 import configurations
@@ -73,14 +72,16 @@ def select_model_and_confidence():
     if task == 'Detection':
         model_name = st.selectbox("Select Model", configurations.DETECTION_MODEL_LIST)
         model_path = Path(configurations.MODEL_DIR, 'detection', str(model_name))
+        model_task = 'detect'
     elif task == 'Segmentation':
         model_name = st.selectbox("Select Model", configurations.SEGMENTATION_MODEL_LIST)
         model_path = Path(configurations.MODEL_DIR, 'segmentation', str(model_name))
+        model_task = 'segment'
 
     st.write("**Note:** Models are listed from less detailed and fastest to slowest and most detailed.")
 
     try:
-        model = utilities.initialize_detector(model_path)
+        model = utilities.initialize_detector(model_path, task=model_task)  # cached across reruns and sessions
     except Exception as e:
         st.error(f"Unable to load model. Check the specified path: {model_path}")
         st.error(e)
@@ -139,6 +140,9 @@ def process_video_input(model, confidence):
     Process video input for object detection.
     """
     video_file = st.sidebar.file_uploader("Choose a video...", type=["mp4", "avi", "mov"])
+    batch_size = st.sidebar.select_slider("Frames per Batch", options=configurations.VIDEO_BATCH_SIZES,
+                                          value=configurations.DEFAULT_VIDEO_BATCH_SIZE,
+                                          help="Number of video frames analysed together in one model call.")
     col1, col2 = st.columns(2)
 
     with col1:
@@ -152,7 +156,7 @@ def process_video_input(model, confidence):
             if st.sidebar.button('Detect Objects'):
                 temp_file = process_video_file(video_file)
                 if temp_file:
-                    detect_objects_in_video(model, confidence, temp_file)
+                    detect_objects_in_video(model, confidence, temp_file, batch_size)
         else:
             default_detect_video_path = str(configurations.DEFAULT_DETECT_VIDEO)
             st.video(default_detect_video_path, format='video/mp4', start_time=0)
@@ -171,19 +175,11 @@ def process_video_file(video_file):
         st.error(e)
         return None
 
-def detect_objects_in_video(model, confidence, video_path):
+def detect_objects_in_video(model, confidence, video_path, batch_size=1):
     """
-    Perform object detection in a video.
+    Perform object detection in a video, analysing `batch_size` frames per model call.
     """
-    vid_cap = cv2.VideoCapture(video_path)
-    st_frame = st.empty()
-    while vid_cap.isOpened():
-        success, image = vid_cap.read()
-        if success:
-            utilities.show_detection_results(confidence, model, st_frame, image)
-        else:
-            vid_cap.release()
-            break
+    utilities.play_video(confidence, model, video_path, batch_size=batch_size)
 
 def main():
     """
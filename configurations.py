@@ -58,4 +58,24 @@ SEGMENTATION_MODELS = {
 SEGMENTATION_MODEL_LIST = list(SEGMENTATION_MODELS.keys())
 
 # Webcam configuration
-WEBCAM_PATH = 0
\ No newline at end of file
+WEBCAM_PATH = 0
+
+# Model cache configuration
+MODEL_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # memory budget shared by all cached models (1 GB)
+MODEL_DEVICE = None  # None selects CUDA when available, else CPU
+MODEL_HALF = False
+
+# Inference pool configuration, used when more than one replica is requested
+MODEL_POOL_REPLICAS = 1  # model copies serving concurrent sessions, 1 shares a single model
+MODEL_POOL_THREADS = None  # torch thread count per replica (not pinned to cores), None divides the cores
+MODEL_POOL_MAX_BATCH = 8  # requests from different sessions predicted together
+MODEL_POOL_MAX_WAIT = 0.005  # seconds a replica waits to fill a batch
+MODEL_POOL_MAX_QUEUE = 64  # pending requests before new ones wait for space
+
+# Video pipeline configuration
+FRAME_WIDTH = 720
+FRAME_HEIGHT = int(FRAME_WIDTH * (9 / 16))
+PIPELINE_QUEUE_SIZE = 4  # frames buffered between capture, inference and display
+PIPELINE_STATS_INTERVAL = 30  # refresh the stage statistics every N displayed frames
+VIDEO_BATCH_SIZES = [1, 2, 4, 8, 16, 32]  # frames per inference call for uploaded videos
+DEFAULT_VIDEO_BATCH_SIZE = 8
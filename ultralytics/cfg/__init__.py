@@ -93,7 +93,7 @@ CLI_HELP_MSG = f"""
     """
 
 # Define keys for arg type checks
-CFG_FLOAT_KEYS = "warmup_epochs", "box", "cls", "dfl", "degrees", "shear", "time"
+CFG_FLOAT_KEYS = "warmup_epochs", "box", "cls", "dfl", "degrees", "shear", "time", "vid_start", "vid_end", "vid_fps"
 CFG_FRACTION_KEYS = (
     "dropout",
     "iou",
@@ -128,7 +128,10 @@ CFG_INT_KEYS = (
     "close_mosaic",
     "mask_ratio",
     "max_det",
+    "ap_bins",
+    "shards",
     "vid_stride",
+    "vid_workers",
     "line_width",
     "workspace",
     "nbs",
@@ -152,6 +155,7 @@ CFG_BOOL_KEYS = (
     "show",
     "save_txt",
     "save_conf",
+    "save_norm",
     "save_crop",
     "save_frames",
     "show_labels",
@@ -169,6 +173,8 @@ CFG_BOOL_KEYS = (
     "nms",
     "profile",
     "multi_scale",
+    "img_reduce",
+    "tensor_preprocess",
 )
 
 
@@ -693,13 +693,21 @@ class LetterBox:
         self.stride = stride
         self.center = center  # Put the image in the middle or top-left
 
-    def __call__(self, labels=None, image=None):
-        """Return updated labels and image with added border."""
-        if labels is None:
-            labels = {}
-        img = labels.get("img") if image is None else image
-        shape = img.shape[:2]  # current shape [height, width]
-        new_shape = labels.pop("rect_shape", self.new_shape)
+    def get_params(self, shape, new_shape=None):
+        """
+        Compute the letterbox geometry for an image of the given shape.
+
+        Args:
+            shape (tuple): Input image shape (height, width).
+            new_shape (int | tuple, optional): Target shape, defaults to self.new_shape.
+
+        Returns:
+            ratio (tuple): Width and height scale ratios.
+            new_unpad (tuple): Resized image size (width, height) before padding.
+            pad (tuple): Padding (dw, dh) applied to each side when centered, used to update labels.
+            border (tuple): Integer border sizes (top, bottom, left, right).
+        """
+        new_shape = self.new_shape if new_shape is None else new_shape
         if isinstance(new_shape, int):
             new_shape = (new_shape, new_shape)
 
@@ -723,10 +731,23 @@ class LetterBox:
             dw /= 2  # divide padding into 2 sides
             dh /= 2
 
-        if shape[::-1] != new_unpad:  # resize
-            img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
         top, bottom = int(round(dh - 0.1)) if self.center else 0, int(round(dh + 0.1))
         left, right = int(round(dw - 0.1)) if self.center else 0, int(round(dw + 0.1))
+        return ratio, new_unpad, (dw, dh), (top, bottom, left, right)
+
+    def __call__(self, labels=None, image=None):
+        """Return updated labels and image with added border."""
+        if labels is None:
+            labels = {}
+        img = labels.get("img") if image is None else image
+        shape = img.shape[:2]  # current shape [height, width]
+        new_shape = labels.pop("rect_shape", self.new_shape)
+        if isinstance(new_shape, int):
+            new_shape = (new_shape, new_shape)
+        ratio, new_unpad, (dw, dh), (top, bottom, left, right) = self.get_params(shape, new_shape)
+
+        if shape[::-1] != new_unpad:  # resize
+            img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
         img = cv2.copyMakeBorder(
             img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114)
         )  # add border
@@ -11,13 +11,16 @@ from torch.utils.data import dataloader, distributed
 
 from ultralytics.data.loaders import (
     LOADERS,
+    LoadImageBatches,
     LoadImages,
     LoadPilAndNumpy,
     LoadScreenshots,
     LoadStreams,
     LoadTensor,
+    LoadVideos,
     SourceTypes,
     autocast_list,
+    find_files,
 )
 from ultralytics.data.utils import IMG_FORMATS, VID_FORMATS
 from ultralytics.utils import RANK, colorstr
@@ -150,7 +153,18 @@ def check_source(source):
     return source, webcam, screenshot, from_img, in_memory, tensor
 
 
-def load_inference_source(source=None, vid_stride=1, buffer=False):
+def load_inference_source(
+    source=None,
+    vid_stride=1,
+    buffer=False,
+    vid_start=None,
+    vid_end=None,
+    vid_fps=None,
+    vid_workers=0,
+    batch=1,
+    workers=8,
+    reduce=0,
+):
     """
     Loads an inference source for object detection and applies necessary transformations.
 
@@ -158,9 +172,21 @@ def load_inference_source(source=None, vid_stride=1, buffer=False):
         source (str, Path, Tensor, PIL.Image, np.ndarray): The input source for inference.
         vid_stride (int, optional): The frame interval for video sources. Default is 1.
         buffer (bool, optional): Determined whether stream frames will be buffered. Default is False.
+        vid_start (float, optional): Start time of video files in seconds, negative from the end. Default is None.
+        vid_end (float, optional): End time of video files in seconds, negative from the end. Default is None.
+        vid_fps (float, optional): Frames sampled per second of video time, instead of vid_stride. Default is None.
+        vid_workers (int, optional): Background decode threads for video files. Default is 0.
+        batch (int, optional): Images per batch for image files, batches above 1 read on a thread pool. Default is 1.
+        workers (int, optional): Decode threads for batched image files. Default is 8.
+        reduce (int, optional): Decode batched JPEGs at reduced scale down to this long side, 0 to disable. Default 0.
 
     Returns:
         dataset (Dataset): A dataset object for the specified input source.
+
+    Notes:
+        Video files are read with LoadVideos, which seeks instead of decoding skipped frames, when any of vid_start,
+        vid_end, vid_fps or vid_workers is set, and with LoadImages otherwise. Sources of only image files are read
+        with LoadImageBatches when batch > 1.
     """
     source, webcam, screenshot, from_img, in_memory, tensor = check_source(source)
     source_type = source.source_type if in_memory else SourceTypes(webcam, screenshot, from_img, tensor)
@@ -176,6 +202,10 @@ def load_inference_source(source=None, vid_stride=1, buffer=False):
         dataset = LoadScreenshots(source)
     elif from_img:
         dataset = LoadPilAndNumpy(source)
+    elif batch > 1 and _all_images(source):
+        dataset = LoadImageBatches(source, batch=batch, workers=workers, reduce=reduce)
+    elif vid_workers or any(x is not None for x in (vid_start, vid_end, vid_fps)):
+        dataset = LoadVideos(source, vid_stride, vid_start, vid_end, vid_fps, workers=max(vid_workers, 1))
     else:
         dataset = LoadImages(source, vid_stride=vid_stride)
 
@@ -183,3 +213,9 @@ def load_inference_source(source=None, vid_stride=1, buffer=False):
     setattr(dataset, "source_type", source_type)
 
     return dataset
+
+
+def _all_images(source):
+    """Return True if `source` is a path, directory, glob or list of image files only."""
+    files = find_files(source)
+    return bool(files) and all(x.split(".")[-1].lower() in IMG_FORMATS for x in files)
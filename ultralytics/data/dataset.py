@@ -11,7 +11,7 @@ import torchvision
 from PIL import Image
 
 from ultralytics.utils import LOCAL_RANK, NUM_THREADS, TQDM, colorstr, is_dir_writeable
-from ultralytics.utils.ops import resample_segments
+from ultralytics.utils.ops import pack_targets, resample_segments
 from .augment import Compose, Format, Instances, LetterBox, classify_augmentations, classify_transforms, v8_transforms
 from .base import BaseDataset
 from .utils import HELP_URL, LOGGER, get_hash, img2label_paths, verify_image, verify_image_label
@@ -220,6 +220,9 @@ class YOLODataset(BaseDataset):
         for i in range(len(new_batch["batch_idx"])):
             new_batch["batch_idx"][i] += i  # add target image index for build_targets()
         new_batch["batch_idx"] = torch.cat(new_batch["batch_idx"], 0)
+        if "bboxes" in new_batch:  # class and box of each target per image for the loss, packed on dataloader workers
+            targets = torch.cat((new_batch["cls"].view(-1, 1), new_batch["bboxes"]), 1)
+            new_batch["targets"] = pack_targets(new_batch["batch_idx"], targets, len(batch))
         return new_batch
 
 
@@ -3,10 +3,13 @@
 import glob
 import math
 import os
+import queue
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from threading import Thread
+from threading import Condition, Lock, Thread
 from urllib.parse import urlparse
 
 import cv2
@@ -36,13 +39,20 @@ class LoadStreams:
 
     Suitable for use with `yolo predict source='rtsp://example.com/media.mp4'`, supports RTSP, RTMP, HTTP, and TCP streams.
 
+    Each stream decodes into a preallocated ring buffer of frame slots and signals a condition variable when a frame is
+    ready, so the decoder allocates no frame arrays and neither side polls with sleeps. __next__() returns copies of the
+    ring slots, so frames and the Results built from them stay valid after the ring wraps around.
+
     Attributes:
         sources (str): The source input paths or URLs for the video streams.
         vid_stride (int): Video frame-rate stride, defaults to 1.
         buffer (bool): Whether to buffer input streams, defaults to False.
         running (bool): Flag to indicate if the streaming thread is running.
         mode (str): Set to 'stream' indicating real-time capture.
-        imgs (list): List of image frames for each stream.
+        imgs (list): List of ring buffers of shape (slots, h, w, 3), one per stream.
+        times (list): List of capture timestamps (time.time()) of each ring slot, one array per stream.
+        capture_times (list): Capture timestamps of the frames returned by the last __next__() call.
+        dropped (list): Number of frames overwritten before they were read, for each stream.
         fps (list): List of FPS for each stream.
         frames (list): List of total frames for each stream.
         threads (list): List of threads for each stream.
@@ -66,6 +76,7 @@ class LoadStreams:
         self.running = True  # running flag for Thread
         self.mode = "stream"
         self.vid_stride = vid_stride  # video frame-rate stride
+        self.slots = 32 if buffer else 2  # ring size: one slot being decoded, the rest queued
 
         sources = Path(sources).read_text().rsplit() if os.path.isfile(sources) else [sources]
         n = len(sources)
@@ -73,7 +84,13 @@ class LoadStreams:
         self.frames = [0] * n
         self.threads = [None] * n
         self.caps = [None] * n  # video capture objects
-        self.imgs = [[] for _ in range(n)]  # images
+        self.imgs = [None] * n  # ring buffers of frames
+        self.times = [np.zeros(self.slots) for _ in range(n)]  # capture timestamps of ring slots
+        self.capture_times = [0.0] * n
+        self.dropped = [0] * n
+        self.ready = [deque() for _ in range(n)]  # slots holding frames to read, oldest first
+        self.free = [deque(range(1, self.slots)) for _ in range(n)]  # slots available for decoding
+        self.conds = [Condition() for _ in range(n)]
         self.shape = [[] for _ in range(n)]  # image shapes
         self.sources = [ops.clean_str(x) for x in sources]  # clean source names for later
         for i, s in enumerate(sources):  # index, source
@@ -102,7 +119,10 @@ class LoadStreams:
             success, im = self.caps[i].read()  # guarantee first frame
             if not success or im is None:
                 raise ConnectionError(f"{st}Failed to read images from {s}")
-            self.imgs[i].append(im)
+            self.imgs[i] = np.empty((self.slots, *im.shape), dtype=im.dtype)
+            self.imgs[i][0] = im
+            self.times[i][0] = time.time()
+            self.ready[i].append(0)
             self.shape[i] = im.shape
             self.threads[i] = Thread(target=self.update, args=([i, self.caps[i], s]), daemon=True)
             LOGGER.info(f"{st}Success ✅ ({self.frames[i]} frames of shape {w}x{h} at {self.fps[i]:.2f} FPS)")
@@ -115,26 +135,52 @@ class LoadStreams:
     def update(self, i, cap, stream):
         """Read stream `i` frames in daemon thread."""
         n, f = 0, self.frames[i]  # frame number, frame array
-        while self.running and cap.isOpened() and n < (f - 1):
-            if len(self.imgs[i]) < 30:  # keep a <=30-image buffer
+        cond, ready, free = self.conds[i], self.ready[i], self.free[i]
+        try:
+            while self.running and cap.isOpened() and n < (f - 1):
+                with cond:
+                    while self.buffer and not free and self.running:
+                        cond.wait()  # wait until __next__() has read a frame
+                    if not self.running:
+                        break
+                    slot = free.popleft()  # never empty without buffering, the ready frame is dropped instead
                 n += 1
                 cap.grab()  # .read() = .grab() followed by .retrieve()
+                t = time.time()
                 if n % self.vid_stride == 0:
-                    success, im = cap.retrieve()
+                    success, im = cap.retrieve(self.imgs[i][slot])  # decode in place into the ring slot
                     if not success:
-                        im = np.zeros(self.shape[i], dtype=np.uint8)
+                        self.imgs[i][slot] = 0
                         LOGGER.warning("WARNING ⚠️ Video stream unresponsive, please check your IP camera connection.")
                         cap.open(stream)  # re-open stream if signal was lost
-                    if self.buffer:
-                        self.imgs[i].append(im)
-                    else:
-                        self.imgs[i] = [im]
-            else:
-                time.sleep(0.01)  # wait until the buffer is empty
+                with cond:
+                    if n % self.vid_stride == 0 and success and im.shape != self.shape[i]:  # resolution changed
+                        self.imgs[i] = np.empty((self.slots, *im.shape), dtype=im.dtype)  # ring of the new size
+                        self.imgs[i][slot] = im
+                        self.shape[i] = im.shape
+                        self.dropped[i] += len(ready)
+                        free.extend(ready)
+                        ready.clear()
+                    if n % self.vid_stride:
+                        free.appendleft(slot)
+                        continue
+                    if not self.buffer:  # keep only the latest frame
+                        self.dropped[i] += len(ready)
+                        free.extend(ready)
+                        ready.clear()
+                    self.times[i][slot] = t
+                    ready.append(slot)
+                    cond.notify_all()
+        finally:
+            with cond:
+                cond.notify_all()  # wake __next__() so it can see the thread has stopped
 
     def close(self):
         """Close stream loader and release resources."""
         self.running = False  # stop flag for Thread
+        for cond in self.conds:
+            with cond:
+                cond.notify_all()
         for thread in self.threads:
             if thread.is_alive():
                 thread.join(timeout=5)  # Add timeout
@@ -155,25 +201,27 @@ class LoadStreams:
         self.count += 1
 
         images = []
-        for i, x in enumerate(self.imgs):
-            # Wait until a frame is available in each buffer
-            while not x:
-                if not self.threads[i].is_alive() or cv2.waitKey(1) == ord("q"):  # q to quit
-                    self.close()
-                    raise StopIteration
-                time.sleep(1 / min(self.fps))
-                x = self.imgs[i]
-                if not x:
-                    LOGGER.warning(f"WARNING ⚠️ Waiting for stream {i}")
-
-            # Get and remove the first frame from imgs buffer
-            if self.buffer:
-                images.append(x.pop(0))
-
-            # Get the last frame, and clear the rest from the imgs buffer
-            else:
-                images.append(x.pop(-1) if x else np.zeros(self.shape[i], dtype=np.uint8))
-                x.clear()
+        for i, cond in enumerate(self.conds):
+            with cond:
+                # Wait until a frame is available in each buffer
+                stop = False
+                while not self.ready[i]:
+                    if not self.threads[i].is_alive() or cv2.waitKey(1) == ord("q"):  # q to quit
+                        stop = True
+                        break
+                    if not cond.wait(timeout=1 / min(self.fps)) and not self.ready[i]:
+                        LOGGER.warning(f"WARNING ⚠️ Waiting for stream {i}")
+
+                # Get the first frame in buffered mode, the only (latest) one otherwise
+                if not stop:
+                    slot = self.ready[i].popleft()
+                    self.capture_times[i] = float(self.times[i][slot])
+                    images.append(self.imgs[i][slot].copy())  # copy out, Results keep frames beyond the ring
+                    self.free[i].append(slot)  # return the slot to the ring
+                    cond.notify_all()
+            if stop:
+                self.close()
+                raise StopIteration
 
         return self.sources, images, None, ""
 
@@ -271,24 +319,7 @@ class LoadImages:
 
     def __init__(self, path, vid_stride=1):
         """Initialize the Dataloader and raise FileNotFoundError if file not found."""
-        parent = None
-        if isinstance(path, str) and Path(path).suffix == ".txt":  # *.txt file with img/vid/dir on each line
-            parent = Path(path).parent
-            path = Path(path).read_text().splitlines()  # list of sources
-        files = []
-        for p in sorted(path) if isinstance(path, (list, tuple)) else [path]:
-            a = str(Path(p).absolute())  # do not use .resolve() https://github.com/ultralytics/ultralytics/issues/2912
-            if "*" in a:
-                files.extend(sorted(glob.glob(a, recursive=True)))  # glob
-            elif os.path.isdir(a):
-                files.extend(sorted(glob.glob(os.path.join(a, "*.*"))))  # dir
-            elif os.path.isfile(a):
-                files.append(a)  # files (absolute or relative to CWD)
-            elif parent and (parent / p).is_file():
-                files.append(str((parent / p).absolute()))  # files (relative to *.txt file parent)
-            else:
-                raise FileNotFoundError(f"{p} does not exist")
-
+        files = find_files(path)
         images = [x for x in files if x.split(".")[-1].lower() in IMG_FORMATS]
         videos = [x for x in files if x.split(".")[-1].lower() in VID_FORMATS]
         ni, nv = len(images), len(videos)
@@ -305,7 +336,7 @@ class LoadImages:
             self.cap = None
         if self.nf == 0:
             raise FileNotFoundError(
-                f"No images or videos found in {p}. "
+                f"No images or videos found in {path}. "
                 f"Supported formats are:\nimages: {IMG_FORMATS}\nvideos: {VID_FORMATS}"
             )
 
@@ -360,6 +391,307 @@ class LoadImages:
         return self.nf  # number of files
 
 
+class LoadImageBatches:
+    """
+    Batched image loader that decodes and transforms images on a thread pool ahead of the model.
+
+    LoadImages reads one image per iteration on the calling thread. This loader returns `batch` images per iteration
+    and keeps up to two batches of cv2.imread() calls, plus the optional `transform` (set by the predictor to its
+    letterbox), running on `workers` threads, so decoding overlaps inference. With `reduce`, JPEGs are decoded at 1/2,
+    1/4 or 1/8 scale with libjpeg DCT scaling, as long as the long side stays at least `reduce` pixels; `shapes` then
+    holds the full image sizes read from the JPEG headers, which the predictor maps results back to. The thread pool
+    is started on the first batch and stopped by close(), which also runs at the end of each pass.
+
+    Attributes:
+        files (list): Image file paths.
+        nf (int): Number of images.
+        video_flag (list): Always False, for compatibility with LoadImages.
+        mode (str): Always 'image'.
+        bs (int): Batch size.
+        transform (callable | None): Function applied to each decoded HWC BGR image on the worker threads.
+        reduce (int): Minimum long side of reduced JPEG decodes, 0 decodes at full size.
+        ims (list | None): Transformed images of the current batch, None without a transform.
+        shapes (list): Full size (height, width) of each image of the current batch, larger than the returned image
+            for reduced decodes.
+        count (int): Number of images returned so far.
+
+    Methods:
+        close: Cancel pending reads and stop the thread pool.
+    """
+
+    reduced = (8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2)
+
+    def __init__(self, path, batch=16, workers=8, transform=None, reduce=0):
+        """
+        Initialize the loader.
+
+        Args:
+            path (str | Path | list): Image file, directory, glob, *.txt list or list of these.
+            batch (int): Number of images per batch.
+            workers (int): Number of decode threads.
+            transform (callable, optional): Function applied to each decoded image on the decode threads.
+            reduce (int): Decode JPEGs at the smallest 1/2, 1/4 or 1/8 scale with a long side of at least `reduce`.
+        """
+        self.files = [x for x in find_files(path) if x.split(".")[-1].lower() in IMG_FORMATS]
+        if not self.files:
+            raise FileNotFoundError(f"No images found in {path}. Supported formats are:\nimages: {IMG_FORMATS}")
+        self.nf = len(self.files)
+        self.video_flag = [False] * self.nf
+        self.mode = "image"
+        self.bs = batch
+        self.transform = transform
+        self.reduce = reduce
+        self.ims = None
+        self.shapes = []
+        self.count = 0
+        self.workers = max(workers, 1)
+        self.pool = None
+        self.pending = deque()  # futures of submitted reads, in file order
+        self.submitted = 0
+
+    def _read(self, path):
+        """Decode one image, reduced when possible, and apply the transform. Also returns the full image size."""
+        flags, shape = cv2.IMREAD_COLOR, None
+        if self.reduce and path.split(".")[-1].lower() in {"jpg", "jpeg"}:
+            with Image.open(path) as im:  # reads the header only
+                w, h = im.size
+                shape = (w, h) if im.getexif().get(0x0112, 1) in {5, 6, 7, 8} else (h, w)  # cv2 applies EXIF rotation
+            for k, f in self.reduced:
+                if max(shape) // k >= self.reduce:
+                    flags = f
+                    break
+        im0 = cv2.imread(path, flags)  # BGR
+        if im0 is None:
+            raise FileNotFoundError(f"Image Not Found {path}")
+        return im0, self.transform(im0) if self.transform else None, shape or im0.shape[:2]
+
+    def __iter__(self):
+        """Returns an iterator object and starts reading the first batches."""
+        for f in self.pending:
+            f.cancel()
+        self.pending.clear()
+        self.count, self.submitted = 0, 0
+        return self
+
+    def __next__(self):
+        """Return the next batch of paths, images and metadata, while the following batches are read."""
+        if self.count >= self.nf:
+            self.close()
+            raise StopIteration
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix="LoadImageBatches")
+        while self.submitted < min(self.count + 2 * self.bs, self.nf):  # keep two batches in flight
+            self.pending.append(self.pool.submit(self._read, self.files[self.submitted]))
+            self.submitted += 1
+        n = min(self.bs, self.nf - self.count)
+        paths = self.files[self.count : self.count + n]
+        im0s, ims, shapes = zip(*(self.pending.popleft().result() for _ in range(n)))
+        self.ims = list(ims) if self.transform else None
+        self.shapes = list(shapes)
+        self.count += n
+        s = f"image {self.count - n + 1}-{self.count}/{self.nf} {Path(paths[0]).parent}: "
+        return paths, list(im0s), None, s
+
+    def close(self):
+        """Cancel pending reads and stop the thread pool."""
+        for f in self.pending:
+            f.cancel()
+        self.pending.clear()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+            self.pool = None
+
+    def __len__(self):
+        """Returns the number of images."""
+        return self.nf
+
+
+class LoadVideos:
+    """
+    Video dataloader with time windows, seeking, time-based sampling and background decoding.
+
+    Unlike LoadImages, which decodes every frame from the start of each video and skips `vid_stride` frames with
+    grab(), this loader seeks to `start` and stops at `end` (seconds, negative values count from the end of each video),
+    and can sample `fps` frames per second of video time instead of every `vid_stride`-th frame. Skips longer than
+    `seek` frames jump with a seek to the preceding keyframe instead of decoding every frame in between, so analysing
+    the last minutes of a long recording does not decode the whole file. `workers` threads decode the next videos
+    ahead into bounded per-video queues while earlier ones are consumed; frames are returned in file order.
+
+    Attributes:
+        files (list): Video file paths.
+        nf (int): Number of videos.
+        video_flag (list): Always True, for compatibility with LoadImages.
+        mode (str): Always 'video'.
+        vid_stride (int): Frame stride, used when `fps` is None.
+        start (float | None): Start time in seconds, negative from the end of each video.
+        end (float | None): End time in seconds, negative from the end of each video.
+        fps (float | None): Frames sampled per second of video time.
+        bs (int): Batch size, set to 1 for this class.
+        count (int): Index of the current video.
+        frame (int): Index of the current frame in its video.
+        frames (int): Number of frames sampled from the current video.
+        time (float): Timestamp of the current frame in its video, in seconds.
+
+    Methods:
+        close: Stop the decode threads and release the videos.
+    """
+
+    seek = 64  # skip this many frames or more with a keyframe seek instead of grab()
+
+    def __init__(self, path, vid_stride=1, start=None, end=None, fps=None, workers=1, buffer=32):
+        """
+        Initialize the loader and start the decode threads.
+
+        Args:
+            path (str | Path | list): Video file, directory, glob, *.txt list or list of these.
+            vid_stride (int): Return every `vid_stride`-th frame when `fps` is None.
+            start (float, optional): Start time in seconds, negative values count back from the end of each video.
+            end (float, optional): End time in seconds, negative values count back from the end of each video.
+            fps (float, optional): Sample this many frames per second of video time instead of using `vid_stride`.
+            workers (int): Number of decode threads, each decoding one video at a time.
+            buffer (int): Maximum number of decoded frames queued per video.
+        """
+        files = find_files(path)
+        self.files = [x for x in files if x.split(".")[-1].lower() in VID_FORMATS]
+        if len(self.files) < len(files):
+            LOGGER.warning(f"WARNING ⚠️ LoadVideos ignores {len(files) - len(self.files)} non-video files in {path}")
+        if not self.files:
+            raise FileNotFoundError(f"No videos found in {path}. Supported formats are:\nvideos: {VID_FORMATS}")
+        self.nf = len(self.files)
+        self.video_flag = [True] * self.nf
+        self.mode = "video"
+        self.vid_stride = vid_stride
+        self.start, self.end, self.fps = start, end, fps
+        self.bs = 1
+        self.count, self.frame, self.frames, self.time = 0, 0, 0, 0.0
+        self.caps = [None] * self.nf
+        self.info = [None] * self.nf  # per-video (frames sampled, output fps, width, height)
+        self.queues = [queue.Queue(maxsize=buffer) for _ in self.files]
+        self.running = True
+        self._next = 0  # index of the next video to decode
+        self._lock = Lock()
+        self.threads = [Thread(target=self._decode_videos, daemon=True) for _ in range(max(min(workers, self.nf), 1))]
+        for t in self.threads:
+            t.start()
+
+    def _decode_videos(self):
+        """Decode thread: take the next undecoded video until all videos are taken."""
+        while self.running:
+            with self._lock:
+                i, self._next = self._next, self._next + 1
+            if i >= self.nf:
+                return
+            try:
+                self._decode(i)
+            except Exception as e:
+                LOGGER.warning(f"WARNING ⚠️ LoadVideos failed to decode {self.files[i]}: {e}")
+            self._put(i, None)  # end of video
+
+    def _put(self, i, item):
+        """Queue an item for video `i`, returning False if the loader was closed while waiting for space."""
+        while self.running:
+            try:
+                self.queues[i].put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _targets(self, n, fps):
+        """Return the first frame, last frame (exclusive) and float frame step for a video of `n` frames at `fps`."""
+        duration = n / fps if n > 0 else math.inf
+
+        def to_frame(t, default):
+            if t is None:
+                return default
+            t = duration + t if t < 0 else t
+            return max(int(round(t * fps)), 0) if math.isfinite(t) else default
+
+        first, last = to_frame(self.start, 0), to_frame(self.end, n if n > 0 else math.inf)
+        step = fps / self.fps if self.fps else self.vid_stride
+        return first, min(last, n) if n > 0 else last, max(step, 1)
+
+    def _decode(self, i):
+        """Decode the sampled frames of video `i` into its queue."""
+        cap = cv2.VideoCapture(self.files[i])
+        self.caps[i] = cap
+        if not cap.isOpened():
+            raise ConnectionError(f"Failed to open {self.files[i]}")
+        n = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30  # nan or 0 fallback
+        first, last, step = self._targets(n, fps)
+        w, h = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        sampled = math.ceil((last - first) / step) if math.isfinite(last) else 0
+        self.info[i] = (max(sampled, 0), self.fps or fps, w, h)
+        pos, k = 0, 0  # position of the decoder, number of frames sampled
+        while self.running:
+            target = first + int(round(k * step))
+            if target >= last:
+                break
+            if target - pos >= self.seek or target < pos:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)  # seek to the preceding keyframe and decode up to target
+                pos = target
+            while pos < target and cap.grab():  # decode without converting the frames in between
+                pos += 1
+            success, im = cap.read()
+            if not success:
+                break
+            pos += 1
+            if not self._put(i, (target, target / fps, im)):
+                break
+            k += 1
+
+    def __iter__(self):
+        """Returns an iterator object for the videos."""
+        self.count = 0
+        return self
+
+    def __next__(self):
+        """Return the next sampled frame, path and metadata, moving on to the next video at the end of each one."""
+        while self.count < self.nf:
+            item = self.queues[self.count].get()
+            if item is not None:
+                break
+            if self.caps[self.count]:
+                self.caps[self.count].release()
+            self.count += 1
+        else:
+            self.close()
+            raise StopIteration
+        path = self.files[self.count]
+        self.frame, self.time, im0 = item
+        self.frames, fps, w, h = self.info[self.count]
+        info = _VideoInfo({cv2.CAP_PROP_FPS: fps, cv2.CAP_PROP_FRAME_WIDTH: w, cv2.CAP_PROP_FRAME_HEIGHT: h})
+        s = f"video {self.count + 1}/{self.nf} (frame {self.frame}, {self.time:.2f}s) {path}: "
+        return [path], [im0], info, s
+
+    def close(self):
+        """Stop the decode threads and release the videos."""
+        self.running = False
+        for t in self.threads:
+            if t.is_alive():
+                t.join(timeout=5)
+        for cap in self.caps:
+            if cap:
+                cap.release()
+
+    def __len__(self):
+        """Returns the number of videos."""
+        return self.nf
+
+
+class _VideoInfo:
+    """Video properties readable with get() like a cv2.VideoCapture, for writers of videos decoded on other threads."""
+
+    def __init__(self, props):
+        """Initialize with a dict of cv2.CAP_PROP_* values."""
+        self.props = props
+
+    def get(self, prop):
+        """Return the value of a cv2.CAP_PROP_* property, 0 if unknown."""
+        return self.props.get(prop, 0)
+
+
 class LoadPilAndNumpy:
     """
     Load images from PIL and Numpy arrays for batch processing.
@@ -481,6 +813,33 @@ class LoadTensor:
         return self.bs
 
 
+def find_files(path):
+    """
+    Return the files of a path, directory, glob, *.txt list of these or list of these.
+
+    Raises:
+        FileNotFoundError: If a path does not exist.
+    """
+    parent = None
+    if isinstance(path, str) and Path(path).suffix == ".txt":  # *.txt file with img/vid/dir on each line
+        parent = Path(path).parent
+        path = Path(path).read_text().splitlines()  # list of sources
+    files = []
+    for p in sorted(path) if isinstance(path, (list, tuple)) else [path]:
+        a = str(Path(p).absolute())  # do not use .resolve() https://github.com/ultralytics/ultralytics/issues/2912
+        if "*" in a:
+            files.extend(sorted(glob.glob(a, recursive=True)))  # glob
+        elif os.path.isdir(a):
+            files.extend(sorted(glob.glob(os.path.join(a, "*.*"))))  # dir
+        elif os.path.isfile(a):
+            files.append(a)  # files (absolute or relative to CWD)
+        elif parent and (parent / p).is_file():
+            files.append(str((parent / p).absolute()))  # files (relative to *.txt file parent)
+        else:
+            raise FileNotFoundError(f"{p} does not exist")
+    return files
+
+
 def autocast_list(source):
     """Merges a list of source of different types into a list of numpy arrays or PIL images."""
     files = []
@@ -498,7 +857,7 @@ def autocast_list(source):
     return files
 
 
-LOADERS = LoadStreams, LoadPilAndNumpy, LoadImages, LoadScreenshots  # tuple
+LOADERS = LoadStreams, LoadPilAndNumpy, LoadImages, LoadImageBatches, LoadVideos, LoadScreenshots  # tuple
 
 
 def get_best_youtube_url(url, use_pafy=True):
@@ -55,6 +55,7 @@ class Model(nn.Module):
         info: Logs or returns information about the model.
         fuse: Fuses Conv2d and BatchNorm2d layers for optimized inference.
         predict: Performs object detection predictions.
+        predict_frame: Performs low-overhead predictions on single frames.
         track: Performs object tracking.
         val: Validates the model on a dataset.
         benchmark: Benchmarks the model on various export formats.
@@ -413,7 +414,7 @@ class Model(nn.Module):
             x in sys.argv for x in ("predict", "track", "mode=predict", "mode=track")
         )
 
-        custom = {"conf": 0.25, "save": is_cli, "mode": "predict"}  # method defaults
+        custom = {"conf": 0.25, "batch": 1, "save": is_cli, "mode": "predict"}  # method defaults
         args = {**self.overrides, **custom, **kwargs}  # highest priority args on the right
         prompts = args.pop("prompts", None)  # for SAM-type models
 
@@ -428,6 +429,37 @@ class Model(nn.Module):
             self.predictor.set_prompts(prompts)
         return self.predictor.predict_cli(source=source) if is_cli else self.predictor(source=source, stream=stream)
 
+    def predict_frame(self, frame: np.ndarray, **kwargs):
+        """
+        Performs low-overhead prediction on a single image, such as one video or webcam frame at a time.
+
+        This is a fast path for callers that run a loop over individual frames. The predictor is created once and
+        reused, its arguments are only re-parsed when a keyword argument changes, and the inference source, callbacks,
+        saving and logging of `predict` are skipped. The arguments are applied under the predictor lock together with
+        the prediction, so threads sharing the model each predict with their own arguments. The letterbox geometry and input tensors are cached while
+        consecutive frames share the same shape.
+
+        Args:
+            frame (np.ndarray): HWC BGR image.
+            **kwargs (dict): Prediction arguments such as 'conf', 'iou' or 'classes'.
+
+        Returns:
+            (ultralytics.engine.results.Results): The prediction for the frame.
+
+        Example:
+            ```python
+            model = YOLO('yolov8n.pt')
+            for frame in frames:
+                result = model.predict_frame(frame, conf=0.4)
+            ```
+        """
+        if not self.predictor:
+            custom = {"conf": 0.25, "save": False, "mode": "predict"}  # method defaults
+            args = {**self.overrides, **custom, **kwargs}  # highest priority args on the right
+            self.predictor = self._smart_load("predictor")(overrides=args, _callbacks=self.callbacks)
+            self.predictor.setup_model(model=self.model, verbose=False)
+        return self.predictor.predict_frame(frame, **kwargs)
+
     def track(
         self,
         source: Union[str, Path, int, list, tuple, np.ndarray, torch.Tensor] = None,
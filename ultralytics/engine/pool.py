@@ -0,0 +1,203 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Serve predictions to many concurrent callers from several model replicas with dynamic micro-batching.
+
+Usage:
+    from ultralytics import YOLO
+    from ultralytics.engine.pool import InferencePool
+
+    pool = InferencePool(YOLO('yolov8n.pt'), replicas=4, threads=4, max_batch=8, max_wait=0.005)
+    results = pool.predict(frame, conf=0.25)  # thread-safe, blocks until the result is ready
+    future = pool.submit(frame, conf=0.25)  # or asynchronously, future.result() returns a Results object
+    pool.close()
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from copy import deepcopy
+
+import torch
+
+from ultralytics.utils import LOGGER
+
+
+class InferencePool:
+    """
+    A pool of model replicas that serves single-image requests from any number of threads.
+
+    A Model serialises its callers on the predictor lock, so a model shared by many users runs one request at a time
+    with all cores. The pool instead runs one worker thread per replica, each limited to `threads` intra-op threads,
+    and feeds them from a bounded request queue. Only the thread count is set with torch.set_num_threads(), the
+    threads are not pinned to particular cores and the OS schedules them. A worker takes the oldest request and waits
+    up to `max_wait` seconds for more requests with the same predict arguments, then predicts them as one batch of up
+    to `max_batch` images. When the queue is full, submit() blocks (or raises queue.Full after `timeout`), pushing
+    back on callers.
+
+    Attributes:
+        models (list): The model replicas, the first one is the model passed in.
+        threads (int): Intra-op threads per replica.
+        max_batch (int): Maximum number of requests predicted together.
+        max_wait (float): Maximum time in seconds a worker waits to fill a batch.
+        defaults (dict): Default predict arguments, overridden by the arguments of each request.
+        queue (queue.Queue): Bounded queue of pending requests.
+        requests (int): Number of requests predicted so far.
+        batches (int): Number of batches predicted so far.
+
+    Methods:
+        submit: Queue one image and return a Future of its Results.
+        predict: Predict one image or a list of images and wait for the Results.
+        predict_frame: Predict one image and wait for its Results.
+        close: Stop the workers and fail pending requests.
+    """
+
+    def __init__(self, model, replicas=None, threads=None, max_batch=8, max_wait=0.005, max_queue=64, **kwargs):
+        """
+        Create the replicas and start one worker thread per replica.
+
+        Args:
+            model (Model | str): Model to replicate, or a path to load it from with YOLO().
+            replicas (int, optional): Number of replicas. Defaults to a quarter of the CPU cores.
+            threads (int, optional): Intra-op threads per replica. Defaults to the CPU cores divided by `replicas`.
+            max_batch (int): Maximum number of requests predicted together.
+            max_wait (float): Maximum time in seconds a worker waits for more requests to fill a batch.
+            max_queue (int): Maximum number of pending requests before submit() blocks.
+            **kwargs (dict): Default predict arguments for all requests, e.g. device or half.
+        """
+        if not hasattr(model, "predict"):
+            from ultralytics import YOLO
+
+            model = YOLO(model)
+        cpus = os.cpu_count() or 1
+        replicas = replicas or max(cpus // 4, 1)
+        self.threads = threads or max(cpus // replicas, 1)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.defaults = kwargs
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.requests, self.batches = 0, 0
+        self.models = [model] + [self.replicate(model) for _ in range(replicas - 1)]
+        self._stop = threading.Event()
+        self._lock = threading.Lock()  # guards the counters
+        self.workers = [threading.Thread(target=self._work, args=(m,), daemon=True) for m in self.models]
+        for w in self.workers:
+            w.start()
+        LOGGER.info(f"InferencePool: {replicas} replicas x {self.threads} threads, max_batch={max_batch}")
+
+    @staticmethod
+    def replicate(model):
+        """Return an independent copy of `model` with the same weights and its own predictor."""
+        predictor, model.predictor = model.predictor, None  # predictors hold locks and datasets, build new ones
+        try:
+            return deepcopy(model)
+        finally:
+            model.predictor = predictor
+
+    def submit(self, im, timeout=None, **kwargs):
+        """
+        Queue one image for prediction.
+
+        Args:
+            im (np.ndarray | PIL.Image | str): Image to predict, any single-image predict() source.
+            timeout (float, optional): Seconds to wait for space in a full queue, None waits indefinitely.
+            **kwargs (dict): Predict arguments, e.g. conf or imgsz. Only requests with equal arguments are batched.
+
+        Returns:
+            (Future): Future of the Results for `im`.
+
+        Raises:
+            queue.Full: If the queue is still full after `timeout` seconds.
+            RuntimeError: If the pool is closed.
+        """
+        if self._stop.is_set():
+            raise RuntimeError("InferencePool is closed")
+        future = Future()
+        self.queue.put((im, tuple(sorted(kwargs.items())), future), timeout=timeout)
+        return future
+
+    def predict(self, source, **kwargs):
+        """
+        Predict one image or a list of images, spreading them over the replicas, and wait for the Results.
+
+        Args:
+            source (np.ndarray | PIL.Image | str | list): Image or list of images.
+            **kwargs (dict): Predict arguments, e.g. conf or imgsz.
+
+        Returns:
+            (List[Results]): Results in input order.
+        """
+        futures = [self.submit(im, **kwargs) for im in (source if isinstance(source, list) else [source])]
+        return [f.result() for f in futures]
+
+    def predict_frame(self, frame, **kwargs):
+        """Predict one image and return its Results, the pooled counterpart of Model.predict_frame()."""
+        return self.submit(frame, **kwargs).result()
+
+    def _next_batch(self, carry):
+        """Return the next batch of requests with equal arguments, leaving other requests in `carry`."""
+        while not carry:
+            try:
+                carry.append(self.queue.get(timeout=0.1))
+            except queue.Empty:
+                if self._stop.is_set():
+                    return []
+        batch, rest = [carry.popleft()], deque()
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            if carry:
+                request = carry.popleft()
+            else:
+                try:
+                    request = self.queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+            (batch if request[1] == batch[0][1] else rest).append(request)
+        carry.extendleft(reversed(rest))
+        return batch
+
+    def _work(self, model):
+        """Worker loop: predict batches of requests with one replica until the pool is closed."""
+        torch.set_num_threads(self.threads)  # intra-op threads of this worker thread
+        carry = deque()  # requests taken from the queue with different arguments than the current batch
+        while True:
+            batch = [r for r in self._next_batch(carry) if r[2].set_running_or_notify_cancel()]
+            if self._stop.is_set() and not batch and not carry:
+                return
+            if not batch:
+                continue
+            try:
+                args = {"verbose": False, **self.defaults, **dict(batch[0][1])}
+                results = model.predict([r[0] for r in batch], **args)
+            except Exception as e:
+                for r in batch:
+                    r[2].set_exception(e)
+                continue
+            for r, result in zip(batch, results):
+                r[2].set_result(result)
+            with self._lock:
+                self.requests += len(batch)
+                self.batches += 1
+
+    @property
+    def mean_batch_size(self):
+        """Return the mean number of requests per predicted batch."""
+        return self.requests / max(self.batches, 1)
+
+    def close(self):
+        """Stop the workers after the queued requests are done and release the replicas."""
+        self._stop.set()
+        for w in self.workers:
+            w.join()
+        while not self.queue.empty():  # requests submitted while closing
+            self.queue.get_nowait()[2].set_exception(RuntimeError("InferencePool is closed"))
+
+    def __enter__(self):
+        """Return the pool for use as a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the pool when leaving the context."""
+        self.close()
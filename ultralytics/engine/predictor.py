@@ -29,17 +29,21 @@ Usage - formats:
 """
 import platform
 import threading
+import time
 from pathlib import Path
 
 import cv2
 import numpy as np
 import torch
+import torch.nn.functional as F
 
 from ultralytics.cfg import get_cfg, get_save_dir
 from ultralytics.data import load_inference_source
 from ultralytics.data.augment import LetterBox, classify_transforms
+from ultralytics.data.loaders import LoadImageBatches
+from ultralytics.engine.store import AsyncVideoWriter, ResultsWriter
 from ultralytics.nn.autobackend import AutoBackend
-from ultralytics.utils import DEFAULT_CFG, LOGGER, MACOS, WINDOWS, callbacks, colorstr, ops
+from ultralytics.utils import DEFAULT_CFG, LOGGER, callbacks, colorstr, ops
 from ultralytics.utils.checks import check_imgsz, check_imshow
 from ultralytics.utils.files import increment_path
 from ultralytics.utils.torch_utils import select_device, smart_inference_mode
@@ -54,6 +58,8 @@ Example:
         boxes = r.boxes  # Boxes object for bbox outputs
         masks = r.masks  # Masks object for segment masks outputs
         probs = r.probs  # Class probabilities for classification outputs
+
+    store = ResultsStore().extend(model(source=..., stream=True))  # or keep detections only, without images
 """
 
 
@@ -72,7 +78,7 @@ class BasePredictor:
         device (torch.device): Device used for prediction.
         dataset (Dataset): Dataset used for prediction.
         vid_path (str): Path to video file.
-        vid_writer (cv2.VideoWriter): Video writer for saving video output.
+        vid_writer (list): AsyncVideoWriter per source for saving annotated videos and images.
         data_path (str): Path to data.
     """
 
@@ -107,6 +113,11 @@ class BasePredictor:
         self.transforms = None
         self.callbacks = _callbacks or callbacks.get_default_callbacks()
         self.txt_path = None
+        self.sink = None  # ResultsWriter streaming every frame of one call to a file when save_stream is set
+        self.sink_run = (None, 0)  # ((file, normalize) of the current save_stream file, frames written to it)
+        self.frame_key = None  # (frame shape, imgsz) that the cached predict_frame() buffers were built for
+        self.frame_buffers = None
+        self.tensor_buffers = {}  # pinned staging and padded input tensors reused by preprocess_tensor()
         self._lock = threading.Lock()  # for automatic thread-safe inference
         callbacks.add_integration_callbacks(self)
 
@@ -118,17 +129,84 @@ class BasePredictor:
             im (torch.Tensor | List(np.ndarray)): BCHW for tensor, [(HWC) x B] for list.
         """
         not_tensor = not isinstance(im, torch.Tensor)
+        if not_tensor and self.args.tensor_preprocess and type(self).pre_transform is BasePredictor.pre_transform:
+            return self.preprocess_tensor(im)
         if not_tensor:
-            im = np.stack(self.pre_transform(im))
-            im = im[..., ::-1].transpose((0, 3, 1, 2))  # BGR to RGB, BHWC to BCHW, (n, 3, h, w)
-            im = np.ascontiguousarray(im)  # contiguous
-            im = torch.from_numpy(im)
+            return self.preprocess_transformed(self.pre_transform(im))
 
         im = im.to(self.device)
+        return im.half() if self.model.fp16 else im.float()  # uint8 to fp16/32
+
+    def preprocess_transformed(self, im):
+        """
+        Stacks pre-transformed images into the input tensor.
+
+        Args:
+            im (List(np.ndarray)): [(HWC) x B] letterboxed uint8 BGR images of equal shape.
+
+        Returns:
+            (torch.Tensor): BCHW fp16/32 RGB input tensor in range 0.0 - 1.0.
+        """
+        im = np.stack(im)
+        im = im[..., ::-1].transpose((0, 3, 1, 2))  # BGR to RGB, BHWC to BCHW, (n, 3, h, w)
+        im = np.ascontiguousarray(im)  # contiguous
+        im = torch.from_numpy(im).to(self.device)
         im = im.half() if self.model.fp16 else im.float()  # uint8 to fp16/32
-        if not_tensor:
-            im /= 255  # 0 - 255 to 0.0 - 1.0
-        return im
+        return im.div_(255)  # 0 - 255 to 0.0 - 1.0
+
+    def preprocess_tensor(self, im):
+        """
+        Letterboxes a list of HWC BGR images with batched tensor ops on the inference device.
+
+        Raw uint8 frames are copied once into a reused (pinned on CUDA) staging tensor and uploaded with non_blocking
+        copies. Resizing, the BGR to RGB flip and normalization then run as tensor ops that write straight into a
+        reused input tensor. Its padding is filled once for batches of equal shapes, whose images always cover the same
+        area, and on every call otherwise. The result matches the CPU path of preprocess() up to interpolation rounding
+        (at most 1/255).
+
+        Args:
+            im (List(np.ndarray)): [(HWC) x B] uint8 BGR images.
+
+        Returns:
+            (torch.Tensor): BCHW fp16/32 RGB input tensor in range 0.0 - 1.0.
+        """
+        same_shapes = all(x.shape == im[0].shape for x in im)
+        letterbox = LetterBox(self.imgsz, auto=same_shapes and self.model.pt, stride=self.model.stride)
+        params = [letterbox.get_params(x.shape[:2]) for x in im]
+        _, (w, h), _, (top, bottom, left, right) = params[0]
+        shape = (len(im), 3, h + top + bottom, w + left + right)  # same for all images if shapes differ (auto=False)
+        pinned = self.device.type == "cuda"
+        dtype = torch.half if self.model.fp16 else torch.float
+
+        key = (shape, im[0].shape if same_shapes else None)
+        buffers = self.tensor_buffers.get(key)
+        if buffers is None:
+            self.tensor_buffers.clear()  # keep buffers for the latest input shape only
+            out = torch.full(shape, 114 / 255, dtype=dtype, device=self.device)
+            staging = None
+            if same_shapes:
+                staging = torch.empty((len(im), *im[0].shape), dtype=torch.uint8, pin_memory=pinned)
+            buffers = self.tensor_buffers[key] = {"out": out, "staging": staging}
+        out, staging = buffers["out"], buffers["staging"]
+        if not same_shapes:  # images cover different areas of the reused tensor, clear the previous batch
+            out.fill_(114 / 255)
+
+        if same_shapes:  # one host copy and one upload for the whole batch
+            np.stack(im, out=staging.numpy())
+            frames = [staging.to(self.device, non_blocking=pinned)]
+        else:
+            frames = [torch.from_numpy(x).to(self.device, non_blocking=pinned) for x in im]
+        for i, x in enumerate(frames):
+            _, (w, h), _, (top, bottom, left, right) = params[i]
+            x = x.permute(0, 3, 1, 2) if same_shapes else x.permute(2, 0, 1)[None]  # BHWC to BCHW
+            if x.shape[2:] != (h, w):
+                x = F.interpolate(x.float(), size=(h, w), mode="bilinear", align_corners=False).round_()
+            rows, cols = slice(top, top + h), slice(left, left + w)
+            dst = out[:, :, rows, cols] if same_shapes else out[i : i + 1, :, rows, cols]
+            for c in range(3):  # BGR to RGB and uint8 to fp16/32, written straight into the padded input tensor
+                dst[:, c].copy_(x[:, 2 - c])
+            dst.div_(255)  # 0 - 255 to 0.0 - 1.0
+        return out
 
     def inference(self, im, *args, **kwargs):
         """Runs inference on a given image using the specified model and arguments."""
@@ -177,8 +255,6 @@ class BasePredictor:
                 "conf": self.args.show_conf,
                 "labels": self.args.show_labels,
             }
-            if not self.args.retina_masks:
-                plot_args["im_gpu"] = im[idx]
             self.plotted_img = result.plot(**plot_args)
         # Write
         if self.args.save_txt:
@@ -213,8 +289,8 @@ class BasePredictor:
         for _ in gen:  # noqa, running CLI inference without accumulating any outputs (do not modify)
             pass
 
-    def setup_source(self, source):
-        """Sets up source and inference mode."""
+    def setup_imgsz(self):
+        """Checks the inference image size and sets up the classification transforms that depend on it."""
         self.imgsz = check_imgsz(self.args.imgsz, stride=self.model.stride, min_dim=2)  # check image size
         self.transforms = (
             getattr(
@@ -225,10 +301,30 @@ class BasePredictor:
             if self.args.task == "classify"
             else None
         )
+
+    def setup_source(self, source):
+        """Sets up source and inference mode."""
+        self.setup_imgsz()
+        if isinstance(self.dataset, LoadImageBatches):
+            self.dataset.close()  # a previous predict() generator may have been left unfinished
         self.dataset = load_inference_source(
-            source=source, vid_stride=self.args.vid_stride, buffer=self.args.stream_buffer
+            source=source,
+            vid_stride=self.args.vid_stride,
+            buffer=self.args.stream_buffer,
+            vid_start=self.args.vid_start,
+            vid_end=self.args.vid_end,
+            vid_fps=self.args.vid_fps,
+            vid_workers=self.args.vid_workers,
+            batch=self.args.batch,
+            workers=self.args.workers,
+            reduce=max(self.imgsz) if self.args.img_reduce else 0,
         )
         self.source_type = self.dataset.source_type
+        if hasattr(self.dataset, "transform") and not self.args.tensor_preprocess:
+            pre_transform, preprocess = type(self).pre_transform, type(self).preprocess
+            if pre_transform is BasePredictor.pre_transform and preprocess is BasePredictor.preprocess:
+                letterbox = LetterBox(self.imgsz, auto=False, stride=self.model.stride)  # fixed shape for stacking
+                self.dataset.transform = lambda x: letterbox(image=x)  # letterbox on the loader threads
         if not getattr(self, "stream", True) and (
             self.dataset.mode == "stream"  # streams
             or len(self.dataset) > 1000  # images
@@ -256,6 +352,7 @@ class BasePredictor:
             # Check if save_dir/ label file exists
             if self.args.save or self.args.save_txt:
                 (self.save_dir / "labels" if self.args.save_txt else self.save_dir).mkdir(parents=True, exist_ok=True)
+            self.setup_sink()
 
             # Warmup model
             if not self.done_warmup:
@@ -276,7 +373,8 @@ class BasePredictor:
 
                 # Preprocess
                 with profilers[0]:
-                    im = self.preprocess(im0s)
+                    ims = getattr(self.dataset, "ims", None)  # images already letterboxed by the loader threads
+                    im = self.preprocess(im0s) if ims is None else self.preprocess_transformed(ims)
 
                 # Inference
                 with profilers[1]:
@@ -288,10 +386,14 @@ class BasePredictor:
                 # Postprocess
                 with profilers[2]:
                     self.results = self.postprocess(preds, im, im0s)
+                    if getattr(self.dataset, "reduce", 0):  # map results of reduced JPEG decodes to full size
+                        for r, shape in zip(self.results, self.dataset.shapes):
+                            r.rescale(shape)
 
                 self.run_callbacks("on_predict_postprocess_end")
                 # Visualize, save, write results
                 n = len(im0s)
+                capture_times = getattr(self.dataset, "capture_times", None)  # stream frame capture timestamps
                 for i in range(n):
                     self.seen += 1
                     self.results[i].speed = {
@@ -299,6 +401,11 @@ class BasePredictor:
                         "inference": profilers[1].dt * 1e3 / n,
                         "postprocess": profilers[2].dt * 1e3 / n,
                     }
+                    if capture_times is not None:
+                        self.results[i].capture_time = capture_times[i]
+                        self.results[i].speed["latency"] = (time.time() - capture_times[i]) * 1e3  # glass-to-result
+                    if self.sink:
+                        self.sink.write(self.results[i], frame=self.sink_run[1] + self.seen - 1)
                     p, im0 = path[i], None if self.source_type.tensor else im0s[i].copy()
                     p = Path(p)
 
@@ -319,8 +426,15 @@ class BasePredictor:
                     LOGGER.info(f"{s}{profilers[1].dt * 1E3:.1f}ms")
 
         # Release assets
-        if isinstance(self.vid_writer[-1], cv2.VideoWriter):
-            self.vid_writer[-1].release()  # release final video writer
+        for writer in self.vid_writer:
+            if writer:
+                writer.close()  # write the queued frames and release the video writers
+        if isinstance(self.dataset, LoadImageBatches):
+            self.dataset.close()  # stop the decode threads
+
+        if self.sink:
+            self.sink.close()  # records of this call are on disk once the generator is exhausted
+            self.sink_run = (self.sink_run[0], self.sink_run[1] + self.sink.frames)
 
         # Print results
         if self.args.verbose and self.seen:
@@ -329,13 +443,134 @@ class BasePredictor:
                 f"Speed: %.1fms preprocess, %.1fms inference, %.1fms postprocess per image at shape "
                 f"{(1, 3, *im.shape[2:])}" % t
             )
-        if self.args.save or self.args.save_txt or self.args.save_crop:
+        if self.args.save or self.args.save_txt or self.args.save_crop or self.sink:
             nl = len(list(self.save_dir.glob("labels/*.txt")))  # number of labels
             s = f"\n{nl} label{'s' * (nl > 1)} saved to {self.save_dir / 'labels'}" if self.args.save_txt else ""
+            s += f"\n{self.sink.records} records saved to {self.sink.file}" if self.sink else ""
             LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}{s}")
+        self.sink = None
 
         self.run_callbacks("on_predict_end")
 
+    def setup_sink(self):
+        """
+        Open the ResultsWriter of `save_stream` for this call, it is closed when the call ends.
+
+        Consecutive calls with the same file and normalization append to it, with frame indices continuing where the
+        previous call stopped. The first call of a predictor, or of a new file or normalization, truncates the file.
+        """
+        if self.sink:  # left open by an unfinished previous call
+            self.sink.close()
+            self.sink_run = (self.sink_run[0], self.sink_run[1] + self.sink.frames)
+            self.sink = None
+        fmt = self.args.save_stream
+        if fmt:
+            assert fmt in {"ndjson", "bin"}, f"expected save_stream='ndjson' or 'bin' but got '{fmt}'"
+            key = (self.save_dir / f"predictions.{fmt}", self.args.save_norm)
+            append = key == self.sink_run[0]
+            self.sink_run = (key, self.sink_run[1] if append else 0)
+            self.sink = ResultsWriter(key[0], normalize=key[1], append=append)
+
+    def setup_frame(self, shape):
+        """
+        Builds the cached letterbox geometry and preallocated buffers used by predict_frame() for frames of `shape`.
+
+        Predictors that override preprocess() or pre_transform() (e.g. classification, RT-DETR) keep their own
+        preprocessing, so only the image size check is cached for them.
+        """
+        self.setup_imgsz()
+        self.frame_buffers = None
+        if type(self).preprocess is not BasePredictor.preprocess or (
+            type(self).pre_transform is not BasePredictor.pre_transform
+        ):
+            return
+
+        letterbox = LetterBox(self.imgsz, auto=self.model.pt, stride=self.model.stride)
+        _, (w, h), _, (top, bottom, left, right) = letterbox.get_params(shape[:2])
+        bgr = np.full((h + top + bottom, w + left + right, 3), 114, dtype=np.uint8)  # padded letterbox canvas
+        rgb = np.empty_like(bgr)
+        staging = torch.from_numpy(rgb)  # shares memory with rgb on CPU
+        if self.device.type != "cpu":
+            staging = torch.empty(rgb.shape, dtype=torch.uint8, device=self.device)
+        self.frame_buffers = {
+            "resize": (w, h) if (w, h) != (shape[1], shape[0]) else None,
+            "bgr": bgr,
+            "inner": bgr[top : top + h, left : left + w],  # view of the canvas that receives the resized frame
+            "rgb": rgb,
+            "staging": staging,
+            "input": torch.empty(
+                (1, 3, *bgr.shape[:2]), dtype=torch.half if self.model.fp16 else torch.float, device=self.device
+            ),
+        }
+
+    def preprocess_frame(self, im0):
+        """Letterboxes a single HWC BGR image into the cached buffers and returns the model input tensor."""
+        buffers = self.frame_buffers
+        if buffers is None:  # predictor with custom preprocessing
+            return self.preprocess([im0])
+        if buffers["resize"]:
+            cv2.resize(im0, buffers["resize"], dst=buffers["inner"], interpolation=cv2.INTER_LINEAR)
+        else:
+            buffers["inner"][:] = im0
+        cv2.cvtColor(buffers["bgr"], cv2.COLOR_BGR2RGB, dst=buffers["rgb"])  # BGR to RGB
+        staging = buffers["staging"]
+        if staging.device.type != "cpu":
+            staging.copy_(torch.from_numpy(buffers["rgb"]), non_blocking=True)
+        im = buffers["input"]
+        im[0].copy_(staging.permute(2, 0, 1))  # HWC to CHW, uint8 to fp16/32
+        return im.div_(255)  # 0 - 255 to 0.0 - 1.0
+
+    @smart_inference_mode()
+    def predict_frame(self, im0, model=None, **kwargs):
+        """
+        Low-overhead inference on a single image, for callers that feed frames one at a time.
+
+        Unlike __call__(), no inference source is built and callbacks, saving, showing and logging are skipped. The
+        image size check, letterbox geometry and input tensors are cached and reused for as long as consecutive frames
+        share the same shape, so a video or webcam loop only pays for the resize, one copy to the device and the model.
+
+        Args:
+            im0 (np.ndarray): HWC BGR image.
+            model (nn.Module, optional): Model to set up if the predictor has no model yet.
+            **kwargs (dict): Prediction arguments such as 'conf', 'iou' or 'classes', applied to `args` under the lock.
+
+        Returns:
+            (Results): The prediction for the image.
+        """
+        if not self.model:
+            self.setup_model(model)
+
+        with self._lock:  # for thread-safe inference
+            if any(getattr(self.args, k, None) != v for k, v in kwargs.items()):  # only re-parse changed arguments
+                self.args = get_cfg(self.args, kwargs)
+            imgsz = self.args.imgsz
+            key = (im0.shape, tuple(imgsz) if isinstance(imgsz, list) else imgsz)
+            if key != self.frame_key:
+                self.setup_frame(im0.shape)
+                self.frame_key = key
+            if not self.done_warmup:
+                self.model.warmup(imgsz=(1, 3, *self.imgsz))
+                self.done_warmup = True
+
+            profilers = (
+                ops.Profile(device=self.device),
+                ops.Profile(device=self.device),
+                ops.Profile(device=self.device),
+            )
+            self.batch = (["image0.jpg"], [im0], None, "")
+            with profilers[0]:
+                im = self.preprocess_frame(im0)
+            with profilers[1]:
+                preds = self.model(im, augment=self.args.augment)
+            with profilers[2]:
+                result = self.postprocess(preds, im, [im0])[0]
+            result.speed = {
+                "preprocess": profilers[0].dt * 1e3,
+                "inference": profilers[1].dt * 1e3,
+                "postprocess": profilers[2].dt * 1e3,
+            }
+            return result
+
     def setup_model(self, model, verbose=True):
         """Initialize YOLO model with given parameters and set it to evaluation mode."""
         self.model = AutoBackend(
@@ -363,37 +598,44 @@ class BasePredictor:
         cv2.waitKey(500 if self.batch[3].startswith("image") else 1)  # 1 millisecond
 
     def save_preds(self, vid_cap, idx, save_path):
-        """Save video predictions as mp4 at specified path."""
+        """Queue the annotated frame for saving as an image or video frame on the writer thread of source `idx`."""
         im0 = self.plotted_img
         # Save imgs
         if self.dataset.mode == "image":
-            cv2.imwrite(save_path, im0)
+            idx = 0  # one writer thread for all images of a batch
+            writer = self.vid_writer[idx]
+            if writer is None or writer.file is not None:  # first image or previous video
+                if writer:
+                    writer.close()
+                self.vid_path[idx] = None
+                writer = self.vid_writer[idx] = AsyncVideoWriter()  # images only
+            writer.write(im0, save_path)
         else:  # 'video' or 'stream'
+            writer = self.vid_writer[idx]
             frames_path = f'{save_path.split(".", 1)[0]}_frames/'
             if self.vid_path[idx] != save_path:  # new video
                 self.vid_path[idx] = save_path
                 if self.args.save_frames:
                     Path(frames_path).mkdir(parents=True, exist_ok=True)
                     self.vid_frame[idx] = 0
-                if isinstance(self.vid_writer[idx], cv2.VideoWriter):
-                    self.vid_writer[idx].release()  # release previous video writer
+                if writer:
+                    writer.close()  # write the queued frames and release previous video writer
                 if vid_cap:  # video
                     fps = int(vid_cap.get(cv2.CAP_PROP_FPS))  # integer required, floats produce error in MP4 codec
                     w = int(vid_cap.get(cv2.CAP_PROP_FRAME_WIDTH))
                     h = int(vid_cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
                 else:  # stream
                     fps, w, h = 30, im0.shape[1], im0.shape[0]
-                suffix, fourcc = (".mp4", "avc1") if MACOS else (".avi", "WMV2") if WINDOWS else (".avi", "MJPG")
-                self.vid_writer[idx] = cv2.VideoWriter(
-                    str(Path(save_path).with_suffix(suffix)), cv2.VideoWriter_fourcc(*fourcc), fps, (w, h)
+                writer = self.vid_writer[idx] = AsyncVideoWriter(
+                    save_path, fps, (w, h), codec=self.args.vid_codec, drop=self.args.vid_drop
                 )
-            # Write video
-            self.vid_writer[idx].write(im0)
 
-            # Write frame
+            # Write video and frame
+            frame_file = None
             if self.args.save_frames:
-                cv2.imwrite(f"{frames_path}{self.vid_frame[idx]}.jpg", im0)
+                frame_file = f"{frames_path}{self.vid_frame[idx]}.jpg"
                 self.vid_frame[idx] += 1
+            writer.write(im0, frame_file)
 
     def run_callbacks(self, event: str):
         """Runs all registered callbacks for a specific event."""
@@ -5,14 +5,15 @@ Ultralytics Results, Boxes and Masks classes for handling inference results.
 Usage: See https://docs.ultralytics.com/modes/predict/
 """
 
+import math
 from copy import deepcopy
 from functools import lru_cache
 from pathlib import Path
 
+import cv2
 import numpy as np
 import torch
 
-from ultralytics.data.augment import LetterBox
 from ultralytics.utils import LOGGER, SimpleClass, ops
 from ultralytics.utils.plotting import Annotator, colors, save_one_box
 from ultralytics.utils.torch_utils import smart_inference_mode
@@ -69,17 +70,20 @@ class Results(SimpleClass):
 
     Attributes:
         orig_img (numpy.ndarray): Original image as a numpy array.
-        orig_shape (tuple): Original image shape in (height, width) format.
+        orig_shape (tuple): Original image shape in (height, width) format, larger than `orig_img` after rescale().
         boxes (Boxes, optional): Object containing detection bounding boxes.
         masks (Masks, optional): Object containing detection masks.
         probs (Probs, optional): Object containing class probabilities for classification tasks.
         keypoints (Keypoints, optional): Object containing detected keypoints for each object.
-        speed (dict): Dictionary of preprocess, inference, and postprocess speeds (ms/image).
+        speed (dict): Dictionary of preprocess, inference, and postprocess speeds (ms/image), plus the capture to result
+            'latency' (ms) for stream sources.
+        capture_time (float, optional): Timestamp (time.time()) at which a stream frame was captured.
         names (dict): Dictionary of class names.
         path (str): Path to the image file.
 
     Methods:
         update(boxes=None, masks=None, probs=None, obb=None): Updates object attributes with new detection results.
+        rescale(shape): Maps results of a downscaled image to its full size.
         cpu(): Returns a copy of the Results object with all tensors on CPU memory.
         numpy(): Returns a copy of the Results object with all tensors as numpy arrays.
         cuda(): Returns a copy of the Results object with all tensors on GPU memory.
@@ -103,7 +107,8 @@ class Results(SimpleClass):
             path (str): The path to the image file.
             names (dict): A dictionary of class names.
             boxes (torch.tensor, optional): A 2D tensor of bounding box coordinates for each detection.
-            masks (torch.tensor, optional): A 3D tensor of detection masks, where each mask is a binary image.
+            masks (torch.tensor | Masks, optional): A 3D tensor of detection masks, where each mask is a binary image,
+                or a Masks instance such as LazyMasks.
             probs (torch.tensor, optional): A 1D tensor of probabilities of each class for classification task.
             keypoints (torch.tensor, optional): A 2D tensor of keypoint coordinates for each detection.
             obb (torch.tensor, optional): A 2D tensor of oriented bounding box coordinates for each detection.
@@ -111,11 +116,14 @@ class Results(SimpleClass):
         self.orig_img = orig_img
         self.orig_shape = orig_img.shape[:2]
         self.boxes = Boxes(boxes, self.orig_shape) if boxes is not None else None  # native size boxes
-        self.masks = Masks(masks, self.orig_shape) if masks is not None else None  # native size or imgsz masks
+        if masks is not None and not isinstance(masks, Masks):
+            masks = Masks(masks, self.orig_shape)  # native size or imgsz masks
+        self.masks = masks
         self.probs = Probs(probs) if probs is not None else None
         self.keypoints = Keypoints(keypoints, self.orig_shape) if keypoints is not None else None
         self.obb = OBB(obb, self.orig_shape) if obb is not None else None
         self.speed = {"preprocess": None, "inference": None, "postprocess": None}  # milliseconds per image
+        self.capture_time = None  # time.time() at which a stream frame was captured, if known
         self.names = names
         self.path = path
         self.save_dir = None
@@ -137,12 +145,39 @@ class Results(SimpleClass):
         if boxes is not None:
             self.boxes = Boxes(ops.clip_boxes(boxes, self.orig_shape), self.orig_shape)
         if masks is not None:
-            self.masks = Masks(masks, self.orig_shape)
+            self.masks = masks if isinstance(masks, Masks) else Masks(masks, self.orig_shape)
         if probs is not None:
             self.probs = probs
         if obb is not None:
             self.obb = OBB(obb, self.orig_shape)
 
+    def rescale(self, shape):
+        """
+        Map results predicted on a downscaled `orig_img`, e.g. a reduced JPEG decode, to the full image size.
+
+        Boxes, oriented boxes and keypoints are scaled and `orig_shape` is set to `shape`, so coordinates, save_txt()
+        and tojson() refer to the full image. Masks keep their data and are mapped through `orig_shape`. `orig_img`
+        stays small; plot() and save_crop() resize it to `orig_shape`.
+
+        Args:
+            shape (tuple): Full image size (height, width).
+        """
+        h, w = self.orig_shape
+        shape = tuple(int(x) for x in shape[:2])
+        if shape == (h, w):
+            return
+        gx, gy = shape[1] / w, shape[0] / h
+        self.orig_shape = shape
+        for k, cls, cols in ("boxes", Boxes, 4), ("obb", OBB, 4), ("keypoints", Keypoints, 2):
+            v = getattr(self, k)
+            if v is not None:
+                data = v.data.clone() if isinstance(v.data, torch.Tensor) else v.data.copy()
+                data[..., 0:cols:2] *= gx
+                data[..., 1:cols:2] *= gy
+                setattr(self, k, cls(data, shape))
+        if self.masks is not None:
+            self.masks.orig_shape = shape
+
     def _apply(self, fn, *args, **kwargs):
         """
         Applies a function to all non-empty attributes and returns a new Results object with modified attributes. This
@@ -180,8 +215,10 @@ class Results(SimpleClass):
         return self._apply("to", *args, **kwargs)
 
     def new(self):
-        """Return a new Results object with the same image, path, and names."""
-        return Results(orig_img=self.orig_img, path=self.path, names=self.names)
+        """Return a new Results object with the same image, path, names and original shape."""
+        r = Results(orig_img=self.orig_img, path=self.path, names=self.names)
+        r.orig_shape = self.orig_shape
+        return r
 
     def plot(
         self,
@@ -201,6 +238,8 @@ class Results(SimpleClass):
         show=False,
         save=False,
         filename=None,
+        fast=False,
+        inplace=False,
     ):
         """
         Plots the detection results on an input RGB image. Accepts a numpy array (cv2) or a PIL Image.
@@ -212,7 +251,9 @@ class Results(SimpleClass):
             font (str): The font to use for the text.
             pil (bool): Whether to return the image as a PIL Image.
             img (numpy.ndarray): Plot to another image. if not, plot to original image.
-            im_gpu (torch.Tensor): Normalized image in gpu with shape (1, 3, 640, 640), for faster mask plotting.
+            im_gpu (torch.Tensor, optional): Normalized letterboxed image in gpu with shape (1, 3, 640, 640) to plot
+                masks with Annotator.masks(). If None, masks are blended at image resolution with
+                Annotator.overlay_masks().
             kpt_radius (int, optional): Radius of the drawn keypoints. Default is 5.
             kpt_line (bool): Whether to draw lines connecting keypoints.
             labels (bool): Whether to plot the label of bounding boxes.
@@ -222,6 +263,9 @@ class Results(SimpleClass):
             show (bool): Whether to display the annotated image directly.
             save (bool): Whether to save the annotated image to `filename`.
             filename (str): Filename to save image to if save is True.
+            fast (bool): Draw all boxes and labels in one pass with Annotator.box_labels() and cached label glyphs,
+                without anti-aliased lines. Rotated boxes are drawn as usual.
+            inplace (bool): Draw on `img` or the original image directly instead of on a copy.
 
         Returns:
             (numpy.ndarray): A numpy array of the annotated image.
@@ -248,8 +292,11 @@ class Results(SimpleClass):
         pred_boxes, show_boxes = self.obb if is_obb else self.boxes, boxes
         pred_masks, show_masks = self.masks, masks
         pred_probs, show_probs = self.probs, probs
+        img = self.orig_img if img is None else img
+        if img is self.orig_img and img.shape[:2] != self.orig_shape:  # downscaled image, see rescale()
+            img = cv2.resize(img, self.orig_shape[::-1])
         annotator = Annotator(
-            deepcopy(self.orig_img if img is None else img),
+            img if inplace else deepcopy(img),
             line_width,
             font_size,
             font,
@@ -259,20 +306,24 @@ class Results(SimpleClass):
 
         # Plot Segment results
         if pred_masks and show_masks:
-            if im_gpu is None:
-                img = LetterBox(pred_masks.shape[1:])(image=annotator.result())
-                im_gpu = (
-                    torch.as_tensor(img, dtype=torch.float16, device=pred_masks.data.device)
-                    .permute(2, 0, 1)
-                    .flip(0)
-                    .contiguous()
-                    / 255
-                )
             idx = pred_boxes.cls if pred_boxes else range(len(pred_masks))
-            annotator.masks(pred_masks.data, colors=[colors(x, True) for x in idx], im_gpu=im_gpu)
+            mask_colors = [colors(x, True) for x in idx]
+            if im_gpu is None:
+                annotator.overlay_masks(pred_masks.data, colors=mask_colors)
+            else:
+                annotator.masks(pred_masks.data, colors=mask_colors, im_gpu=im_gpu)
 
         # Plot Detect results
-        if pred_boxes is not None and show_boxes:
+        if pred_boxes is not None and show_boxes and fast and not is_obb:
+            d = pred_boxes.data.flip(0).cpu()
+            ids = d[:, -3].int().tolist() if pred_boxes.is_track else [None] * len(d)
+            box_labels = []
+            for c, p, id in zip(d[:, -1].int().tolist(), d[:, -2].tolist(), ids):
+                name = ("" if id is None else f"id:{id} ") + names[c]
+                box_labels.append((f"{name} {p:.2f}" if conf else name) if labels else None)
+            box_colors = [colors(c, True) for c in d[:, -1].int().tolist()]
+            annotator.box_labels(d[:, :4], box_labels, box_colors)
+        elif pred_boxes is not None and show_boxes:
             for d in reversed(pred_boxes):
                 c, conf, id = int(d.cls), float(d.conf) if conf else None, None if d.id is None else int(d.id.item())
                 name = ("" if id is None else f"id:{id} ") + names[c]
@@ -350,7 +401,7 @@ class Results(SimpleClass):
                 c, conf, id = int(d.cls), float(d.conf), None if d.id is None else int(d.id.item())
                 line = (c, *(d.xyxyxyxyn.view(-1) if is_obb else d.xywhn.view(-1)))
                 if masks:
-                    seg = masks[j].xyn[0].copy().reshape(-1)  # reversed mask.xyn, (n,2) to (n*2)
+                    seg = masks.xyn[j].reshape(-1)  # reversed mask.xyn, (n,2) to (n*2)
                     line = (c, *seg)
                 if kpts is not None:
                     kpt = torch.cat((kpts[j].xyn, kpts[j].conf[..., None]), 2) if kpts[j].has_visible else kpts[j].xyn
@@ -377,16 +428,25 @@ class Results(SimpleClass):
         if self.obb is not None:
             LOGGER.warning("WARNING ⚠️ OBB task do not support `save_crop`.")
             return
+        im = self.orig_img
+        im = cv2.resize(im, self.orig_shape[::-1]) if im.shape[:2] != self.orig_shape else im.copy()
         for d in self.boxes:
             save_one_box(
                 d.xyxy,
-                self.orig_img.copy(),
+                im.copy(),
                 file=Path(save_dir) / self.names[int(d.cls)] / f"{Path(file_name)}.jpg",
                 BGR=True,
             )
 
-    def tojson(self, normalize=False):
-        """Convert the object to JSON format."""
+    def tojson(self, normalize=False, rle=False):
+        """
+        Convert the object to JSON format.
+
+        Args:
+            normalize (bool): Normalize box, segment and keypoint coordinates by the image size.
+            rle (bool): Store masks as COCO compressed run-length encodings of the original image size instead of
+                polygons.
+        """
         if self.probs is not None:
             LOGGER.warning("Warning: Classify task do not support `tojson` yet.")
             return
@@ -397,6 +457,7 @@ class Results(SimpleClass):
         results = []
         data = self.boxes.data.cpu().tolist()
         h, w = self.orig_shape if normalize else (1, 1)
+        segments = (self.masks.encode(orig=True) if rle else self.masks.xy) if self.masks else None
         for i, row in enumerate(data):  # xyxy, track_id if tracking, conf, class_id
             box = {"x1": row[0] / w, "y1": row[1] / h, "x2": row[2] / w, "y2": row[3] / h}
             conf = row[-2]
@@ -405,8 +466,10 @@ class Results(SimpleClass):
             result = {"name": name, "class": class_id, "confidence": conf, "box": box}
             if self.boxes.is_track:
                 result["track_id"] = int(row[-3])  # track ID
-            if self.masks:
-                x, y = self.masks.xy[i][:, 0], self.masks.xy[i][:, 1]  # numpy array
+            if segments and rle:
+                result["rle"] = segments[i]
+            elif segments:
+                x, y = segments[i][:, 0], segments[i][:, 1]  # numpy array
                 result["segments"] = {"x": (x / w).tolist(), "y": (y / h).tolist()}
             if self.keypoints is not None:
                 x, y, visible = self.keypoints[i].data[0].cpu().unbind(dim=1)  # torch Tensor
@@ -520,6 +583,8 @@ class Masks(BaseTensor):
         numpy(): Returns the masks tensor as a numpy array.
         cuda(): Returns the masks tensor on GPU memory.
         to(device, dtype): Returns the masks tensor with the specified device and dtype.
+        encode(compress, orig): Returns the masks as COCO-style run-length encodings.
+        decode(rles, orig_shape): Creates Masks from run-length encodings.
     """
 
     def __init__(self, masks, orig_shape) -> None:
@@ -527,26 +592,233 @@ class Masks(BaseTensor):
         if masks.ndim == 2:
             masks = masks[None, :]
         super().__init__(masks, orig_shape)
+        self._segments = None
+
+    @property
+    def segments(self):
+        """Return the largest contour of each mask in mask pixel coordinates, extracted once and cached."""
+        if self._segments is None:
+            self._segments = ops.masks2segments(self.data)
+        return self._segments
+
+    def encode(self, compress=True, orig=False):
+        """
+        Run-length encode the masks in COCO format, see ops.masks2rle().
+
+        Args:
+            compress (bool): Return COCO compressed string counts instead of lists of run lengths.
+            orig (bool): Encode the masks rescaled to `orig_shape`, removing the letterbox padding, instead of at mask
+                resolution. Defaults to False.
+
+        Returns:
+            (List[dict]): One {'size': [h, w], 'counts': str | List[int]} dict per mask.
+        """
+        masks = self.data
+        if orig and tuple(masks.shape[1:]) != tuple(self.orig_shape):
+            masks = ops.scale_masks(torch.as_tensor(masks)[None].float(), self.orig_shape)[0] > 0.5
+        return ops.masks2rle(masks, compress=compress)
+
+    @classmethod
+    def decode(cls, rles, orig_shape):
+        """
+        Create Masks from run-length encodings produced by encode().
+
+        Args:
+            rles (List[dict]): COCO-style run-length encodings.
+            orig_shape (tuple): Original image shape.
+
+        Returns:
+            (Masks): The decoded boolean masks.
+        """
+        return cls(torch.from_numpy(ops.rle2masks(rles)), orig_shape)
 
     @property
-    @lru_cache(maxsize=1)
     def xyn(self):
         """Return normalized segments."""
         return [
-            ops.scale_coords(self.data.shape[1:], x, self.orig_shape, normalize=True)
-            for x in ops.masks2segments(self.data)
+            ops.scale_coords(self.shape[1:], x.copy(), self.orig_shape, normalize=True) for x in self.segments
         ]
 
     @property
-    @lru_cache(maxsize=1)
     def xy(self):
         """Return segments in pixel coordinates."""
         return [
-            ops.scale_coords(self.data.shape[1:], x, self.orig_shape, normalize=False)
-            for x in ops.masks2segments(self.data)
+            ops.scale_coords(self.shape[1:], x.copy(), self.orig_shape, normalize=False) for x in self.segments
         ]
 
 
+class LazyMasks(Masks):
+    """
+    Segmentation masks that keep the prototype masks and per-detection coefficients and build masks on demand.
+
+    Dense [n, h, w] masks are only materialised, with the same ops as the eager segmentation postprocessing, when
+    `data` is read, e.g. for plotting. Polygons (`xy`, `xyn`) and per-instance crops (`crop()`) are built from each
+    detection's box region alone, so their cost scales with box area instead of image size times detections. Inside
+    the box they match the dense mask up to bilinear rounding; any mask area that the dense mask leaks outside the
+    box is left out.
+
+    Attributes:
+        protos (torch.Tensor): Prototype masks of shape (nm, mh, mw).
+        coefs (torch.Tensor): Mask coefficients of shape (n, nm).
+        bboxes (torch.Tensor): Boxes of shape (n, 4) in xyxy format, in mask pixel coordinates.
+        mask_shape (tuple): Height and width of the masks, the inference image size or `orig_shape` if native.
+        native (bool): Whether masks are built at the original image size (retina_masks) or at the inference size.
+
+    Methods:
+        crop(i): Returns the mask of detection i inside its box and the box's top-left corner.
+    """
+
+    def __init__(self, protos, coefs, bboxes, mask_shape, orig_shape, native=False) -> None:
+        """
+        Initialize lazy masks.
+
+        Args:
+            protos (torch.Tensor): Prototype masks of shape (nm, mh, mw).
+            coefs (torch.Tensor): Mask coefficients of shape (n, nm).
+            bboxes (torch.Tensor): Boxes of shape (n, 4) in xyxy format, in mask pixel coordinates.
+            mask_shape (tuple): Height and width of the masks.
+            orig_shape (tuple): Original image shape (height, width).
+            native (bool): Build masks at `mask_shape` == `orig_shape` like ops.process_mask_native().
+        """
+        self.protos = protos
+        self.coefs = coefs
+        self.bboxes = bboxes
+        self.mask_shape = tuple(mask_shape)
+        self.orig_shape = orig_shape
+        self.native = native
+        self._data = None
+        self._segments = None
+
+    @property
+    def data(self):
+        """Return the dense masks of shape (n, h, w), materialising them on first access."""
+        if self._data is None:
+            if self.native:
+                self._data = ops.process_mask_native(self.protos, self.coefs, self.bboxes, self.mask_shape)
+            else:
+                self._data = ops.process_mask(self.protos, self.coefs, self.bboxes, self.mask_shape, upsample=True)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        """Replace the masks with a dense tensor."""
+        self._data = value[None] if value.ndim == 2 else value
+        self._segments = None
+
+    @property
+    def shape(self):
+        """Return the shape of the masks without materialising them."""
+        return self._data.shape if self._data is not None else (len(self.coefs), *self.mask_shape)
+
+    def __len__(self):
+        """Return the number of masks."""
+        return len(self._data) if self._data is not None else len(self.coefs)
+
+    def _apply(self, fn, *args, **kwargs):
+        """Return a copy with `fn` applied to the prototypes, coefficients and boxes, keeping the masks lazy."""
+        if self._data is not None:
+            return Masks(getattr(torch.as_tensor(self._data), fn)(*args, **kwargs), self.orig_shape)
+        p, c, b = (getattr(x, fn)(*args, **kwargs) for x in (self.protos, self.coefs, self.bboxes))
+        return LazyMasks(p, c, b, self.mask_shape, self.orig_shape, self.native)
+
+    def cpu(self):
+        """Return a copy of the lazy masks on CPU memory."""
+        return self._apply("cpu")
+
+    def cuda(self):
+        """Return a copy of the lazy masks on GPU memory."""
+        return self._apply("cuda")
+
+    def to(self, *args, **kwargs):
+        """Return a copy of the lazy masks with the specified device and dtype."""
+        return self._apply("to", *args, **kwargs)
+
+    def numpy(self):
+        """Return dense masks as a numpy array."""
+        return Masks(self.data.cpu().numpy(), self.orig_shape)
+
+    def __getitem__(self, idx):
+        """Return lazy masks for the specified detections."""
+        if self._data is not None:
+            return Masks(self._data[idx], self.orig_shape)
+        if isinstance(idx, int):
+            idx = slice(idx, idx + 1 if idx != -1 else None)
+        return LazyMasks(self.protos, self.coefs[idx], self.bboxes[idx], self.mask_shape, self.orig_shape, self.native)
+
+    def crop(self, i):
+        """
+        Build the mask of detection `i` inside its box only.
+
+        Args:
+            i (int): Detection index.
+
+        Returns:
+            mask (torch.Tensor): Boolean mask of the box region, shape (y2 - y1, x2 - x1).
+            offset (tuple): Top-left corner (x1, y1) of the region in mask pixel coordinates.
+        """
+        h, w = self.mask_shape
+        c, mh, mw = self.protos.shape
+        x1, y1, x2, y2 = self.bboxes[i].tolist()
+        x1, y1 = min(max(math.ceil(x1), 0), w), min(max(math.ceil(y1), 0), h)  # pixels r with x1 <= r < x2 are kept
+        x2, y2 = min(max(math.ceil(x2), x1), w), min(max(math.ceil(y2), y1), h)
+        low = (self.coefs[i : i + 1] @ self.protos.float().view(c, -1)).sigmoid().view(mh, mw)
+        if self.native:  # remove the letterbox padding like ops.scale_masks(), then crop after upsampling
+            gain = min(mh / h, mw / w)
+            padw, padh = (mw - w * gain) / 2, (mh - h * gain) / 2
+            low = low[int(padh) : int(mh - padh), int(padw) : int(mw - padw)]
+        else:  # crop at low resolution before upsampling like ops.process_mask()
+            b = self.bboxes[i : i + 1].clone()
+            b[:, [0, 2]] *= mw / w
+            b[:, [1, 3]] *= mh / h
+            low = ops.crop_mask(low[None], b)[0]
+        mask = self._resample(low, (h, w), (y1, y2), (x1, x2)) > 0.5
+        return mask, (x1, y1)
+
+    @staticmethod
+    def _resample(low, shape, rows, cols):
+        """Bilinearly upsample `low` to `shape` like F.interpolate(align_corners=False), for a window only."""
+
+        def taps(n_in, n_out, start, stop):
+            """Source indices and weights of output pixels start..stop-1."""
+            src = ((torch.arange(start, stop, device=low.device) + 0.5) * (n_in / n_out) - 0.5).clamp_(min=0)
+            i0 = src.long().clamp_(max=n_in - 1)
+            return i0, (i0 + 1).clamp_(max=n_in - 1), src - i0
+
+        y0, y1, wy = taps(low.shape[0], shape[0], *rows)
+        x0, x1, wx = taps(low.shape[1], shape[1], *cols)
+        low = low[:, x0] * (1 - wx) + low[:, x1] * wx  # interpolate along x
+        return low[y0] * (1 - wy)[:, None] + low[y1] * wy[:, None]  # interpolate along y
+
+    def encode(self, compress=True, orig=False):
+        """Run-length encode the masks from per-instance box crops, without building dense masks at mask resolution."""
+        if self._data is not None or (orig and self.mask_shape != tuple(self.orig_shape)):
+            return super().encode(compress, orig)
+        rles = []
+        for i in range(len(self.coefs)):
+            mask, offset = self.crop(i)
+            rles.extend(ops.masks2rle(mask[None], offsets=offset, shape=self.mask_shape, compress=compress))
+        return rles
+
+    @classmethod
+    def decode(cls, rles, orig_shape):
+        """Create dense Masks from run-length encodings."""
+        return Masks.decode(rles, orig_shape)
+
+    @property
+    def segments(self):
+        """Return the largest contour of each mask in mask pixel coordinates, extracted from box crops and cached."""
+        if self._segments is None:
+            if self._data is not None:
+                self._segments = ops.masks2segments(self._data)
+            else:
+                self._segments = []
+                for i in range(len(self.coefs)):
+                    mask, (x1, y1) = self.crop(i)
+                    s = ops.masks2segments(mask[None])[0]
+                    self._segments.append(s + np.array([x1, y1], dtype=s.dtype) if len(s) else s)
+        return self._segments
+
+
 class Keypoints(BaseTensor):
     """
     A class for storing and manipulating detection keypoints.
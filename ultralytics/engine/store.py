@@ -0,0 +1,736 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Output sinks for high-volume prediction: a columnar store of detections that keeps no images, a streaming writer of
+per-frame result records and an asynchronous video writer.
+
+Usage:
+    from ultralytics import YOLO
+    from ultralytics.engine.store import AsyncVideoWriter, ResultsStore, ResultsWriter
+
+    store = ResultsStore()
+    store.extend(YOLO('yolov8n.pt').track('video.mp4', stream=True))  # images are dropped frame by frame
+    people = store.select(cls=0, conf=0.5)  # vectorised queries return new stores
+    print(people.counts("frame"))  # detections per frame
+    store.to_parquet('video.parquet')  # or to_npz(), to_arrow()
+
+    with ResultsWriter('predictions.ndjson', normalize=True) as writer:  # or 'predictions.bin' for binary records
+        for i, r in enumerate(YOLO('yolov8n-seg.pt')('video.mp4', stream=True)):
+            writer.write(r, frame=i)  # serialised and written on a background thread
+    records = list(ResultsWriter.read('predictions.ndjson'))
+
+    with AsyncVideoWriter('out.mp4', fps=30, size=(1280, 720), codec='avc1', drop='oldest') as writer:
+        for r in YOLO('yolov8n.pt')('video.mp4', stream=True):
+            writer.write(r.plot())  # encoded on a background thread
+"""
+
+import json
+import queue
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import torch
+
+from ultralytics.utils import LOGGER, SimpleClass, checks
+
+
+class ResultsStore(SimpleClass):
+    """
+    A columnar container for the detections of many frames.
+
+    Every detection is one row of contiguous numpy columns: `frame` (frame index), `xyxy` (absolute box corners),
+    `conf`, `cls`, `id` (track ID, -1 for untracked detections) and, for oriented boxes, `xywhr`, allocated with the
+    first oriented box appended. Columns grow by doubling, so appending a frame costs a copy of its boxes only, and a
+    detection takes 40 bytes (60 with OBB) instead of a full Results object with its image. Per-frame metadata is
+    limited to the image path and shape.
+
+    Attributes:
+        names (dict): Class names, taken from the first appended Results.
+        paths (list): Image path of each frame.
+        shapes (np.ndarray): Original image shape (height, width) of each frame, shape (frames, 2).
+
+    Methods:
+        append: Add the detections of one Results object.
+        extend: Add the detections of an iterable of Results objects, e.g. a stream=True predict generator.
+        select: Return the detections matching frame, class, confidence and track ID filters.
+        counts: Count detections per frame, class or track ID.
+        to_npz: Save the columns to a compressed .npz file.
+        to_arrow: Return the columns as a pyarrow.Table.
+        to_parquet: Save the columns to a Parquet file.
+        load: Load a store saved with to_npz() or to_parquet().
+    """
+
+    COLUMNS = {
+        "frame": ((), np.int64),
+        "xyxy": ((4,), np.float32),
+        "conf": ((), np.float32),
+        "cls": ((), np.int32),
+        "id": ((), np.int64),
+        "xywhr": ((5,), np.float32),
+    }
+
+    def __init__(self, names=None, capacity=1024):
+        """
+        Initialize an empty store.
+
+        Args:
+            names (dict, optional): Class names, defaults to the names of the first appended Results.
+            capacity (int): Initial number of detection rows to allocate.
+        """
+        self.names = names
+        self.paths = []
+        self._shapes = np.zeros((0, 2), dtype=np.int32)
+        self._frames = 0
+        self._n = 0
+        self._obb = False
+        self._data = {k: np.empty((capacity, *s), dtype=t) for k, (s, t) in self.COLUMNS.items() if k != "xywhr"}
+
+    def __len__(self):
+        """Return the number of detections."""
+        return self._n
+
+    @property
+    def frames(self):
+        """Return the number of frames appended, including frames without detections."""
+        return self._frames
+
+    @property
+    def shapes(self):
+        """Return the original image shape (height, width) of each frame."""
+        return self._shapes[: self._frames]
+
+    @property
+    def frame(self):
+        """Return the frame index of each detection."""
+        return self._data["frame"][: self._n]
+
+    @property
+    def xyxy(self):
+        """Return the boxes in absolute xyxy format."""
+        return self._data["xyxy"][: self._n]
+
+    @property
+    def conf(self):
+        """Return the confidence of each detection."""
+        return self._data["conf"][: self._n]
+
+    @property
+    def cls(self):
+        """Return the class index of each detection."""
+        return self._data["cls"][: self._n]
+
+    @property
+    def id(self):
+        """Return the track ID of each detection, -1 where the detection was not tracked."""
+        return self._data["id"][: self._n]
+
+    @property
+    def xywhr(self):
+        """Return the rotated boxes in xywhr format, or None if no oriented boxes were appended."""
+        return self._data["xywhr"][: self._n] if self._obb else None
+
+    def _reserve(self, n):
+        """Grow the columns so that `n` more rows fit, doubling the capacity to keep appends amortised O(1)."""
+        capacity = len(self._data["frame"])
+        if self._n + n <= capacity:
+            return
+        capacity = max(self._n + n, 2 * capacity)
+        for k, v in self._data.items():
+            grown = np.empty((capacity, *v.shape[1:]), dtype=v.dtype)
+            grown[: self._n] = v[: self._n]
+            self._data[k] = grown
+
+    def _add_frame(self, path, shape, frame):
+        """Record a frame and return its index."""
+        frame = self._frames if frame is None else int(frame)
+        if frame >= len(self._shapes):
+            shapes = np.zeros((max(frame + 1, 2 * len(self._shapes), 64), 2), dtype=np.int32)
+            shapes[: len(self._shapes)] = self._shapes
+            self._shapes = shapes
+        self.paths.extend([""] * (frame + 1 - len(self.paths)))
+        self.paths[frame] = path
+        self._shapes[frame] = shape
+        self._frames = max(self._frames, frame + 1)
+        return frame
+
+    def append(self, result, frame=None):
+        """
+        Add the detections of one Results object, keeping no reference to it or its image.
+
+        Args:
+            result (Results): Detection or OBB results of one frame.
+            frame (int, optional): Frame index, defaults to the number of frames appended so far.
+
+        Returns:
+            (int): The frame index the detections were stored under.
+        """
+        if self.names is None:
+            self.names = result.names
+        frame = self._add_frame(result.path, result.orig_shape, frame)
+        boxes = result.obb if result.obb is not None else result.boxes
+        if boxes is None or not len(boxes):
+            return frame
+        n = len(boxes)
+        self._reserve(n)
+        i, j = self._n, self._n + n
+        d = self._data
+        d["frame"][i:j] = frame
+        d["xyxy"][i:j] = _to_numpy(boxes.xyxy)
+        d["conf"][i:j] = _to_numpy(boxes.conf)
+        d["cls"][i:j] = _to_numpy(boxes.cls)
+        d["id"][i:j] = _to_numpy(boxes.id) if boxes.is_track else -1
+        if result.obb is not None:
+            if not self._obb:  # earlier detections have no rotated boxes
+                self._obb = True
+                d["xywhr"] = np.full((len(d["frame"]), 5), np.nan, dtype=np.float32)
+            d["xywhr"][i:j] = _to_numpy(boxes.xywhr)
+        elif self._obb:
+            d["xywhr"][i:j] = np.nan
+        self._n = j
+        return frame
+
+    def extend(self, results):
+        """
+        Add the detections of several Results objects, one frame each.
+
+        Args:
+            results (Iterable[Results]): Results, e.g. the generator returned by predict(..., stream=True).
+
+        Returns:
+            (ResultsStore): The store itself, for chaining.
+        """
+        for r in results:
+            self.append(r)
+        return self
+
+    def __getitem__(self, index):
+        """Return a new store with the detections at `index`, an integer array, boolean mask or slice."""
+        if isinstance(index, int):
+            index = [index]
+        return self._subset(index)
+
+    def _subset(self, index):
+        """Return a new store holding the rows selected by `index` and the same frame metadata."""
+        store = ResultsStore(self.names, capacity=0)
+        store.paths = list(self.paths)
+        store._shapes = self.shapes.copy()
+        store._frames = self._frames
+        store._obb = self._obb
+        store._data = {k: v[: self._n][index] for k, v in self._data.items()}
+        store._n = len(store._data["frame"])
+        return store
+
+    def select(self, frames=None, cls=None, conf=None, ids=None):
+        """
+        Return the detections matching all of the given filters.
+
+        Args:
+            frames (int | slice | range | Iterable[int], optional): Frame indices, a slice or range selects a window.
+            cls (int | str | Iterable[int | str], optional): Class indices or names.
+            conf (float, optional): Minimum confidence.
+            ids (int | Iterable[int], optional): Track IDs.
+
+        Returns:
+            (ResultsStore): A new store with the matching detections.
+        """
+        keep = np.ones(self._n, dtype=bool)
+        if frames is not None:
+            if isinstance(frames, (slice, range)):
+                start, stop, step = (frames.start or 0, frames.stop, frames.step or 1)
+                f = self.frame - start
+                keep &= (f >= 0) & (f % step == 0)
+                if stop is not None:
+                    keep &= self.frame < stop
+            else:
+                keep &= np.isin(self.frame, np.atleast_1d(frames))
+        if cls is not None:
+            lookup = {v: k for k, v in (self.names or {}).items()}
+            cls = [lookup[c] if isinstance(c, str) else c for c in ([cls] if np.isscalar(cls) else cls)]
+            keep &= np.isin(self.cls, cls)
+        if conf is not None:
+            keep &= self.conf >= conf
+        if ids is not None:
+            keep &= np.isin(self.id, np.atleast_1d(ids))
+        return self._subset(keep)
+
+    def counts(self, by="frame"):
+        """
+        Count detections per frame, class or track ID.
+
+        Args:
+            by (str): Column to count over, one of 'frame', 'cls' or 'id'.
+
+        Returns:
+            (np.ndarray): Counts indexed by frame, class or track ID; untracked detections are not counted by 'id'.
+        """
+        assert by in {"frame", "cls", "id"}, f"expected by='frame', 'cls' or 'id' but got '{by}'"
+        values = self._data[by][: self._n]
+        length = {"frame": self._frames, "cls": len(self.names or {}), "id": 0}[by]
+        return np.bincount(values[values >= 0], minlength=length)
+
+    def columns(self):
+        """Return a dict of the detection columns, with xyxy and xywhr split into one column per coordinate."""
+        d = {"frame": self.frame, "cls": self.cls, "conf": self.conf, "id": self.id}
+        d.update({k: self.xyxy[:, i] for i, k in enumerate(("x1", "y1", "x2", "y2"))})
+        if self._obb:
+            d.update({k: self.xywhr[:, i] for i, k in enumerate(("xc", "yc", "w", "h", "r"))})
+        return d
+
+    def to_npz(self, file):
+        """
+        Save the detections and frame metadata to a compressed .npz file.
+
+        Args:
+            file (str | Path): File to save to.
+        """
+        cols = {k: v[: self._n] for k, v in self._data.items()}
+        names = np.array([self.names[k] for k in sorted(self.names)]) if self.names else np.array([], dtype=str)
+        np.savez_compressed(file, **cols, shapes=self.shapes, paths=np.array(self.paths, dtype=str), names=names)
+
+    def to_arrow(self):
+        """
+        Return the detections as a pyarrow.Table, one row per detection with the class names in its metadata.
+
+        Returns:
+            (pyarrow.Table): Table with the columns returned by columns().
+        """
+        checks.check_requirements("pyarrow")
+        import pyarrow as pa
+
+        meta = {"names": self.names or {}, "paths": self.paths, "shapes": self.shapes.tolist()}
+        return pa.table(self.columns(), metadata={k: json.dumps(v) for k, v in meta.items()})
+
+    def to_parquet(self, file):
+        """
+        Save the detections to a Parquet file.
+
+        Args:
+            file (str | Path): File to save to.
+        """
+        checks.check_requirements("pyarrow")
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), file)
+
+    @classmethod
+    def load(cls, file):
+        """
+        Load a store saved with to_npz() or to_parquet().
+
+        Args:
+            file (str | Path): A .npz or .parquet file.
+
+        Returns:
+            (ResultsStore): The loaded store.
+        """
+        file = Path(file)
+        if file.suffix == ".parquet":
+            checks.check_requirements("pyarrow")
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(file)
+            meta = {k.decode(): json.loads(v) for k, v in table.schema.metadata.items()}
+            c = {k: table.column(k).to_numpy() for k in table.column_names}
+            cols = {"frame": c["frame"], "xyxy": np.stack([c[k] for k in ("x1", "y1", "x2", "y2")], 1)}
+            cols.update(conf=c["conf"], cls=c["cls"], id=c["id"])
+            if "r" in c:
+                cols["xywhr"] = np.stack([c[k] for k in ("xc", "yc", "w", "h", "r")], 1)
+            names = {int(k): v for k, v in meta["names"].items()}
+            paths, shapes = meta["paths"], np.array(meta["shapes"], dtype=np.int32).reshape(-1, 2)
+        else:
+            with np.load(file) as z:
+                cols = {k: z[k] for k in cls.COLUMNS if k in z}
+                names = dict(enumerate(z["names"].tolist()))
+                paths, shapes = z["paths"].tolist(), z["shapes"]
+        store = cls(names or None, capacity=0)
+        n = len(cols["frame"])
+        store._obb = "xywhr" in cols
+        store._data = {k: np.ascontiguousarray(cols[k], dtype=t) for k, (_, t) in cls.COLUMNS.items() if k in cols}
+        store._n = n
+        store.paths, store._shapes, store._frames = paths, shapes.astype(np.int32), len(paths)
+        return store
+
+
+class ResultsWriter:
+    """
+    Stream the results of every frame to one NDJSON or binary file.
+
+    write() only copies the boxes to numpy and queues the frame; a background thread serialises records, writes them
+    through one buffered file handle and flushes it every `interval` seconds. This replaces one open() per frame and
+    pretty-printed JSON with one compact record per frame. Each record holds the frame index, image path and shape,
+    and columns for boxes (or oriented boxes), confidences, classes and track IDs, plus mask polygons, keypoints or the
+    top-5 classes when present.
+
+    NDJSON records are one JSON object per line with keys 'frame', 'path', 'shape', 'xyxy' (or 'xywhr'), 'conf',
+    'cls', and optionally 'id', 'segments' (flat [x0, y0, x1, y1, ...] polygons), 'keypoints', 'top5' and 'top5conf'.
+    Binary records are a HEADER followed by the path, the raw box data as float32 (Boxes.data or OBB.data layout), and
+    optionally the polygon point counts and points or the keypoints, see read().
+
+    Attributes:
+        file (Path): Output file.
+        binary (bool): Whether records are binary instead of NDJSON.
+        normalize (bool): Whether coordinates are normalized by the image size.
+        decimals (int): Decimals kept in NDJSON coordinates.
+        records (int): Number of records written so far.
+        frames (int): Number of frames queued so far.
+
+    Methods:
+        write: Queue the results of one frame.
+        flush: Wait until all queued records are written and flush the file.
+        close: Flush and close the file.
+        read: Iterate over the records of an NDJSON or binary file.
+    """
+
+    HEADER = struct.Struct("<IqIIHIHB")  # record size, frame, height, width, path length, rows, columns, flags
+    MASKS, KEYPOINTS, PROBS, OBB, NORMALIZED = 1, 2, 4, 8, 16
+
+    def __init__(
+        self, file, normalize=False, decimals=None, interval=1.0, buffer=1 << 20, max_queue=256, append=True
+    ):
+        """
+        Open `file` and start the writer thread.
+
+        Args:
+            file (str | Path): Output file, a '.bin' suffix writes binary records and any other suffix NDJSON.
+            normalize (bool): Normalize coordinates by the image size instead of writing pixels.
+            decimals (int, optional): Decimals kept in NDJSON coordinates, defaults to 6 normalized and 2 in pixels.
+            interval (float): Seconds between file flushes.
+            buffer (int): Size of the file buffer in bytes.
+            max_queue (int): Maximum number of queued frames before write() blocks.
+            append (bool): Append to an existing file instead of truncating it.
+        """
+        self.file = Path(file)
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+        self.binary = self.file.suffix == ".bin"
+        self.normalize = normalize
+        self.decimals = decimals if decimals is not None else (6 if normalize else 2)
+        self.interval = interval
+        self.records = 0
+        self.frames = 0
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._f = open(self.file, "ab" if append else "wb", buffering=buffer)
+        self._lock = threading.Lock()  # guards the file handle
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, result, frame=None):
+        """
+        Queue the results of one frame for writing.
+
+        Args:
+            result (Results): Results of one frame.
+            frame (int, optional): Frame index, defaults to the number of frames written so far.
+        """
+        if self._f.closed:
+            raise RuntimeError(f"ResultsWriter for '{self.file}' is closed")
+        boxes = result.obb if result.obb is not None else result.boxes
+        data = None if boxes is None else _to_numpy(boxes.data).astype(np.float32)
+        kpts = None if result.keypoints is None else _to_numpy(result.keypoints.data).astype(np.float32)
+        probs = None if result.probs is None else (result.probs.top5, _to_numpy(result.probs.top5conf).tolist())
+        frame = self.frames if frame is None else frame
+        self.frames += 1
+        item = (frame, result.path, result.orig_shape, data, result.obb is not None, result.masks, kpts, probs)
+        self.queue.put(item)
+
+    def _run(self):
+        """Writer loop: serialise queued frames and flush the file every `interval` seconds."""
+        last = time.perf_counter()
+        while True:
+            try:
+                item = self.queue.get(timeout=self.interval)
+            except queue.Empty:
+                item = ...
+            if item is None:
+                self.queue.task_done()
+                return
+            with self._lock:
+                if item is not ...:
+                    try:
+                        self._f.write(self._encode(*item))
+                        self.records += 1
+                    except Exception as e:
+                        LOGGER.warning(f"WARNING ⚠️ ResultsWriter failed to write frame {item[0]}: {e}")
+                    self.queue.task_done()
+                if time.perf_counter() - last > self.interval:
+                    self._f.flush()
+                    last = time.perf_counter()
+
+    def _encode(self, frame, path, shape, data, obb, masks, kpts, probs):
+        """Serialise one frame to an NDJSON line or a binary record."""
+        h, w = shape
+        if data is not None and self.normalize:
+            data[:, [0, 2]] /= w  # x1, x2 or xc, w
+            data[:, [1, 3]] /= h  # y1, y2 or yc, h
+        if kpts is not None and self.normalize:
+            kpts[..., 0] /= w
+            kpts[..., 1] /= h
+        segments = None
+        if masks is not None:
+            segments = masks.xyn if self.normalize else masks.xy
+        if self.binary:
+            return self._encode_binary(frame, str(path), shape, data, obb, segments, kpts, probs)
+
+        record = {"frame": frame, "path": str(path), "shape": [h, w]}
+        data = None if data is None else data.astype(np.float64)  # float64 rounds to short decimal reprs
+        kpts = None if kpts is None else kpts.astype(np.float64)
+        if data is not None:
+            d = 5 if obb else 4
+            record["xywhr" if obb else "xyxy"] = data[:, :d].round(self.decimals).tolist()
+            record["conf"] = data[:, -2].round(5).tolist()
+            record["cls"] = data[:, -1].astype(int).tolist()
+            if data.shape[1] > d + 2:
+                record["id"] = data[:, -3].astype(int).tolist()
+        if segments is not None:
+            record["segments"] = [s.reshape(-1).astype(np.float64).round(self.decimals).tolist() for s in segments]
+        if kpts is not None:
+            record["keypoints"] = kpts.round(self.decimals).tolist()
+        if probs is not None:
+            record["top5"], record["top5conf"] = probs[0], [round(c, 5) for c in probs[1]]
+        return (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+    def _encode_binary(self, frame, path, shape, data, obb, segments, kpts, probs):
+        """Serialise one frame to a binary record, see read() for the layout."""
+        flags = self.NORMALIZED * self.normalize + self.OBB * obb
+        if probs is not None:
+            data, flags = np.array(probs, dtype=np.float32).T, flags | self.PROBS  # (5, 2) class, confidence
+        data = np.zeros((0, 6), dtype=np.float32) if data is None else data
+        parts = [path.encode(), data.tobytes()]
+        if segments is not None:
+            flags |= self.MASKS
+            parts += [np.array([len(s) for s in segments], dtype=np.uint32).tobytes()]
+            parts += [np.concatenate(segments, dtype=np.float32).tobytes() if segments else b""]
+        if kpts is not None:
+            flags |= self.KEYPOINTS
+            parts += [np.array(kpts.shape[1:], dtype=np.uint32).tobytes(), kpts.tobytes()]
+        payload = b"".join(parts)
+        header = self.HEADER.pack(len(payload), frame, *shape, len(parts[0]), *data.shape, flags)
+        return header + payload
+
+    def flush(self):
+        """Wait until all queued frames are written, then flush the file."""
+        self.queue.join()
+        with self._lock:
+            self._f.flush()
+
+    def close(self):
+        """Write the queued frames, stop the writer thread and close the file."""
+        if self._f.closed:
+            return
+        self.queue.put(None)
+        self._thread.join()
+        with self._lock:
+            self._f.close()
+
+    def __enter__(self):
+        """Return the writer for use as a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the writer when leaving the context."""
+        self.close()
+
+    @classmethod
+    def read(cls, file):
+        """
+        Iterate over the records of a file written by ResultsWriter.
+
+        NDJSON records are returned as parsed. Binary records are returned as dicts with 'frame', 'path', 'shape',
+        'normalized', 'data' (box rows in Boxes.data or OBB.data layout, or (5, 2) top-5 class and confidence rows
+        for classification, under 'probs'), and 'segments' and 'keypoints' when present.
+
+        Args:
+            file (str | Path): File written by ResultsWriter.
+
+        Yields:
+            (dict): One record per frame.
+        """
+        file = Path(file)
+        if file.suffix != ".bin":
+            with open(file) as f:
+                yield from (json.loads(line) for line in f if line.strip())
+            return
+        with open(file, "rb") as f:
+            while header := f.read(cls.HEADER.size):
+                size, frame, h, w, lp, n, c, flags = cls.HEADER.unpack(header)
+                buf, i = f.read(size), lp + n * c * 4
+                data = np.frombuffer(buf, np.float32, n * c, lp).reshape(n, c)
+                record = {"frame": frame, "path": buf[:lp].decode(), "shape": [h, w]}
+                record["normalized"] = bool(flags & cls.NORMALIZED)
+                record["probs" if flags & cls.PROBS else "data"] = data
+                if flags & cls.MASKS:
+                    counts = np.frombuffer(buf, np.uint32, n, i)
+                    points = np.frombuffer(buf, np.float32, 2 * int(counts.sum()), i + 4 * n).reshape(-1, 2)
+                    record["segments"] = np.split(points, np.cumsum(counts)[:-1]) if n else []
+                    i += 4 * n + points.nbytes
+                if flags & cls.KEYPOINTS:
+                    nk, kd = np.frombuffer(buf, np.uint32, 2, i)
+                    record["keypoints"] = np.frombuffer(buf, np.float32, n * nk * kd, i + 8).reshape(n, nk, kd)
+                yield record
+
+
+class AsyncVideoWriter:
+    """
+    Encode video frames and save images on a background thread.
+
+    write() queues a frame and returns; a writer thread drains the bounded queue into a cv2.VideoWriter and, for
+    frames given a file name, cv2.imwrite(). When encoding falls behind, the `drop` policy decides what happens to new
+    frames: 'block' waits for space (no frames lost), 'oldest' drops the oldest queued frame and 'newest' drops the new
+    frame, so saving never stalls inference. Queued frames must not be modified by the caller afterwards.
+
+    The codec is the first of `codec` (a fourcc or list of fourccs) that OpenCV can open, with the container chosen to
+    match, e.g. 'avc1' (H.264) and 'mp4v' write .mp4 and 'MJPG' writes .avi. Codec support is probed once per process
+    on a temporary file, so a writer that fails for its own reasons, such as a missing directory, does not rule codecs
+    out for other writers. If no codec opens the video, the failure is logged once and later frames skip the video.
+
+    Attributes:
+        file (Path | None): Video file written, None when only images are saved.
+        codec (str | None): Fourcc of the video codec in use.
+        failed (bool): Whether the video could not be opened.
+        drop (str): Frame-drop policy, 'block', 'oldest' or 'newest'.
+        frames (int): Number of frames queued.
+        dropped (int): Number of frames dropped.
+
+    Methods:
+        write: Queue a frame for the video and optionally an image file.
+        flush: Wait until all queued frames are written.
+        close: Write the queued frames and release the video.
+    """
+
+    CODECS = {"avc1": ".mp4", "h264": ".mp4", "mp4v": ".mp4", "VP80": ".webm", "MJPG": ".avi", "XVID": ".avi"}
+    AUTO = ("avc1", "mp4v", "MJPG")  # preferred fourccs, H.264 first
+    _supported = {}  # fourcc -> whether OpenCV can encode with it, probed on a temporary file
+
+    def __init__(self, file=None, fps=30, size=None, codec=None, drop="block", max_queue=32):
+        """
+        Open the video and start the writer thread.
+
+        Args:
+            file (str | Path, optional): Video file, its suffix is replaced to match the codec. None saves images only.
+            fps (float): Frames per second of the video.
+            size (tuple, optional): Frame size (width, height), defaults to the size of the first frame.
+            codec (str | Iterable[str], optional): Fourcc or fourccs to try in order, defaults to AUTO.
+            drop (str): What to do with new frames when the queue is full, 'block', 'oldest' or 'newest'.
+            max_queue (int): Maximum number of queued frames.
+        """
+        assert drop in {"block", "oldest", "newest"}, f"expected drop='block', 'oldest' or 'newest' but got '{drop}'"
+        self.file = Path(file) if file else None
+        self.fps = fps if fps and fps > 0 else 30
+        self.size = size
+        self.codecs = (codec,) if isinstance(codec, str) else tuple(codec or self.AUTO)
+        self.codec = None
+        self.drop = drop
+        self.frames, self.dropped = 0, 0
+        self.writer = None
+        self.failed = False
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _open(self, im):
+        """Open a cv2.VideoWriter for frames like `im` with the first codec that works."""
+        size = self.size or (im.shape[1], im.shape[0])
+        for fourcc in self.codecs:
+            if not self.supported(fourcc):
+                continue
+            file = self.file.with_suffix(self.CODECS.get(fourcc, self.file.suffix or ".mp4"))
+            writer = cv2.VideoWriter(str(file), cv2.VideoWriter_fourcc(*fourcc), self.fps, size)
+            if writer.isOpened():
+                self.file, self.codec, self.writer = file, fourcc, writer
+                return
+            writer.release()
+            file.unlink(missing_ok=True)
+        raise RuntimeError(f"AsyncVideoWriter could not open '{self.file}' with any of the codecs {self.codecs}")
+
+    @classmethod
+    def supported(cls, fourcc):
+        """Return whether OpenCV can encode video with `fourcc`, probed once per process on a temporary file."""
+        if fourcc not in cls._supported:
+            with tempfile.TemporaryDirectory() as tmp:
+                file = Path(tmp) / f"probe{cls.CODECS.get(fourcc, '.mp4')}"
+                writer = cv2.VideoWriter(str(file), cv2.VideoWriter_fourcc(*fourcc), 30, (64, 64))
+                cls._supported[fourcc] = writer.isOpened()
+                writer.release()
+        return cls._supported[fourcc]
+
+    def write(self, im, file=None):
+        """
+        Queue a frame.
+
+        Args:
+            im (np.ndarray): BGR frame (h, w, 3), not modified by the caller afterwards.
+            file (str | Path, optional): Also save the frame as this image file.
+        """
+        item = (im, file)
+        self.frames += 1
+        if self.drop == "block":
+            self.queue.put(item)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except queue.Full:
+                if self.drop == "newest":
+                    self.dropped += 1
+                    return
+            try:
+                self.queue.get_nowait()  # drop the oldest frame
+                self.queue.task_done()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+
+    def _run(self):
+        """Writer loop: encode queued frames until close() queues None."""
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                im, file = item
+                if self.file is not None and self.writer is None and not self.failed:
+                    try:
+                        self._open(im)
+                    except RuntimeError as e:
+                        self.failed = True  # logged once, later frames skip the video
+                        LOGGER.warning(f"WARNING ⚠️ {e}")
+                if self.writer is not None:
+                    self.writer.write(im)
+                if file is not None:
+                    cv2.imwrite(str(file), im)
+            except Exception as e:
+                LOGGER.warning(f"WARNING ⚠️ AsyncVideoWriter failed to write a frame: {e}")
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Wait until all queued frames are written."""
+        self.queue.join()
+
+    def close(self):
+        """Write the queued frames, stop the writer thread and release the video."""
+        if not self._thread.is_alive():
+            return
+        self.queue.put(None)
+        self._thread.join()
+        if self.writer is not None:
+            self.writer.release()
+        if self.dropped:
+            LOGGER.warning(f"WARNING ⚠️ AsyncVideoWriter dropped {self.dropped}/{self.frames} frames of '{self.file}'")
+
+    def __enter__(self):
+        """Return the writer for use as a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the writer when leaving the context."""
+        self.close()
+
+
+def _to_numpy(x):
+    """Return a tensor or array as a numpy array."""
+    return x.cpu().numpy() if isinstance(x, torch.Tensor) else np.asarray(x)
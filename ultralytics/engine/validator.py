@@ -17,9 +17,15 @@ Usage - formats:
                           yolov8n.tflite             # TensorFlow Lite
                           yolov8n_edgetpu.tflite     # TensorFlow Edge TPU
                           yolov8n_paddle_model       # PaddlePaddle
+
+Usage - parallel validation of exported models, each process with its own inference session:
+    $ yolo mode=val model=yolov8n.onnx data=coco128.yaml shards=8
 """
 import json
+import multiprocessing
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 import numpy as np
@@ -30,6 +36,7 @@ from ultralytics.data.utils import check_cls_dataset, check_det_dataset
 from ultralytics.nn.autobackend import AutoBackend
 from ultralytics.utils import LOGGER, TQDM, callbacks, colorstr, emojis
 from ultralytics.utils.checks import check_imgsz
+from ultralytics.utils.metrics import greedy_match
 from ultralytics.utils.ops import Profile
 from ultralytics.utils.torch_utils import de_parallel, select_device, smart_inference_mode
 
@@ -55,6 +62,7 @@ class BaseValidator:
         confusion_matrix: Placeholder for a confusion matrix.
         nc: Number of classes.
         iouv: (torch.Tensor): IoU thresholds from 0.50 to 0.95 in spaces of 0.05.
+        shard (tuple, optional): Index and number of shards when this validator runs a worker of validate_shards().
         jdict (dict): Dictionary to store JSON validation results.
         speed (dict): Dictionary with keys 'preprocess', 'inference', 'loss', 'postprocess' and their respective
                       batch processing times in milliseconds.
@@ -89,6 +97,7 @@ class BaseValidator:
         self.nc = None
         self.iouv = None
         self.jdict = None
+        self.shard = None
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
 
         self.save_dir = save_dir or get_save_dir(self.args)
@@ -107,6 +116,7 @@ class BaseValidator:
         """
         self.training = trainer is not None
         augment = self.args.augment and (not self.training)
+        shards = 0  # worker processes
         if self.training:
             self.device = trainer.device
             self.data = trainer.data
@@ -118,9 +128,11 @@ class BaseValidator:
             self.args.plots &= trainer.stopper.possible_stop or (trainer.epoch == trainer.epochs - 1)
             model.eval()
         else:
-            callbacks.add_integration_callbacks(self)
+            if not self.shard:
+                callbacks.add_integration_callbacks(self)
+            weights = model or self.args.model
             model = AutoBackend(
-                model or self.args.model,
+                weights,
                 device=select_device(self.args.device, self.args.batch),
                 dnn=self.args.dnn,
                 data=self.args.data,
@@ -136,6 +148,7 @@ class BaseValidator:
             elif not pt and not jit:
                 self.args.batch = 1  # export.py models default to batch-size 1
                 LOGGER.info(f"Forcing batch=1 square inference (1,3,{imgsz},{imgsz}) for non-PyTorch models")
+                shards = 0 if self.shard else self.args.shards
 
             if str(self.args.data).split(".")[-1] in ("yaml", "yml"):
                 self.data = check_det_dataset(self.args.data)
@@ -144,15 +157,18 @@ class BaseValidator:
             else:
                 raise FileNotFoundError(emojis(f"Dataset '{self.args.data}' for task={self.args.task} not found ❌"))
 
-            if self.device.type in ("cpu", "mps"):
+            if self.device.type in ("cpu", "mps") or shards > 1 or self.shard:
                 self.args.workers = 0  # faster CPU val as time dominated by inference, not dataloading
             if not pt:
                 self.args.rect = False
             self.stride = model.stride  # used in get_dataloader() for padding
             self.dataloader = self.dataloader or self.get_dataloader(self.data.get(self.args.split), self.args.batch)
+            if self.shard:
+                self.dataloader = self.shard_dataloader(*self.shard)
 
             model.eval()
-            model.warmup(imgsz=(1 if pt else self.args.batch, 3, imgsz, imgsz))  # warmup
+            if shards < 2:
+                model.warmup(imgsz=(1 if pt else self.args.batch, 3, imgsz, imgsz))  # warmup
 
         self.run_callbacks("on_val_start")
         dt = (
@@ -161,35 +177,40 @@ class BaseValidator:
             Profile(device=self.device),
             Profile(device=self.device),
         )
-        bar = TQDM(self.dataloader, desc=self.get_desc(), total=len(self.dataloader))
         self.init_metrics(de_parallel(model))
         self.jdict = []  # empty before each val
-        for batch_i, batch in enumerate(bar):
-            self.run_callbacks("on_val_batch_start")
-            self.batch_i = batch_i
-            # Preprocess
-            with dt[0]:
-                batch = self.preprocess(batch)
-
-            # Inference
-            with dt[1]:
-                preds = model(batch["img"], augment=augment)
-
-            # Loss
-            with dt[2]:
-                if self.training:
-                    self.loss += model.loss(batch, preds)[1]
-
-            # Postprocess
-            with dt[3]:
-                preds = self.postprocess(preds)
-
-            self.update_metrics(preds, batch)
-            if self.args.plots and batch_i < 3:
-                self.plot_val_samples(batch, batch_i)
-                self.plot_predictions(batch, preds, batch_i)
-
-            self.run_callbacks("on_val_batch_end")
+        if shards > 1:
+            self.validate_shards(shards, weights, dt)
+        else:
+            bar = TQDM(self.dataloader, desc=self.get_desc(), total=len(self.dataloader), disable=bool(self.shard))
+            for batch_i, batch in enumerate(bar):
+                self.run_callbacks("on_val_batch_start")
+                self.batch_i = batch_i
+                # Preprocess
+                with dt[0]:
+                    batch = self.preprocess(batch)
+
+                # Inference
+                with dt[1]:
+                    preds = model(batch["img"], augment=augment)
+
+                # Loss
+                with dt[2]:
+                    if self.training:
+                        self.loss += model.loss(batch, preds)[1]
+
+                # Postprocess
+                with dt[3]:
+                    preds = self.postprocess(preds)
+
+                self.update_metrics(preds, batch)
+                if self.args.plots and batch_i < 3 and not (self.shard and self.shard[0]):
+                    self.plot_val_samples(batch, batch_i)
+                    self.plot_predictions(batch, preds, batch_i)
+
+                self.run_callbacks("on_val_batch_end")
+        if self.shard:  # worker of validate_shards()
+            return {"stats": self.shard_stats(), "dt": [x.t for x in dt]}
         stats = self.get_stats()
         self.check_stats(stats)
         self.speed = dict(zip(self.speed.keys(), (x.t / len(self.dataloader.dataset) * 1e3 for x in dt)))
@@ -214,6 +235,43 @@ class BaseValidator:
                 LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}")
             return stats
 
+    def validate_shards(self, n, weights, dt):
+        """
+        Validate the dataset in `n` worker processes, each with its own inference session, and merge their stats.
+
+        Every worker loads `weights` and validates every n-th image of the dataset with the arguments of this validator.
+        Intra-op threads are split between the workers, so models that run one image at a time use all cores. Workers
+        return their stats from shard_stats(), which are merged in this process with merge_shard_stats().
+
+        Args:
+            n (int): Number of worker processes.
+            weights (str | Path): Model file for the workers to load.
+            dt (tuple): Profiles of the preprocess, inference, loss and postprocess times, the worker times are added.
+        """
+        args = {**vars(self.args), "model": str(weights), "shards": 0}
+        threads = max((os.cpu_count() or 1) // n, 1)
+        LOGGER.info(f"Validating in {n} processes x {threads} threads")
+        context = multiprocessing.get_context("spawn")  # fresh processes, inference sessions are not fork-safe
+        with ProcessPoolExecutor(n, mp_context=context) as pool:
+            futures = [
+                pool.submit(_validate_shard, type(self), args, self.save_dir, (i, n), threads) for i in range(n)
+            ]
+            for future in TQDM(as_completed(futures), desc=self.get_desc(), total=n):
+                result = future.result()
+                self.merge_shard_stats(result["stats"])
+                for profile, t in zip(dt, result["dt"]):
+                    profile.t += t
+
+    def shard_dataloader(self, i, n):
+        """Return a dataloader of every n-th image of the dataset from image i, for a worker of validate_shards()."""
+        dataset = self.dataloader.dataset
+        return torch.utils.data.DataLoader(
+            dataset,
+            batch_size=self.dataloader.batch_size,
+            sampler=range(i, len(dataset), n),
+            collate_fn=getattr(dataset, "collate_fn", None),
+        )
+
     def match_predictions(self, pred_classes, true_classes, iou, use_scipy=False):
         """
         Matches predictions to ground truth objects (pred_classes, true_classes) using IoU.
@@ -227,33 +285,27 @@ class BaseValidator:
         Returns:
             (torch.Tensor): Correct tensor of shape(N,10) for 10 IoU thresholds.
         """
-        # Dx10 matrix, where D - detections, 10 - IoU thresholds
-        correct = np.zeros((pred_classes.shape[0], self.iouv.shape[0])).astype(bool)
         # LxD matrix where L - labels (rows), D - detections (columns)
         correct_class = true_classes[:, None] == pred_classes
         iou = iou * correct_class  # zero out the wrong classes
+        if not use_scipy:
+            if not iou.shape[0]:
+                return torch.zeros((iou.shape[1], self.iouv.shape[0]), dtype=torch.bool, device=pred_classes.device)
+            return greedy_match(*iou.max(0), self.iouv)  # best label of each detection, first detection per label
+
+        # WARNING: known issue that reduces mAP in https://github.com/ultralytics/ultralytics/pull/4708
+        import scipy  # scope import to avoid importing for all commands
+
+        # Dx10 matrix, where D - detections, 10 - IoU thresholds
+        correct = np.zeros((pred_classes.shape[0], self.iouv.shape[0])).astype(bool)
         iou = iou.cpu().numpy()
         for i, threshold in enumerate(self.iouv.cpu().tolist()):
-            if use_scipy:
-                # WARNING: known issue that reduces mAP in https://github.com/ultralytics/ultralytics/pull/4708
-                import scipy  # scope import to avoid importing for all commands
-
-                cost_matrix = iou * (iou >= threshold)
-                if cost_matrix.any():
-                    labels_idx, detections_idx = scipy.optimize.linear_sum_assignment(cost_matrix, maximize=True)
-                    valid = cost_matrix[labels_idx, detections_idx] > 0
-                    if valid.any():
-                        correct[detections_idx[valid], i] = True
-            else:
-                matches = np.nonzero(iou >= threshold)  # IoU > threshold and classes match
-                matches = np.array(matches).T
-                if matches.shape[0]:
-                    if matches.shape[0] > 1:
-                        matches = matches[iou[matches[:, 0], matches[:, 1]].argsort()[::-1]]
-                        matches = matches[np.unique(matches[:, 1], return_index=True)[1]]
-                        # matches = matches[matches[:, 2].argsort()[::-1]]
-                        matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
-                    correct[matches[:, 1].astype(int), i] = True
+            cost_matrix = iou * (iou >= threshold)
+            if cost_matrix.any():
+                labels_idx, detections_idx = scipy.optimize.linear_sum_assignment(cost_matrix, maximize=True)
+                valid = cost_matrix[labels_idx, detections_idx] > 0
+                if valid.any():
+                    correct[detections_idx[valid], i] = True
         return torch.tensor(correct, dtype=torch.bool, device=pred_classes.device)
 
     def add_callback(self, event: str, callback):
@@ -297,6 +349,16 @@ class BaseValidator:
         """Returns statistics about the model's performance."""
         return {}
 
+    def shard_stats(self):
+        """Returns the statistics collected by a worker of validate_shards(), to be merged with merge_shard_stats()."""
+        return {"seen": self.seen, "jdict": self.jdict}
+
+    def merge_shard_stats(self, stats):
+        """Merges the statistics of a worker of validate_shards() into this validator."""
+        if stats["seen"] is not None:
+            self.seen += stats["seen"]
+        self.jdict.extend(stats["jdict"])
+
     def check_stats(self, stats):
         """Checks statistics."""
         pass
@@ -334,3 +396,11 @@ class BaseValidator:
     def eval_json(self, stats):
         """Evaluate and return JSON format of prediction statistics."""
         pass
+
+
+def _validate_shard(validator, args, save_dir, shard, threads):
+    """Validate one shard of the dataset in a worker process of BaseValidator.validate_shards() and return its stats."""
+    torch.set_num_threads(threads)
+    v = validator(save_dir=save_dir, args=args)
+    v.shard = shard
+    return v()
@@ -76,6 +76,19 @@ class ClassificationValidator(BaseValidator):
         self.metrics.process(self.targets, self.pred)
         return self.metrics.results_dict
 
+    def shard_stats(self):
+        """Returns the top-5 predictions and targets of a worker of validate_shards()."""
+        stats = super().shard_stats()
+        stats["pred"] = [torch.cat(self.pred).cpu()] if self.pred else []
+        stats["targets"] = [torch.cat(self.targets).cpu()] if self.targets else []
+        return stats
+
+    def merge_shard_stats(self, stats):
+        """Merges the predictions and targets of a worker of validate_shards() into this validator."""
+        super().merge_shard_stats(stats)
+        self.pred.extend(stats["pred"])
+        self.targets.extend(stats["targets"])
+
     def build_dataset(self, img_path):
         """Creates and returns a ClassificationDataset instance using given image path and preprocessing parameters."""
         return ClassificationDataset(root=img_path, args=self.args, augment=False, prefix=self.args.split)
@@ -10,7 +10,7 @@ from ultralytics.data import build_dataloader, build_yolo_dataset, converter
 from ultralytics.engine.validator import BaseValidator
 from ultralytics.utils import LOGGER, ops
 from ultralytics.utils.checks import check_requirements
-from ultralytics.utils.metrics import ConfusionMatrix, DetMetrics, box_iou
+from ultralytics.utils.metrics import APHistogram, ConfusionMatrix, DetMetrics, box_iou, greedy_match
 from ultralytics.utils.plotting import output_to_target, plot_images
 
 
@@ -76,6 +76,23 @@ class DetectionValidator(BaseValidator):
         self.seen = 0
         self.jdict = []
         self.stats = dict(tp=[], conf=[], pred_cls=[], target_cls=[])
+        self.ap_hist = None  # created by append_stats() if args.ap_bins
+
+    def append_stats(self, stat):
+        """
+        Append the stats of one image or batch, or count them into confidence histograms if `ap_bins` is set.
+
+        Args:
+            stat (dict): Tensors for each key of self.stats, e.g. 'tp', 'conf', 'pred_cls' and 'target_cls'.
+        """
+        if not self.args.ap_bins:
+            for k in self.stats.keys():
+                self.stats[k].append(stat[k])
+            return
+        if self.ap_hist is None:
+            keys = [k for k in self.stats if k.startswith("tp")]  # 'tp', 'tp_m', 'tp_p'
+            self.ap_hist = APHistogram(self.nc, self.niou, self.args.ap_bins, keys=keys, device=self.device)
+        self.ap_hist.update(**stat)
 
     def get_desc(self):
         """Return a formatted string summarizing class metrics of YOLO model."""
@@ -115,7 +132,118 @@ class DetectionValidator(BaseValidator):
         return predn
 
     def update_metrics(self, preds, batch):
-        """Metrics."""
+        """
+        Update metrics for a batch of predictions at once.
+
+        Predictions and labels of all images are scaled to native space and matched together, and stats are appended
+        once per batch, so the cost no longer grows with Python work per image. Subclasses that change how boxes are
+        prepared or matched are updated one image at a time with update_metrics_per_image().
+        """
+        cls = type(self)
+        if (
+            cls._prepare_batch is not DetectionValidator._prepare_batch
+            or cls._prepare_pred is not DetectionValidator._prepare_pred
+            or cls._process_batch is not DetectionValidator._process_batch
+        ):
+            return self.update_metrics_per_image(preds, batch)
+
+        nb = len(preds)
+        self.seen += nb
+        if self.args.single_cls:
+            for pred in preds:
+                pred[:, 5] = 0
+        npr = [len(pred) for pred in preds]  # predictions per image
+        pred_img = torch.repeat_interleave(torch.arange(nb, device=self.device), torch.tensor(npr, device=self.device))
+        predn = torch.cat(preds).clone()
+        cls, bbox, img = batch["cls"].squeeze(-1), batch["bboxes"], batch["batch_idx"].long()
+        imgsz = batch["img"].shape[2:]
+        gain, pad, shape = self._native_params(batch)
+        if len(cls):
+            bbox = ops.xywh2xyxy(bbox) * torch.tensor(imgsz, device=self.device)[[1, 0, 1, 0]]  # target boxes
+            bbox = self._scale_boxes(bbox, img, gain, pad, shape)  # native-space labels
+        self._scale_boxes(predn[:, :4], pred_img, gain, pad, shape)  # native-space pred
+        tp = self._process_batches(predn, pred_img, npr, bbox, cls, img, nb)
+        self.append_stats(dict(tp=tp, conf=predn[:, 4], pred_cls=predn[:, 5], target_cls=cls))
+
+        # Confusion matrix and saving, per image
+        if self.args.plots or self.args.save_json or self.args.save_txt:
+            nl = torch.bincount(img, minlength=nb).tolist()  # labels per image, batch_idx is sorted
+            for si, (p, b, c) in enumerate(zip(predn.split(npr), bbox.split(nl), cls.split(nl))):
+                if self.args.plots and nl[si]:
+                    self.confusion_matrix.process_batch(p if npr[si] else None, b, c)
+                if not npr[si]:
+                    continue
+                if self.args.save_json:
+                    self.pred_to_json(p, batch["im_file"][si])
+                if self.args.save_txt:
+                    file = self.save_dir / "labels" / f'{Path(batch["im_file"][si]).stem}.txt'
+                    self.save_one_txt(p, self.args.save_conf, batch["ori_shape"][si], file)
+
+    def _native_params(self, batch):
+        """Return gain (nb,), padding (nb, 2) and original shape (nb, 2) to scale batch images to native space."""
+        imgsz = batch["img"].shape[2:]
+        gains, pads = [], []
+        for shape, ratio_pad in zip(batch["ori_shape"], batch["ratio_pad"]):
+            if ratio_pad is None:  # as in ops.scale_boxes()
+                gain = min(imgsz[0] / shape[0], imgsz[1] / shape[1])
+                pad = round((imgsz[1] - shape[1] * gain) / 2 - 0.1), round((imgsz[0] - shape[0] * gain) / 2 - 0.1)
+            else:
+                gain, pad = ratio_pad[0][0], ratio_pad[1]
+            gains.append(gain)
+            pads.append(pad)
+        f = dict(dtype=torch.float32, device=self.device)
+        return torch.tensor(gains, **f), torch.tensor(pads, **f), torch.tensor(batch["ori_shape"], **f)
+
+    @staticmethod
+    def _scale_boxes(boxes, img, gain, pad, shape):
+        """Scale xyxy boxes in place from the letterboxed batch to the native space of their images, see scale_boxes."""
+        boxes -= pad[img].repeat(1, 2)  # x, y padding
+        boxes /= gain[img, None]
+        boxes.clamp_(min=0)
+        boxes[:] = torch.min(boxes, shape[img].flip(1).repeat(1, 2))  # clip to image width, height
+        return boxes
+
+    def _process_batches(self, detections, det_img, ndet, gt_bboxes, gt_cls, gt_img, nb):
+        """
+        Return the correct prediction matrix of all images of a batch at once, see _process_batch().
+
+        Detections and labels are padded into per-image blocks so that IoU is only computed within images.
+
+        Args:
+            detections (torch.Tensor): Tensor of shape [N, 6] of all detections, x1, y1, x2, y2, conf, class.
+            det_img (torch.Tensor): Image index of each detection, shape [N].
+            ndet (list): Number of detections per image.
+            gt_bboxes (torch.Tensor): Tensor of shape [M, 4] of the labels of all images, x1, y1, x2, y2.
+            gt_cls (torch.Tensor): Label classes, shape [M].
+            gt_img (torch.Tensor): Image index of each label, shape [M].
+            nb (int): Number of images.
+
+        Returns:
+            (torch.Tensor): Correct prediction matrix of shape [N, 10] for 10 IoU levels.
+        """
+        n, m = len(detections), len(gt_cls)
+        if not n or not m:
+            return torch.zeros((n, self.niou), dtype=torch.bool, device=self.device)
+        nl = torch.bincount(gt_img, minlength=nb)
+        gt_pos = torch.arange(m, device=self.device) - (nl.cumsum(0) - nl)[gt_img]  # index within its image
+        ndet_t = torch.tensor(ndet, device=self.device)
+        det_pos = torch.arange(n, device=self.device) - (ndet_t.cumsum(0) - ndet_t)[det_img]
+        lmax = int(nl.max())
+        gt = torch.zeros((nb, lmax, 4), device=self.device)
+        gt[gt_img, gt_pos] = gt_bboxes
+        gc = torch.full((nb, lmax), -1.0, device=self.device)
+        gc[gt_img, gt_pos] = gt_cls.float()
+        det = torch.zeros((nb, max(ndet), 4), device=self.device)
+        det[det_img, det_pos] = detections[:, :4]
+        dc = torch.full((nb, max(ndet)), -1.0, device=self.device)
+        dc[det_img, det_pos] = detections[:, 5]
+        iou = box_iou(gt, det) * (gc[:, :, None] == dc[:, None, :])  # (nb, lmax, dmax), zero for wrong classes
+        best_iou, best_label = iou.max(1)  # best label of each detection
+        i = (det_img, det_pos)
+        return greedy_match(best_iou[i], det_img * lmax + best_label[i], self.iouv)
+
+    def update_metrics_per_image(self, preds, batch):
+        """Update metrics one image at a time, for subclasses with their own box formats or matching."""
         for si, pred in enumerate(preds):
             self.seen += 1
             npr = len(pred)
@@ -130,8 +258,7 @@ class DetectionValidator(BaseValidator):
             stat["target_cls"] = cls
             if npr == 0:
                 if nl:
-                    for k in self.stats.keys():
-                        self.stats[k].append(stat[k])
+                    self.append_stats(stat)
                     if self.args.plots:
                         self.confusion_matrix.process_batch(detections=None, gt_bboxes=bbox, gt_cls=cls)
                 continue
@@ -148,8 +275,7 @@ class DetectionValidator(BaseValidator):
                 stat["tp"] = self._process_batch(predn, bbox, cls)
                 if self.args.plots:
                     self.confusion_matrix.process_batch(predn, bbox, cls)
-            for k in self.stats.keys():
-                self.stats[k].append(stat[k])
+            self.append_stats(stat)
 
             # Save
             if self.args.save_json:
@@ -165,14 +291,36 @@ class DetectionValidator(BaseValidator):
 
     def get_stats(self):
         """Returns metrics statistics and results dictionary."""
-        stats = {k: torch.cat(v, 0).cpu().numpy() for k, v in self.stats.items()}  # to numpy
+        if self.args.ap_bins:  # binned stats of non-empty bins
+            hist = self.ap_hist or APHistogram(self.nc, self.niou, self.args.ap_bins)
+            stats = hist.stats()
+            self.nt_per_class = hist.nt.cpu().numpy()  # number of targets per class
+        else:
+            stats = {k: torch.cat(v, 0).cpu().numpy() for k, v in self.stats.items()}  # to numpy
+            self.nt_per_class = np.bincount(
+                stats["target_cls"].astype(int), minlength=self.nc
+            )  # number of targets per class
         if len(stats) and stats["tp"].any():
             self.metrics.process(**stats)
-        self.nt_per_class = np.bincount(
-            stats["target_cls"].astype(int), minlength=self.nc
-        )  # number of targets per class
         return self.metrics.results_dict
 
+    def shard_stats(self):
+        """Returns the stats of a worker of validate_shards(), its histograms or detections and confusion matrix."""
+        stats = super().shard_stats()
+        stats["confusion_matrix"] = self.confusion_matrix.matrix
+        stats["ap_hist"] = self.ap_hist
+        stats["stats"] = {k: [torch.cat(v, 0).cpu()] if v else [] for k, v in self.stats.items()}
+        return stats
+
+    def merge_shard_stats(self, stats):
+        """Merges the stats of a worker of validate_shards() into this validator."""
+        super().merge_shard_stats(stats)
+        self.confusion_matrix.matrix += stats["confusion_matrix"]
+        if stats["ap_hist"] is not None:
+            self.ap_hist = stats["ap_hist"] if self.ap_hist is None else self.ap_hist.merge(stats["ap_hist"])
+        for k, v in stats["stats"].items():
+            self.stats[k].extend(v)
+
     def print_results(self):
         """Prints training/validation set metrics per class."""
         pf = "%22s" + "%11i" * 2 + "%11.3g" * len(self.metrics.keys)  # print format
@@ -120,8 +120,7 @@ class PoseValidator(DetectionValidator):
             stat["target_cls"] = cls
             if npr == 0:
                 if nl:
-                    for k in self.stats.keys():
-                        self.stats[k].append(stat[k])
+                    self.append_stats(stat)
                     if self.args.plots:
                         self.confusion_matrix.process_batch(detections=None, gt_bboxes=bbox, gt_cls=cls)
                 continue
@@ -140,8 +139,7 @@ class PoseValidator(DetectionValidator):
                 if self.args.plots:
                     self.confusion_matrix.process_batch(predn, bbox, cls)
 
-            for k in self.stats.keys():
-                self.stats[k].append(stat[k])
+            self.append_stats(stat)
 
             # Save
             if self.args.save_json:
@@ -1,6 +1,6 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
-from ultralytics.engine.results import Results
+from ultralytics.engine.results import LazyMasks, Results
 from ultralytics.models.yolo.detect.predict import DetectionPredictor
 from ultralytics.utils import DEFAULT_CFG, ops
 
@@ -49,9 +49,10 @@ class SegmentationPredictor(DetectionPredictor):
                 masks = None
             elif self.args.retina_masks:
                 pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
-                masks = ops.process_mask_native(proto[i], pred[:, 6:], pred[:, :4], orig_img.shape[:2])  # HWC
-            else:
-                masks = ops.process_mask(proto[i], pred[:, 6:], pred[:, :4], img.shape[2:], upsample=True)  # HWC
+                shape = orig_img.shape[:2]
+                masks = LazyMasks(proto[i], pred[:, 6:], pred[:, :4], shape, shape, native=True)
+            else:  # masks are built lazily from imgsz boxes, so keep a copy before scaling them to orig_img
+                masks = LazyMasks(proto[i], pred[:, 6:], pred[:, :4].clone(), img.shape[2:], orig_img.shape[:2])
                 pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
             results.append(Results(orig_img, path=img_path, names=self.model.names, boxes=pred[:, :6], masks=masks))
         return results
@@ -18,6 +18,16 @@ from ultralytics.utils import ARM64, LINUX, LOGGER, ROOT, yaml_load
 from ultralytics.utils.checks import check_requirements, check_suffix, check_version, check_yaml
 from ultralytics.utils.downloads import attempt_download_asset, is_url
 
+ORT_TYPES = {  # ONNX Runtime tensor type -> (torch dtype, numpy dtype) for binding torch memory
+    "tensor(float)": (torch.float32, np.float32),
+    "tensor(float16)": (torch.float16, np.float16),
+    "tensor(double)": (torch.float64, np.float64),
+    "tensor(int64)": (torch.int64, np.int64),
+    "tensor(int32)": (torch.int32, np.int32),
+    "tensor(uint8)": (torch.uint8, np.uint8),
+    "tensor(bool)": (torch.bool, np.bool_),
+}
+
 
 def check_class_names(names):
     """
@@ -175,9 +185,17 @@ class AutoBackend(nn.Module):
             import onnxruntime
 
             providers = ["CUDAExecutionProvider", "CPUExecutionProvider"] if cuda else ["CPUExecutionProvider"]
-            session = onnxruntime.InferenceSession(w, providers=providers)
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = torch.get_num_threads()  # follow torch, e.g. in validation workers
+            session = onnxruntime.InferenceSession(w, sess_options=session_options, providers=providers)
+            if cuda and "CUDAExecutionProvider" not in session.get_providers():
+                LOGGER.warning("WARNING ⚠️ CUDAExecutionProvider not available, running ONNX Runtime on CPU")
+                device = torch.device("cpu")
+                cuda = False
             output_names = [x.name for x in session.get_outputs()]
             metadata = session.get_modelmeta().custom_metadata_map  # metadata
+            dynamic = any(isinstance(d, str) or d is None for x in session.get_outputs() for d in x.shape)
+            io = None if dynamic else session.io_binding()  # static shapes read and write torch memory directly
         elif xml:  # OpenVINO
             LOGGER.info(f"Loading {w} for OpenVINO inference...")
             check_requirements("openvino>=2023.0")  # requires openvino-dev: https://pypi.org/project/openvino-dev/
@@ -389,8 +407,11 @@ class AutoBackend(nn.Module):
             self.net.setInput(im)
             y = self.net.forward()
         elif self.onnx:  # ONNX Runtime
-            im = im.cpu().numpy()  # torch to numpy
-            y = self.session.run(self.output_names, {self.session.get_inputs()[0].name: im})
+            if self.io is None:  # dynamic shapes
+                im = im.cpu().numpy()  # torch to numpy
+                y = self.session.run(self.output_names, {self.session.get_inputs()[0].name: im})
+            else:  # I/O binding: the session reads the input tensor and writes the output tensors in place
+                y = self.run_with_io_binding(im)
         elif self.xml:  # OpenVINO
             im = im.cpu().numpy()  # FP32
             y = list(self.ov_compiled_model(im).values())
@@ -490,9 +511,38 @@ class AutoBackend(nn.Module):
         else:
             return self.from_numpy(y)
 
+    def run_with_io_binding(self, im):
+        """
+        Run the ONNX Runtime session on torch memory through I/O binding, without numpy round trips or output copies.
+
+        The input tensor is bound in place, after a cast if its dtype differs from the model input, and outputs are
+        written straight into new torch tensors on the inference device, typed like the session outputs. Outputs are
+        allocated per call rather than reused, as Results keep views of them (e.g. mask prototypes and class
+        probabilities).
+
+        Args:
+            im (torch.Tensor): Input tensor on the inference device.
+
+        Returns:
+            (List[torch.Tensor]): The model outputs.
+        """
+        x = self.session.get_inputs()[0]
+        dtype, np_dtype = ORT_TYPES[x.type]
+        im = im.to(dtype).contiguous()
+        device_id = im.device.index or 0
+        self.io.bind_input(x.name, im.device.type, device_id, np_dtype, tuple(im.shape), im.data_ptr())
+        y = []
+        for x in self.session.get_outputs():
+            dtype, np_dtype = ORT_TYPES[x.type]
+            out = torch.empty(x.shape, dtype=dtype, device=im.device)
+            self.io.bind_output(x.name, out.device.type, device_id, np_dtype, tuple(out.shape), out.data_ptr())
+            y.append(out)
+        self.session.run_with_iobinding(self.io)
+        return y
+
     def from_numpy(self, x):
         """
-        Convert a numpy array to a tensor.
+        Convert a numpy array to a tensor, sharing its memory when the tensor stays on CPU.
 
         Args:
             x (np.ndarray): The array to be converted.
@@ -500,7 +550,9 @@ class AutoBackend(nn.Module):
         Returns:
             (torch.Tensor): The converted tensor
         """
-        return torch.tensor(x).to(self.device) if isinstance(x, np.ndarray) else x
+        if isinstance(x, np.ndarray):
+            return torch.from_numpy(x if x.flags.writeable else x.copy()).to(self.device)
+        return x
 
     def warmup(self, imgsz=(1, 3, 640, 640)):
         """
@@ -4,8 +4,15 @@ Benchmark a YOLO model formats for speed and accuracy.
 
 Usage:
     from ultralytics.utils.benchmarks import ProfileModels, benchmark
+    from ultralytics.utils.benchmarks import benchmark_nms, benchmark_predict_frame, benchmark_preprocess
+    from ultralytics.utils.benchmarks import benchmark_io_binding, benchmark_pipeline
     ProfileModels(['yolov8n.yaml', 'yolov8s.yaml']).profile()
     benchmark(model='yolov8n.pt', imgsz=160)
+    benchmark_predict_frame(model='yolov8n.pt', shape=(720, 1280))
+    benchmark_preprocess(model='yolov8n.pt', shape=(1080, 1920), batch=8, device=0)
+    benchmark_nms(batch_sizes=(1, 2, 4, 8, 16, 32, 64))
+    benchmark_pipeline(models=('yolov8n.yaml', 'yolov8n-seg.yaml'), save_json='pipeline.json')
+    benchmark_io_binding(model='yolov8n-seg.pt', imgsz=640)
 
 Format                  | `format=argument`         | Model
 ---                     | ---                       | ---
@@ -25,18 +32,23 @@ ncnn                    | `ncnn`                    | yolov8n_ncnn_model/
 """
 
 import glob
+import json
 import platform
+import subprocess
+import tempfile
 import time
 from pathlib import Path
 
+import cv2
 import numpy as np
 import torch.cuda
 
-from ultralytics import YOLO
+from ultralytics import YOLO, __version__
 from ultralytics.cfg import TASK2DATA, TASK2METRIC
 from ultralytics.engine.exporter import export_formats
+from ultralytics.nn.autobackend import ORT_TYPES, AutoBackend
 from ultralytics.utils import ASSETS, LINUX, LOGGER, MACOS, TQDM, WEIGHTS_DIR
-from ultralytics.utils.checks import IS_PYTHON_3_12, check_requirements, check_yolo
+from ultralytics.utils.checks import IS_PYTHON_3_12, check_imgsz, check_requirements, check_yolo
 from ultralytics.utils.files import file_size
 from ultralytics.utils.torch_utils import select_device
 
@@ -145,6 +157,378 @@ def benchmark(
     return df
 
 
+def benchmark_predict_frame(
+    model=WEIGHTS_DIR / "yolov8n.pt", shape=(720, 1280), imgsz=640, num_frames=100, device="cpu", half=False
+):
+    """
+    Compare the per-frame latency of Model.predict() and the cached Model.predict_frame() fast path.
+
+    Both paths run on the same synthetic BGR frame after one warmup call each, so the difference is the per-call
+    overhead of building the inference source, letterboxing and converting the input in predict().
+
+    Args:
+        model (str | Path | Model): Model to benchmark.
+        shape (tuple): Frame shape (height, width).
+        imgsz (int): Inference image size.
+        num_frames (int): Number of timed calls per path.
+        device (str): Device to run on, i.e. 'cpu' or '0'.
+        half (bool): Use FP16 inference.
+
+    Returns:
+        (dict): Median and mean total milliseconds per frame for 'predict' and 'predict_frame', and the speedup.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_predict_frame
+
+        benchmark_predict_frame(model='yolov8n.pt', shape=(720, 1280))
+        ```
+    """
+    if isinstance(model, (str, Path)):
+        model = YOLO(model)
+    frame = np.random.randint(0, 256, (*shape, 3), dtype=np.uint8)
+    args = dict(imgsz=imgsz, device=device, half=half, verbose=False)
+    calls = {
+        "predict": lambda: model.predict(frame, **args),
+        "predict_frame": lambda: model.predict_frame(frame, imgsz=imgsz, half=half),
+    }
+    results = {}
+    for name, call in calls.items():
+        call()  # warmup
+        t = []
+        for _ in range(num_frames):
+            t0 = time.perf_counter()
+            call()
+            t.append((time.perf_counter() - t0) * 1e3)
+        results[name] = {"median_ms": round(float(np.median(t)), 3), "mean_ms": round(float(np.mean(t)), 3)}
+    results["speedup"] = round(results["predict"]["median_ms"] / results["predict_frame"]["median_ms"], 3)
+    t_predict, t_frame = results["predict"]["median_ms"], results["predict_frame"]["median_ms"]
+    LOGGER.info(
+        f"predict: {t_predict:.2f}ms, predict_frame: {t_frame:.2f}ms per {shape[1]}x{shape[0]} frame "
+        f"at imgsz={imgsz} ({results['speedup']:.2f}x)"
+    )
+    return results
+
+
+def benchmark_preprocess(
+    model=WEIGHTS_DIR / "yolov8n.pt", shape=(1080, 1920), batch=8, imgsz=640, num_batches=50, device="cpu", half=False
+):
+    """
+    Compare the CPU letterbox preprocessing with the batched tensor engine enabled by `tensor_preprocess=True`.
+
+    Copies are the number of full-frame buffers written per image. The CPU path writes the resized image, the padded
+    image, the stacked batch, the contiguous BGR to RGB/BCHW array and the fp16/32 tensor, plus the device upload.
+    The tensor path writes the staging batch, the upload, the fp32 resize input and output (only when resizing) and
+    the padded input tensor. The tensor engine is aimed at CUDA devices, on CPU the cv2 path is usually faster.
+
+    Args:
+        model (str | Path | Model): Model to benchmark.
+        shape (tuple): Frame shape (height, width).
+        batch (int): Number of frames per preprocess call.
+        imgsz (int): Inference image size.
+        num_batches (int): Number of timed calls per engine.
+        device (str): Device to run on, i.e. 'cpu' or '0'.
+        half (bool): Use FP16 inputs.
+
+    Returns:
+        (dict): Milliseconds per frame and copies per frame for the 'cpu' and 'tensor' engines.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_preprocess
+
+        benchmark_preprocess(model='yolov8n.pt', shape=(1080, 1920), batch=8, device=0)
+        ```
+    """
+    if isinstance(model, (str, Path)):
+        model = YOLO(model)
+    frames = [np.random.randint(0, 256, (*shape, 3), dtype=np.uint8) for _ in range(batch)]
+    model.predict(frames[0], imgsz=imgsz, device=device, half=half, verbose=False)  # set up predictor
+    predictor = model.predictor
+    predictor.imgsz = check_imgsz(imgsz, stride=predictor.model.stride, min_dim=2)
+    resize = tuple(predictor.preprocess(frames[:1]).shape[2:]) != shape
+    cuda = predictor.device.type == "cuda"
+    copies = {"cpu": 4 + resize + cuda, "tensor": 2 + 2 * resize + cuda}
+
+    results = {}
+    for name, tensor_preprocess in (("cpu", False), ("tensor", True)):
+        predictor.args.tensor_preprocess = tensor_preprocess
+        predictor.preprocess(frames)  # warmup and buffer allocation
+        t = []
+        for _ in range(num_batches):
+            t0 = time.perf_counter()
+            predictor.preprocess(frames)
+            if cuda:
+                torch.cuda.synchronize(predictor.device)
+            t.append((time.perf_counter() - t0) * 1e3 / batch)
+        results[name] = {"ms_per_frame": round(float(np.median(t)), 3), "copies_per_frame": copies[name]}
+    predictor.args.tensor_preprocess = False
+    LOGGER.info(
+        f"Preprocess {batch}x{shape[1]}x{shape[0]} at imgsz={imgsz} on {predictor.device}: "
+        + ", ".join(f"{k} {v['ms_per_frame']:.2f}ms/im ({v['copies_per_frame']} copies)" for k, v in results.items())
+    )
+    return results
+
+
+def benchmark_nms(
+    batch_sizes=(1, 2, 4, 8, 16, 32, 64), nc=80, anchors=8400, candidates=300, num_runs=10, device="cpu", **kwargs
+):
+    """
+    Compare per-image and batched non_max_suppression() on synthetic YOLOv8 detection outputs.
+
+    Each image has `anchors` predictions of which about `candidates` score above the confidence threshold, spread over
+    random boxes and classes. Both modes are timed on identical inputs and their detections are checked for equality.
+
+    Args:
+        batch_sizes (tuple): Batch sizes to benchmark.
+        nc (int): Number of classes.
+        anchors (int): Number of predictions per image, 8400 for imgsz=640.
+        candidates (int): Approximate number of predictions per image above the confidence threshold.
+        num_runs (int): Number of timed runs per mode and batch size.
+        device (str): Device to run on, i.e. 'cpu' or '0'.
+        **kwargs (dict): Additional non_max_suppression() arguments, e.g. multi_label=True.
+
+    Returns:
+        (dict): Per batch size, median milliseconds for 'loop' and 'batched' and whether the detections 'match'.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_nms
+
+        benchmark_nms(batch_sizes=(1, 8, 64), device=0)
+        ```
+    """
+    from ultralytics.utils.ops import non_max_suppression
+
+    device = select_device(device, verbose=False)
+    results = {}
+    for bs in batch_sizes:
+        pred = torch.rand((bs, 4 + nc, anchors), device=device)
+        pred[:, :2] *= 640  # xy
+        pred[:, 2:4] *= 128  # wh
+        pred[:, 4:] *= 0.2  # background scores
+        hit = torch.rand((bs, nc, anchors), device=device) < candidates / (nc * anchors)
+        pred[:, 4:][hit] = 0.3 + 0.7 * torch.rand(int(hit.sum()), device=device)  # candidate scores
+
+        outputs, t = {}, {}
+        for name, batched in (("loop", False), ("batched", True)):
+            times = []
+            for _ in range(num_runs + 1):  # first run is warmup
+                t0 = time.perf_counter()
+                outputs[name] = non_max_suppression(pred.clone(), batched=batched, **kwargs)
+                if device.type == "cuda":
+                    torch.cuda.synchronize(device)
+                times.append((time.perf_counter() - t0) * 1e3)
+            t[name] = round(float(np.median(times[1:])), 3)
+        match = all(
+            a.shape == b.shape and torch.allclose(torch.unique(a, dim=0), torch.unique(b, dim=0))
+            for a, b in zip(outputs["loop"], outputs["batched"])
+        )  # compare sorted rows, the order of equal scores is arbitrary
+        results[bs] = {**t, "match": match}
+        LOGGER.info(f"NMS batch={bs}: loop {t['loop']:.2f}ms, batched {t['batched']:.2f}ms, match={match}")
+    return results
+
+
+def benchmark_io_binding(model=WEIGHTS_DIR / "yolov8n.pt", imgsz=640, batch=1, num_runs=50, device="cpu", half=False):
+    """
+    Compare ONNX Runtime I/O binding with plain session.run() on an exported model, for speed and identical outputs.
+
+    The model is exported to ONNX with static shapes, so AutoBackend binds torch memory. Both paths run the same
+    session on the same input; session.run() outputs are converted to tensors like AutoBackend.forward() does. Outputs
+    match when every tensor has the same shape, dtype and values.
+
+    Args:
+        model (str | Path | Model): Model to export and benchmark.
+        imgsz (int): Inference image size.
+        batch (int): Batch size of the exported model.
+        num_runs (int): Number of timed runs per path.
+        device (str): Device to run on, i.e. 'cpu' or '0'.
+        half (bool): Export and run an FP16 model, only supported on CUDA devices.
+
+    Returns:
+        (dict): Median milliseconds for 'run' and 'io_binding', and whether their outputs 'match'.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_io_binding
+
+        benchmark_io_binding(model='yolov8n-seg.pt', imgsz=640, device=0, half=True)
+        ```
+    """
+    if isinstance(model, (str, Path)):
+        model = YOLO(model)
+    f = model.export(format="onnx", imgsz=imgsz, batch=batch, half=half, device=device, dynamic=False)
+    backend = AutoBackend(f, device=select_device(device, verbose=False), fp16=half, verbose=False)
+    assert backend.io is not None, "ONNX Runtime I/O binding requires static shapes"
+    x = backend.session.get_inputs()[0]
+    im = torch.rand((batch, 3, imgsz, imgsz), device=backend.device).to(ORT_TYPES[x.type][0])
+
+    def run():
+        """Run the session on numpy arrays and convert the outputs to tensors."""
+        return [backend.from_numpy(y) for y in backend.session.run(backend.output_names, {x.name: im.cpu().numpy()})]
+
+    outputs, results = {}, {}
+    for name, fn in (("run", run), ("io_binding", lambda: backend.run_with_io_binding(im))):
+        times = []
+        for _ in range(num_runs + 1):  # first run is warmup
+            t0 = time.perf_counter()
+            outputs[name] = fn()
+            if backend.device.type == "cuda":
+                torch.cuda.synchronize(backend.device)
+            times.append((time.perf_counter() - t0) * 1e3)
+        results[name] = round(float(np.median(times[1:])), 3)
+    results["match"] = len(outputs["run"]) == len(outputs["io_binding"]) and all(
+        a.shape == b.shape and a.dtype == b.dtype and torch.equal(a, b)
+        for a, b in zip(outputs["run"], outputs["io_binding"])
+    )
+    LOGGER.info(
+        f"ONNX Runtime {Path(f).name} batch={batch} imgsz={imgsz} on {backend.device}: session.run "
+        f"{results['run']:.2f}ms, I/O binding {results['io_binding']:.2f}ms, match={results['match']}"
+    )
+    return results
+
+
+def benchmark_pipeline(
+    models=("yolov8n.pt", "yolov8n-seg.pt"),
+    sources=("synthetic", "video"),
+    batch_sizes=(1, 8),
+    imgszs=(320, 640),
+    shape=(720, 1280),
+    num_batches=20,
+    warmup=2,
+    device="cpu",
+    half=False,
+    save_json=None,
+):
+    """
+    Benchmark the end-to-end predict path stage by stage and report latency percentiles as JSON.
+
+    Each run drives Model.predict(stream=True), i.e. BasePredictor.stream_inference(), and times every batch through
+    source decode, preprocess, inference, postprocess (NMS and masks) and Results.plot(). Stage times are milliseconds
+    per batch, 'total' is the wall time from reading the batch to the end of plotting. Inputs are seeded synthetic
+    frames of `shape`, either passed in memory ('synthetic', one predict() call per batch) or written to an mp4 file
+    that is decoded by the video loader ('video', batch size 1 only), so runs are reproducible without datasets.
+
+    Args:
+        models (tuple): Models to benchmark, their task (e.g. detect, segment) is taken from the model. *.yaml models
+            run with random weights and need no download.
+        sources (tuple): Source types to benchmark, 'synthetic' and/or 'video'.
+        batch_sizes (tuple): Frames per batch for 'synthetic' sources.
+        imgszs (tuple): Inference image sizes.
+        shape (tuple): Frame shape (height, width).
+        num_batches (int): Number of timed batches per run.
+        warmup (int): Number of untimed batches before each run.
+        device (str): Device to run on, i.e. 'cpu' or '0'.
+        half (bool): Use FP16 inference.
+        save_json (str | Path, optional): File to write the JSON report to. Defaults to None.
+
+    Returns:
+        (dict): Report with 'environment' (versions, device, git commit) and a list of 'runs', each with its settings,
+            'fps' and p50/p95/p99/mean milliseconds for every stage.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_pipeline
+
+        benchmark_pipeline(models=('yolov8n.yaml', 'yolov8n-seg.yaml'), save_json='pipeline.json')
+        ```
+    """
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (*shape, 3), dtype=np.uint8) for _ in range(max(batch_sizes))]
+    stages = "decode", "preprocess", "inference", "postprocess", "plot", "total"
+
+    def run(model, source, n, **kwargs):
+        """Time `n` batches of `source`, a callable returning a new predict() source per batch or a video file."""
+        times = {k: [] for k in stages}
+        clock = {}
+
+        def on_batch_start(predictor):
+            clock["read"] = time.perf_counter() - clock["start"]
+
+        def on_batch_end(predictor):
+            speed, bs = predictor.results[0].speed, len(predictor.results)
+            clock["stages"] = [speed[k] * bs for k in ("preprocess", "inference", "postprocess")]
+
+        model.add_callback("on_predict_batch_start", on_batch_start)
+        model.add_callback("on_predict_batch_end", on_batch_end)
+        try:
+            gen = None if callable(source) else model.predict(source, stream=True, **kwargs)
+            for i in range(warmup + n):
+                clock["start"] = time.perf_counter()
+                if gen is None:
+                    batch = list(model.predict(source(), stream=True, **kwargs))
+                else:
+                    batch = [next(gen)]
+                t0 = time.perf_counter()
+                for r in batch:
+                    r.plot()
+                t1 = time.perf_counter()
+                if i >= warmup:
+                    for k, v in zip(stages, (clock["read"] * 1e3, *clock["stages"], (t1 - t0) * 1e3)):
+                        times[k].append(v)
+                    times["total"].append((t1 - clock["start"]) * 1e3)
+        finally:
+            model.callbacks["on_predict_batch_start"].remove(on_batch_start)
+            model.callbacks["on_predict_batch_end"].remove(on_batch_end)
+        return times
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        video = Path(tmp) / "video.mp4"
+        if "video" in sources:
+            writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*"mp4v"), 30, (shape[1], shape[0]))
+            for i in range(warmup + num_batches + 1):
+                writer.write(frames[i % len(frames)])
+            writer.release()
+
+        for m in models:
+            model = YOLO(m)
+            for imgsz in imgszs:
+                kwargs = dict(imgsz=imgsz, device=device, half=half, verbose=False)
+                for source in sources:
+                    for bs in batch_sizes if source == "synthetic" else (1,):
+                        src = (lambda bs=bs: frames[:bs]) if source == "synthetic" else str(video)
+                        times = run(model, src, num_batches, **kwargs)
+                        stats = {
+                            k: dict(
+                                zip(("p50", "p95", "p99"), np.percentile(v, (50, 95, 99)).round(3).tolist()),
+                                mean=round(float(np.mean(v)), 3),
+                            )
+                            for k, v in times.items()
+                        }
+                        fps = round(bs * 1e3 / stats["total"]["mean"], 2)
+                        runs.append(
+                            dict(model=str(m), task=model.task, source=source, batch=bs, imgsz=imgsz, fps=fps, **stats)
+                        )
+                        LOGGER.info(
+                            f"{Path(str(m)).name} {model.task} {source} batch={bs} imgsz={imgsz}: {fps} FPS, "
+                            + ", ".join(f"{k} p50 {stats[k]['p50']:.2f}ms" for k in stages)
+                        )
+
+    try:
+        cmd = ["git", "rev-parse", "HEAD"]
+        commit = subprocess.check_output(cmd, cwd=Path(__file__).parent, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        commit = None
+    report = {
+        "environment": {
+            "ultralytics": __version__,
+            "torch": torch.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "device": str(select_device(device, verbose=False)),
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "settings": dict(shape=list(shape), num_batches=num_batches, warmup=warmup, half=half),
+        "runs": runs,
+    }
+    if save_json:
+        Path(save_json).write_text(json.dumps(report, indent=2))
+        LOGGER.info(f"Pipeline benchmark saved to {save_json}")
+    return report
+
+
 class ProfileModels:
     """
     ProfileModels class for profiling different models on ONNX and TensorRT.
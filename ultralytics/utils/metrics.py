@@ -56,20 +56,50 @@ def box_iou(box1, box2, eps=1e-7):
     Based on https://github.com/pytorch/vision/blob/master/torchvision/ops/boxes.py
 
     Args:
-        box1 (torch.Tensor): A tensor of shape (N, 4) representing N bounding boxes.
-        box2 (torch.Tensor): A tensor of shape (M, 4) representing M bounding boxes.
+        box1 (torch.Tensor): A tensor of shape (N, 4) or (B, N, 4) representing N bounding boxes.
+        box2 (torch.Tensor): A tensor of shape (M, 4) or (B, M, 4) representing M bounding boxes.
         eps (float, optional): A small value to avoid division by zero. Defaults to 1e-7.
 
     Returns:
-        (torch.Tensor): An NxM tensor containing the pairwise IoU values for every element in box1 and box2.
+        (torch.Tensor): An NxM (or BxNxM) tensor containing the pairwise IoU values for every element in box1 and box2.
     """
 
     # inter(N,M) = (rb(N,M,2) - lt(N,M,2)).clamp(0).prod(2)
-    (a1, a2), (b1, b2) = box1.unsqueeze(1).chunk(2, 2), box2.unsqueeze(0).chunk(2, 2)
-    inter = (torch.min(a2, b2) - torch.max(a1, b1)).clamp_(0).prod(2)
+    (a1, a2), (b1, b2) = box1.unsqueeze(-2).chunk(2, -1), box2.unsqueeze(-3).chunk(2, -1)
+    inter = (torch.min(a2, b2) - torch.max(a1, b1)).clamp_(0).prod(-1)
 
     # IoU = inter / (area1 + area2 - inter)
-    return inter / ((a2 - a1).prod(2) + (b2 - b1).prod(2) - inter + eps)
+    return inter / ((a2 - a1).prod(-1) + (b2 - b1).prod(-1) - inter + eps)
+
+
+def greedy_match(iou, target, thresholds):
+    """
+    Match predictions to targets greedily at several IoU thresholds at once, vectorised over predictions.
+
+    Each prediction is assigned to its highest-IoU target. At every threshold, a target is matched by the first (lowest
+    index) of its predictions whose IoU reaches the threshold. This is the matching of
+    BaseValidator.match_predictions() without sorting candidate pairs once per threshold, and works across images when
+    target indices are unique per image.
+
+    Args:
+        iou (torch.Tensor): IoU of each prediction with its assigned target, shape (N,), 0 if it has none.
+        target (torch.Tensor): Index of the assigned target of each prediction, shape (N,).
+        thresholds (torch.Tensor): IoU thresholds, shape (T,).
+
+    Returns:
+        (torch.Tensor): Boolean tensor of shape (N, T), True where the prediction is a true positive.
+    """
+    valid = iou[:, None] >= thresholds.to(iou.device)  # (N, T)
+    if len(target) < 2:
+        return valid
+    target, order = torch.sort(target, stable=True)  # predictions of each target together, in prediction order
+    v = valid[order]
+    cs = v.int().cumsum(0)
+    start = torch.searchsorted(target, target)  # sorted position of the first prediction of each target
+    first = v & (cs - cs[start] + v[start] == 1)  # first valid prediction of its target
+    correct = torch.empty_like(first)
+    correct[order] = first
+    return correct
 
 
 def bbox_iou(box1, box2, xywh=True, GIoU=False, DIoU=False, CIoU=False, eps=1e-7):
@@ -318,8 +348,7 @@ class ConfusionMatrix:
             targets (Array[N, 1]): Ground truth class labels.
         """
         preds, targets = torch.cat(preds)[:, 0], torch.cat(targets)
-        for p, t in zip(preds.cpu().numpy(), targets.cpu().numpy()):
-            self.matrix[p][t] += 1
+        self._add(preds.long(), targets.long())
 
     def process_batch(self, detections, gt_bboxes, gt_cls):
         """
@@ -335,19 +364,15 @@ class ConfusionMatrix:
         if gt_cls.shape[0] == 0:  # Check if labels is empty
             if detections is not None:
                 detections = detections[detections[:, 4] > self.conf]
-                detection_classes = detections[:, 5].int()
-                for dc in detection_classes:
-                    self.matrix[dc, self.nc] += 1  # false positives
+                self._add(detections[:, 5].long(), self.nc)  # false positives
             return
+        gt_classes = gt_cls.long()
         if detections is None:
-            gt_classes = gt_cls.int()
-            for gc in gt_classes:
-                self.matrix[self.nc, gc] += 1  # background FN
+            self._add(self.nc, gt_classes)  # background FN
             return
 
         detections = detections[detections[:, 4] > self.conf]
-        gt_classes = gt_cls.int()
-        detection_classes = detections[:, 5].int()
+        detection_classes = detections[:, 5].long()
         is_obb = detections.shape[1] == 7 and gt_bboxes.shape[1] == 5  # with additional `angle` dimension
         iou = (
             batch_probiou(gt_bboxes, torch.cat([detections[:, :4], detections[:, -1:]], dim=-1))
@@ -355,30 +380,28 @@ class ConfusionMatrix:
             else box_iou(gt_bboxes, detections[:, :4])
         )
 
-        x = torch.where(iou > self.iou_thres)
-        if x[0].shape[0]:
-            matches = torch.cat((torch.stack(x, 1), iou[x[0], x[1]][:, None]), 1).cpu().numpy()
-            if x[0].shape[0] > 1:
-                matches = matches[matches[:, 2].argsort()[::-1]]
-                matches = matches[np.unique(matches[:, 1], return_index=True)[1]]
-                matches = matches[matches[:, 2].argsort()[::-1]]
-                matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
-        else:
-            matches = np.zeros((0, 3))
-
-        n = matches.shape[0] > 0
-        m0, m1, _ = matches.transpose().astype(int)
-        for i, gc in enumerate(gt_classes):
-            j = m0 == i
-            if n and sum(j) == 1:
-                self.matrix[detection_classes[m1[j]], gc] += 1  # correct
-            else:
-                self.matrix[self.nc, gc] += 1  # true background
-
-        if n:
-            for i, dc in enumerate(detection_classes):
-                if not any(m1 == i):
-                    self.matrix[dc, self.nc] += 1  # predicted background
+        # Each detection keeps its best label above the IoU threshold, each label its best remaining detection
+        gt_det = torch.zeros(len(gt_classes), dtype=torch.long, device=iou.device)
+        gt_matched = torch.zeros(len(gt_classes), dtype=torch.bool, device=iou.device)
+        if iou.shape[1]:
+            best_iou, best_gt = iou.max(0)
+            own = best_gt[None] == torch.arange(len(gt_classes), device=iou.device)[:, None]  # (M, N) best label
+            gt_iou, gt_det = (iou * (own & (best_iou > self.iou_thres))).max(1)
+            gt_matched = gt_iou > 0
+        det_matched = torch.zeros(len(detection_classes), dtype=torch.bool, device=iou.device)
+        det_matched[gt_det[gt_matched]] = True
+
+        pred = torch.full_like(gt_classes, self.nc)  # true background
+        pred[gt_matched] = detection_classes[gt_det[gt_matched]]  # correct
+        fp = detection_classes[~det_matched] if gt_matched.any() else detection_classes[:0]  # predicted background
+        self._add(torch.cat((pred, fp)), torch.cat((gt_classes, torch.full_like(fp, self.nc))))
+
+    def _add(self, pred, true):
+        """Count (predicted, true) class pairs into the matrix with one bincount, pairs given as tensors or ints."""
+        pred, true = torch.as_tensor(pred), torch.as_tensor(true)
+        index = (pred * self.matrix.shape[1] + true).reshape(-1)
+        if index.numel():
+            self.matrix += torch.bincount(index, minlength=self.matrix.size).cpu().numpy().reshape(self.matrix.shape)
 
     def matrix(self):
         """Returns the confusion matrix."""
@@ -535,7 +558,18 @@ def compute_ap(recall, precision):
 
 
 def ap_per_class(
-    tp, conf, pred_cls, target_cls, plot=False, on_plot=None, save_dir=Path(), names=(), eps=1e-16, prefix=""
+    tp,
+    conf,
+    pred_cls,
+    target_cls,
+    plot=False,
+    on_plot=None,
+    save_dir=Path(),
+    names=(),
+    eps=1e-16,
+    prefix="",
+    npred=None,
+    nt=None,
 ):
     """
     Computes the average precision per class for object detection evaluation.
@@ -551,6 +585,10 @@ def ap_per_class(
         names (tuple, optional): Tuple of class names to plot PR curves. Defaults to an empty tuple.
         eps (float, optional): A small value to avoid division by zero. Defaults to 1e-16.
         prefix (str, optional): A prefix string for saving the plot files. Defaults to an empty string.
+        npred (np.ndarray, optional): Number of detections each row stands for, when rows are binned detections and
+            `tp` holds true positive counts. Defaults to None, one detection per row.
+        nt (np.ndarray, optional): Number of labels of each class in `target_cls`, when `target_cls` holds unique
+            sorted classes. Defaults to None, one label per element of `target_cls`.
 
     Returns:
         (tuple): A tuple of six arrays and one array of unique classes, where:
@@ -571,9 +609,10 @@ def ap_per_class(
     # Sort by objectness
     i = np.argsort(-conf)
     tp, conf, pred_cls = tp[i], conf[i], pred_cls[i]
+    npred = np.ones((len(conf), 1), dtype=int) if npred is None else npred[i, None]  # detections per row
 
     # Find unique classes
-    unique_classes, nt = np.unique(target_cls, return_counts=True)
+    unique_classes, nt = np.unique(target_cls, return_counts=True) if nt is None else (target_cls, nt)
     nc = unique_classes.shape[0]  # number of classes, number of detections
 
     # Create Precision-Recall curve and compute AP for each class
@@ -589,7 +628,7 @@ def ap_per_class(
             continue
 
         # Accumulate FPs and TPs
-        fpc = (1 - tp[i]).cumsum(0)
+        fpc = (npred[i] - tp[i]).cumsum(0)
         tpc = tp[i].cumsum(0)
 
         # Recall
@@ -625,6 +664,102 @@ def ap_per_class(
     return tp, fp, p, r, f1, ap, unique_classes.astype(int), p_curve, r_curve, f1_curve, x, prec_values
 
 
+class APHistogram(SimpleClass):
+    """
+    Validation statistics kept as per-class histograms over confidence, for computing AP in fixed memory.
+
+    Instead of keeping every detection until ap_per_class() sorts them, each detection is counted into one of `bins`
+    equal confidence bins of its class, together with the number of true positives of each bin at every IoU threshold.
+    Memory is nc * bins * (niou + 1) counts however many images are validated. The precision-recall curves are then
+    evaluated once per bin rather than at every detection, which typically moves mAP by about 0.001 or less with 1000
+    bins. Counts are integers, so histograms of shards validated by different processes merge exactly.
+
+    Attributes:
+        nc (int): Number of classes.
+        niou (int): Number of IoU thresholds.
+        bins (int): Number of confidence bins per class.
+        npred (torch.Tensor): Number of detections per class and bin, shape (nc * bins,).
+        tp (dict): True positive counts per class and bin of each statistic, e.g. 'tp', shape (nc * bins, niou).
+        nt (torch.Tensor): Number of labels per class, shape (nc,).
+
+    Example:
+        ```python
+        hist = APHistogram(nc=80, bins=1000)
+        hist.update(conf, pred_cls, target_cls, tp=tp)  # per batch, tensors of any length
+        hist.merge(other)  # e.g. a histogram returned by another process
+        stats = hist.stats()  # pass to DetMetrics.process(**stats)
+        ```
+    """
+
+    def __init__(self, nc, niou=10, bins=1000, keys=("tp",), device=None):
+        """
+        Initialize empty histograms.
+
+        Args:
+            nc (int): Number of classes.
+            niou (int): Number of IoU thresholds.
+            bins (int): Number of confidence bins per class.
+            keys (tuple): Names of the true positive statistics to count, e.g. ('tp', 'tp_m') for segmentation.
+            device (torch.device, optional): Device of the counts, the device of the updates.
+        """
+        self.nc, self.niou, self.bins = nc, niou, bins
+        self.npred = torch.zeros(nc * bins, dtype=torch.long, device=device)
+        self.tp = {k: torch.zeros((nc * bins, niou), dtype=torch.long, device=device) for k in keys}
+        self.nt = torch.zeros(nc, dtype=torch.long, device=device)
+
+    def update(self, conf, pred_cls, target_cls, **tp):
+        """
+        Count the detections and labels of one or more images.
+
+        Args:
+            conf (torch.Tensor): Confidences of the detections, shape (N,).
+            pred_cls (torch.Tensor): Predicted classes of the detections, shape (N,).
+            target_cls (torch.Tensor): Classes of the labels, shape (M,).
+            **tp (torch.Tensor): Correct matrices of shape (N, niou) for each key of the histogram.
+        """
+        idx = pred_cls.long() * self.bins + (conf * self.bins).long().clamp_(0, self.bins - 1)  # class and bin
+        self.npred += torch.bincount(idx, minlength=len(self.npred))
+        for k, v in tp.items():
+            self.tp[k].index_add_(0, idx, v.long())
+        self.nt += torch.bincount(target_cls.long(), minlength=self.nc)
+
+    def merge(self, other):
+        """Add the counts of another histogram with the same classes, thresholds, bins and keys, and return self."""
+        assert (self.nc, self.niou, self.bins, self.tp.keys()) == (other.nc, other.niou, other.bins, other.tp.keys()), (
+            "can only merge histograms of the same shape"
+        )
+        self.npred += other.npred.to(self.npred.device)
+        for k, v in other.tp.items():
+            self.tp[k] += v.to(self.npred.device)
+        self.nt += other.nt.to(self.npred.device)
+        return self
+
+    def __iadd__(self, other):
+        """Merge another histogram into this one, see merge()."""
+        return self.merge(other)
+
+    def stats(self):
+        """
+        Return the non-empty bins as stats for ap_per_class() and the process() method of the metrics classes.
+
+        Returns:
+            (dict): True positive counts per key of shape (n, niou), and 'conf' (bin centers), 'pred_cls' and 'npred' of
+                shape (n,) for the n non-empty bins, with 'target_cls' the labelled classes and 'nt' their label counts.
+        """
+        npred = self.npred.cpu().numpy()
+        i = np.flatnonzero(npred)  # non-empty bins
+        nt = self.nt.cpu().numpy()
+        c = np.flatnonzero(nt)  # labelled classes
+        return {
+            **{k: v.cpu().numpy()[i] for k, v in self.tp.items()},
+            "conf": (i % self.bins + 0.5) / self.bins,
+            "pred_cls": i // self.bins,
+            "npred": npred[i],
+            "target_cls": c,
+            "nt": nt[c],
+        }
+
+
 class Metric(SimpleClass):
     """
     Class for computing evaluation metrics for YOLOv8 model.
@@ -839,7 +974,7 @@ class DetMetrics(SimpleClass):
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
         self.task = "detect"
 
-    def process(self, tp, conf, pred_cls, target_cls):
+    def process(self, tp, conf, pred_cls, target_cls, npred=None, nt=None):
         """Process predicted results for object detection and update metrics."""
         results = ap_per_class(
             tp,
@@ -850,6 +985,8 @@ class DetMetrics(SimpleClass):
             save_dir=self.save_dir,
             names=self.names,
             on_plot=self.on_plot,
+            npred=npred,
+            nt=nt,
         )[2:]
         self.box.nc = len(self.names)
         self.box.update(results)
@@ -938,7 +1075,7 @@ class SegmentMetrics(SimpleClass):
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
         self.task = "segment"
 
-    def process(self, tp, tp_m, conf, pred_cls, target_cls):
+    def process(self, tp, tp_m, conf, pred_cls, target_cls, npred=None, nt=None):
         """
         Processes the detection and segmentation metrics over the given set of predictions.
 
@@ -948,6 +1085,8 @@ class SegmentMetrics(SimpleClass):
             conf (list): List of confidence scores.
             pred_cls (list): List of predicted classes.
             target_cls (list): List of target classes.
+            npred (np.ndarray, optional): Detections per row of binned stats, see APHistogram.
+            nt (np.ndarray, optional): Labels per class of binned stats, see APHistogram.
         """
 
         results_mask = ap_per_class(
@@ -960,6 +1099,8 @@ class SegmentMetrics(SimpleClass):
             save_dir=self.save_dir,
             names=self.names,
             prefix="Mask",
+            npred=npred,
+            nt=nt,
         )[2:]
         self.seg.nc = len(self.names)
         self.seg.update(results_mask)
@@ -973,6 +1114,8 @@ class SegmentMetrics(SimpleClass):
             save_dir=self.save_dir,
             names=self.names,
             prefix="Box",
+            npred=npred,
+            nt=nt,
         )[2:]
         self.box.nc = len(self.names)
         self.box.update(results_box)
@@ -1080,7 +1223,7 @@ class PoseMetrics(SegmentMetrics):
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
         self.task = "pose"
 
-    def process(self, tp, tp_p, conf, pred_cls, target_cls):
+    def process(self, tp, tp_p, conf, pred_cls, target_cls, npred=None, nt=None):
         """
         Processes the detection and pose metrics over the given set of predictions.
 
@@ -1090,6 +1233,8 @@ class PoseMetrics(SegmentMetrics):
             conf (list): List of confidence scores.
             pred_cls (list): List of predicted classes.
             target_cls (list): List of target classes.
+            npred (np.ndarray, optional): Detections per row of binned stats, see APHistogram.
+            nt (np.ndarray, optional): Labels per class of binned stats, see APHistogram.
         """
 
         results_pose = ap_per_class(
@@ -1102,6 +1247,8 @@ class PoseMetrics(SegmentMetrics):
             save_dir=self.save_dir,
             names=self.names,
             prefix="Pose",
+            npred=npred,
+            nt=nt,
         )[2:]
         self.pose.nc = len(self.names)
         self.pose.update(results_pose)
@@ -1115,6 +1262,8 @@ class PoseMetrics(SegmentMetrics):
             save_dir=self.save_dir,
             names=self.names,
             prefix="Box",
+            npred=npred,
+            nt=nt,
         )[2:]
         self.box.nc = len(self.names)
         self.box.update(results_box)
@@ -1238,7 +1387,7 @@ class OBBMetrics(SimpleClass):
         self.box = Metric()
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
 
-    def process(self, tp, conf, pred_cls, target_cls):
+    def process(self, tp, conf, pred_cls, target_cls, npred=None, nt=None):
         """Process predicted results for object detection and update metrics."""
         results = ap_per_class(
             tp,
@@ -1249,6 +1398,8 @@ class OBBMetrics(SimpleClass):
             save_dir=self.save_dir,
             names=self.names,
             on_plot=self.on_plot,
+            npred=npred,
+            nt=nt,
         )[2:]
         self.box.nc = len(self.names)
         self.box.update(results)
@@ -175,10 +175,21 @@ def non_max_suppression(
     max_wh=7680,
     in_place=True,
     rotated=False,
+    batched=False,
 ):
     """
     Perform non-maximum suppression (NMS) on a set of boxes, with support for masks and multiple labels per box.
 
+    Candidates are filtered by confidence and limited to the `max_nms` most confident boxes per image with
+    torch.topk() before any box is decoded, so only the survivors are converted from xywh to xyxy.
+
+    By default NMS runs image by image. With `batched=True` the candidates of all images are gathered at once, boxes
+    are offset per image as well as per class, and a single NMS call covers the whole batch. This removes the
+    per-image Python loop and its device syncs, which dominate on CUDA at large batch sizes. NMS cost grows with the
+    square of the candidates in one call, so on CPU the per-image loop is usually faster. The batched mode gives the
+    same detections and does not modify `prediction` in place; it falls back to the per-image loop for rotated boxes
+    and apriori `labels`.
+
     Args:
         prediction (torch.Tensor): A tensor of shape (batch_size, num_classes + 4 + num_masks, num_boxes)
             containing the predicted boxes, classes, and masks. The tensor should be in the format
@@ -199,7 +210,10 @@ def non_max_suppression(
         max_time_img (float): The maximum time (seconds) for processing one image.
         max_nms (int): The maximum number of boxes into torchvision.ops.nms().
         max_wh (int): The maximum box width and height in pixels.
-        in_place (bool): If True, the input prediction tensor will be modified in place.
+        in_place (bool): Unused, kept for backwards compatibility. `prediction` is never modified in place as only
+            the surviving candidates are decoded.
+        rotated (bool): If True, boxes are rotated boxes in xywhr format.
+        batched (bool): If True, run a single NMS call over all images in the batch.
 
     Returns:
         (List[torch.Tensor]): A list of length batch_size, where each element is a tensor of
@@ -223,13 +237,14 @@ def non_max_suppression(
     # min_wh = 2  # (pixels) minimum box width and height
     time_limit = 2.0 + max_time_img * bs  # seconds to quit after
     multi_label &= nc > 1  # multiple labels per box (adds 0.5ms/img)
+    if classes is not None:
+        classes = torch.tensor(classes, device=prediction.device)
 
     prediction = prediction.transpose(-1, -2)  # shape(1,84,6300) to shape(1,6300,84)
-    if not rotated:
-        if in_place:
-            prediction[..., :4] = xywh2xyxy(prediction[..., :4])  # xywh to xyxy
-        else:
-            prediction = torch.cat((xywh2xyxy(prediction[..., :4]), prediction[..., 4:]), dim=-1)  # xywh to xyxy
+    if batched and not rotated and not labels:
+        return batched_nms_candidates(
+            prediction, xc, conf_thres, iou_thres, classes, agnostic, multi_label, max_det, nc, max_nms, max_wh
+        )
 
     t = time.time()
     output = [torch.zeros((0, 6 + nm), device=prediction.device)] * bs
@@ -242,7 +257,7 @@ def non_max_suppression(
         if labels and len(labels[xi]) and not rotated:
             lb = labels[xi]
             v = torch.zeros((len(lb), nc + nm + 4), device=x.device)
-            v[:, :4] = xywh2xyxy(lb[:, 1:5])  # box
+            v[:, :4] = lb[:, 1:5]  # xywh box, decoded with the other survivors below
             v[range(len(lb)), lb[:, 0].long() + 4] = 1.0  # cls
             x = torch.cat((x, v), 0)
 
@@ -258,18 +273,21 @@ def non_max_suppression(
             x = torch.cat((box[i], x[i, 4 + j, None], j[:, None].float(), mask[i]), 1)
         else:  # best class only
             conf, j = cls.max(1, keepdim=True)
-            x = torch.cat((box, conf, j.float(), mask), 1)[conf.view(-1) > conf_thres]
+            i = conf.view(-1) > conf_thres
+            x = torch.cat((box[i], conf[i], j[i].float(), mask[i]), 1)
 
         # Filter by class
         if classes is not None:
-            x = x[(x[:, 5:6] == torch.tensor(classes, device=x.device)).any(1)]
+            x = x[(x[:, 5:6] == classes).any(1)]
 
         # Check shape
         n = x.shape[0]  # number of boxes
         if not n:  # no boxes
             continue
         if n > max_nms:  # excess boxes
-            x = x[x[:, 4].argsort(descending=True)[:max_nms]]  # sort by confidence and remove excess boxes
+            x = x[x[:, 4].topk(max_nms).indices]  # keep the max_nms most confident boxes
+        if not rotated:
+            x[:, :4] = xywh2xyxy(x[:, :4])  # decode the surviving boxes only, xywh to xyxy
 
         # Batched NMS
         c = x[:, 5:6] * (0 if agnostic else max_wh)  # classes
@@ -302,6 +320,107 @@ def non_max_suppression(
     return output
 
 
+def rank_within_groups(groups, num_groups):
+    """
+    Rank elements within their group, keeping the current element order inside each group.
+
+    Args:
+        groups (torch.Tensor): Group index of each element, shape (n,).
+        num_groups (int): Number of groups.
+
+    Returns:
+        order (torch.Tensor): Permutation that sorts elements by group, stable within a group.
+        rank (torch.Tensor): Position of each element of `groups[order]` within its group.
+    """
+    order = torch.sort(groups, stable=True).indices
+    groups = groups[order]
+    counts = torch.bincount(groups, minlength=num_groups)
+    starts = counts.cumsum(0) - counts
+    rank = torch.arange(len(groups), device=groups.device) - starts[groups]
+    return order, rank
+
+
+def pack_targets(batch_idx, targets, batch_size):
+    """
+    Pack the targets of a batch into one zero-padded row of targets per image, without a loop over images.
+
+    Args:
+        batch_idx (torch.Tensor): Image index of each target, shape (n,).
+        targets (torch.Tensor): Targets, e.g. class and box, shape (n, c).
+        batch_size (int): Number of images.
+
+    Returns:
+        (torch.Tensor): Targets of each image in their original order, padded with zeros to the largest number of
+            targets of an image, shape (batch_size, max_targets, c).
+    """
+    order, rank = rank_within_groups(batch_idx.view(-1).long(), batch_size)
+    out = targets.new_zeros(batch_size, int(rank.max()) + 1 if len(rank) else 0, targets.shape[-1])
+    out[batch_idx.view(-1).long()[order], rank] = targets[order]
+    return out
+
+
+def batched_nms_candidates(
+    prediction, xc, conf_thres, iou_thres, classes, agnostic, multi_label, max_det, nc, max_nms, max_wh
+):
+    """
+    Batched NMS used by non_max_suppression(batched=True), without a Python loop over images.
+
+    Args:
+        prediction (torch.Tensor): Predictions of shape (batch_size, num_boxes, 4 + nc + nm) with xywh boxes.
+        xc (torch.Tensor): Candidate mask of shape (batch_size, num_boxes).
+        conf_thres (float): Confidence threshold.
+        iou_thres (float): IoU threshold.
+        classes (torch.Tensor | None): Class indices to keep.
+        agnostic (bool): Class-agnostic NMS.
+        multi_label (bool): Allow multiple labels per box.
+        max_det (int): Maximum detections per image.
+        nc (int): Number of classes.
+        max_nms (int): Maximum boxes per image passed to NMS.
+        max_wh (int): Maximum box width and height in pixels, used to offset classes.
+
+    Returns:
+        (List[torch.Tensor]): Detections per image with columns (x1, y1, x2, y2, confidence, class, mask1, ...).
+    """
+    bs, nm = prediction.shape[0], prediction.shape[2] - nc - 4
+    b, a = xc.nonzero(as_tuple=True)  # image and anchor index of every candidate
+    x = prediction[b, a]
+    box, cls, mask = x.split((4, nc, nm), 1)
+
+    if multi_label:
+        i, j = torch.where(cls > conf_thres)
+        x, b = torch.cat((box[i], cls[i, j, None], j[:, None].float(), mask[i]), 1), b[i]
+    else:  # best class only
+        conf, j = cls.max(1, keepdim=True)
+        i = conf.view(-1) > conf_thres
+        x, b = torch.cat((box[i], conf[i], j[i].float(), mask[i]), 1), b[i]
+    if classes is not None:
+        keep = (x[:, 5:6] == classes).any(1)
+        x, b = x[keep], b[keep]
+    if not x.shape[0]:
+        return [torch.zeros((0, 6 + nm), device=prediction.device)] * bs
+
+    counts = torch.bincount(b, minlength=bs)
+    if counts.max() > max_nms:  # keep the max_nms most confident boxes of each image with one padded topk
+        starts = counts.cumsum(0) - counts  # candidates are grouped by image in order
+        scores = torch.full((bs, int(counts.max())), -torch.inf, device=x.device, dtype=x.dtype)
+        scores[b, torch.arange(len(b), device=b.device) - starts[b]] = x[:, 4]
+        top = scores.topk(max_nms, dim=1)
+        i = (starts[:, None] + top.indices)[top.values > -torch.inf]
+        x, b = x[i], b[i]
+    x[:, :4] = xywh2xyxy(x[:, :4])  # decode the surviving boxes only, xywh to xyxy
+
+    # Offset boxes by class exactly as the per-image path does, then by image in float64 so images never overlap
+    c = x[:, 5:6] * (0 if agnostic else max_wh)
+    boxes = (x[:, :4] + c).double()
+    span = boxes.max() - min(boxes.min(), 0) + 1
+    boxes += b[:, None].double() * span
+    i = torchvision.ops.nms(boxes, x[:, 4].double(), iou_thres)  # sorted by decreasing score
+
+    order, rank = rank_within_groups(b[i], bs)
+    i = i[order[rank < max_det]]  # limit detections per image, grouped by image
+    return list(x[i].split(torch.bincount(b[i], minlength=bs).tolist()))
+
+
 def clip_boxes(boxes, shape):
     """
     Takes a list of bounding boxes and a shape (height, width) and clips the bounding boxes to the shape.
@@ -821,6 +940,111 @@ def masks2segments(masks, strategy="largest"):
     return segments
 
 
+def masks2rle(masks, offsets=None, shape=None, compress=True):
+    """
+    Encode binary masks as COCO-style run-length encodings (column-major runs that start with background).
+
+    Run boundaries of all masks are found with one vectorised comparison. Masks can also be given as equal-size crops
+    placed at `offsets` in a frame of `shape`, so a mask only needs to be built inside its box.
+
+    Args:
+        masks (torch.Tensor | np.ndarray): Binary masks of shape (n, h, w), or crops of shape (n, ch, cw) if `offsets`.
+        offsets (np.ndarray, optional): Top-left corners (x1, y1) of the crops, shape (n, 2). Defaults to None.
+        shape (tuple, optional): Frame size (h, w) the crops are placed in. Required with `offsets`.
+        compress (bool): Return COCO compressed string counts instead of a list of ints. Defaults to True.
+
+    Returns:
+        (List[dict]): One {'size': [h, w], 'counts': str | List[int]} dict per mask.
+    """
+    if isinstance(masks, torch.Tensor):
+        masks = masks.cpu().numpy()
+    n, ch, cw = masks.shape
+    h, w = shape or (ch, cw)
+    offsets = np.zeros((n, 2), dtype=np.int64) if offsets is None else np.asarray(offsets, dtype=np.int64).reshape(n, 2)
+    p = np.zeros((n, cw, ch + 2), dtype=bool)  # column-major crops with a background row above and below
+    p[:, :, 1:-1] = masks.transpose(0, 2, 1) > 0
+    i, col, row = np.nonzero(p[:, :, 1:] != p[:, :, :-1])  # a run starts at crop row `row` of column `col`
+    pos = (offsets[i, 0] + col) * h + offsets[i, 1] + row
+
+    # A run ending at the bottom of a column and one starting at the top of the next column are a single run
+    key, count = np.unique(i * (h * w + 1) + pos, return_counts=True)
+    i, pos = np.divmod(key[(count % 2 == 1)], h * w + 1)
+    i, pos = i[pos < h * w], pos[pos < h * w]
+    bounds = np.searchsorted(i, np.arange(n + 1))
+
+    rles = []
+    for j in range(n):
+        counts = np.diff(pos[bounds[j] : bounds[j + 1]], prepend=0, append=h * w).tolist()
+        rles.append({"size": [h, w], "counts": rle2string(counts) if compress else counts})
+    return rles
+
+
+def rle2masks(rles):
+    """
+    Decode COCO-style run-length encodings to binary masks.
+
+    Args:
+        rles (List[dict]): Encodings from masks2rle(), all with the same 'size'.
+
+    Returns:
+        (np.ndarray): Boolean masks of shape (n, h, w).
+    """
+    masks = []
+    for rle in rles:
+        h, w = rle["size"]
+        counts = string2rle(rle["counts"]) if isinstance(rle["counts"], (str, bytes)) else rle["counts"]
+        masks.append(np.repeat(np.arange(len(counts)) % 2 == 1, counts).reshape(w, h).T)
+    return np.stack(masks) if masks else np.zeros((0, 0, 0), dtype=bool)
+
+
+def rle2string(counts):
+    """
+    Compress RLE counts to the COCO string format, 5 bits per character with counts stored as deltas after the 2nd.
+
+    Args:
+        counts (List[int]): Run lengths.
+
+    Returns:
+        (str): Compressed counts.
+    """
+    s = []
+    for i, x in enumerate(counts):
+        x -= counts[i - 2] if i > 2 else 0
+        more = True
+        while more:
+            c = x & 0x1F
+            x >>= 5
+            more = x != -1 if c & 0x10 else x != 0
+            s.append(chr(c + 48 + (0x20 if more else 0)))
+    return "".join(s)
+
+
+def string2rle(s):
+    """
+    Decompress COCO string RLE counts.
+
+    Args:
+        s (str | bytes): Compressed counts.
+
+    Returns:
+        (List[int]): Run lengths.
+    """
+    s = s.decode("utf-8") if isinstance(s, bytes) else s
+    counts, p = [], 0
+    while p < len(s):
+        x, k, more = 0, 0, True
+        while more:
+            c = ord(s[p]) - 48
+            x |= (c & 0x1F) << 5 * k
+            more = c & 0x20
+            p += 1
+            k += 1
+            if not more and c & 0x10:
+                x |= -1 << 5 * k
+        counts.append(x + (counts[-2] if len(counts) > 2 else 0))
+    return counts
+
+
 def convert_torch2numpy_batch(batch: torch.Tensor) -> np.ndarray:
     """
     Convert a batch of FP32 torch tensors (0.0-1.0) to a NumPy uint8 array (0-255), changing from BCHW to BHWC layout.
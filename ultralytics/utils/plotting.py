@@ -3,6 +3,7 @@
 import contextlib
 import math
 import warnings
+from functools import lru_cache
 from pathlib import Path
 
 import cv2
@@ -96,6 +97,29 @@ class Colors:
 colors = Colors()  # create instance for 'from utils.plots import colors'
 
 
+@lru_cache(maxsize=4096)
+def _label_glyph(label, font_scale, thickness, color):
+    """
+    Rasterise a label with cv2.putText() once, for Annotator.box_labels().
+
+    Args:
+        label (str): Label text.
+        font_scale (float): cv2 font scale.
+        thickness (int): cv2 font thickness.
+        color (tuple): Text color.
+
+    Returns:
+        src (np.ndarray): Image of shape (h, w, 3) filled with `color`, with a `thickness` margin on each side and the
+            text baseline at `thickness` + text height from the top.
+        mask (np.ndarray): Text pixels of shape (h, w), uint8.
+        h (int): Text height above the baseline.
+    """
+    (w, h), baseline = cv2.getTextSize(label, 0, fontScale=font_scale, thickness=thickness)
+    mask = np.zeros((h + baseline + 2 * thickness, w + 2 * thickness), dtype=np.uint8)
+    cv2.putText(mask, label, (thickness, h + thickness), 0, font_scale, 255, thickness=thickness)
+    return np.full((*mask.shape, 3), color, dtype=np.uint8), mask, h
+
+
 class Annotator:
     """
     Ultralytics Annotator for train/val mosaics and JPGs and predictions annotations.
@@ -204,6 +228,55 @@ class Annotator:
                     lineType=cv2.LINE_AA,
                 )
 
+    def box_labels(self, boxes, labels=None, colors=None, txt_color=(255, 255, 255)):
+        """
+        Add many xyxy boxes with labels to the image in one pass, later boxes are drawn on top of earlier ones.
+
+        Box corners and label placement are computed for all boxes at once, boxes and label backgrounds are drawn
+        without anti-aliasing and text is copied in from label glyphs that are rasterised once and cached, so each box
+        costs two fills and one masked copy. PIL images and non-ascii labels fall back to box_label().
+
+        Args:
+            boxes (torch.Tensor | np.ndarray): Boxes of shape (n, 4) in xyxy format.
+            labels (List[str], optional): Label for each box, empty or None to draw no label. Defaults to None.
+            colors (List[tuple], optional): Color for each box. Defaults to gray.
+            txt_color (tuple): Label text color.
+        """
+        n = len(boxes)
+        labels = labels or [""] * n
+        colors = colors or [(128, 128, 128)] * n
+        if self.pil or not all(is_ascii(x) for x in labels if x):
+            for box, label, color in zip(boxes, labels, colors):
+                self.box_label(box, label, color, txt_color)
+            return
+        if isinstance(boxes, torch.Tensor):
+            boxes = boxes.cpu().numpy()
+        boxes = np.asarray(boxes, dtype=float).astype(int)  # truncate like box_label()
+        x1, y1 = boxes[:, 0], boxes[:, 1]
+
+        # Label backgrounds above the box if they fit, inside it otherwise, with the text baseline 2 px from the box
+        txt_color = tuple(int(x) for x in txt_color)
+        glyphs = [_label_glyph(x, self.sf, self.tf, txt_color) if x else None for x in labels]
+        tw = np.array([g[0].shape[1] - 2 * self.tf if g else 0 for g in glyphs], dtype=int)
+        th = np.array([g[2] if g else 0 for g in glyphs], dtype=int)
+        outside = y1 - th >= 3
+        bg = np.stack([x1, y1, x1 + tw, np.where(outside, y1 - th - 3, y1 + th + 3)], 1)
+        origin = np.stack([x1 - self.tf, np.where(outside, y1 - 2, y1 + th + 2) - th - self.tf], 1)
+
+        h, w = self.im.shape[:2]
+        for box, color, glyph, (x, y), (p1x, p1y, p2x, p2y) in zip(
+            boxes.tolist(), colors, glyphs, origin.tolist(), bg.tolist()
+        ):
+            cv2.rectangle(self.im, box[:2], box[2:], color, thickness=self.lw)
+            if glyph is None:
+                continue
+            cv2.rectangle(self.im, (p1x, p1y), (p2x, p2y), color, -1)  # filled
+            src, mask, _ = glyph
+            c0, r0, c1, r1 = max(x, 0), max(y, 0), min(x + mask.shape[1], w), min(y + mask.shape[0], h)
+            if c0 < c1 and r0 < r1:  # copy the text pixels of the part of the glyph inside the image
+                crop = slice(r0 - y, r1 - y), slice(c0 - x, c1 - x)
+                cv2.copyTo(src[crop], mask[crop], self.im[r0:r1, c0:c1])
+
     def masks(self, masks, colors, im_gpu, alpha=0.5, retina_masks=False):
         """
         Plot masks on image.
@@ -240,6 +313,42 @@ class Annotator:
             # Convert im back to PIL and update draw
             self.fromarray(self.im)
 
+    def overlay_masks(self, masks, colors, alpha=0.5):
+        """
+        Blend masks into the image at the image's own resolution.
+
+        Rather than stacking an [n, h, w, 3] color tensor, the masks are reduced to one color and one transparency map:
+        each pixel takes the color of the first mask covering it and the image behind it is attenuated by (1 - alpha)
+        per covering mask. Both maps are computed at mask resolution, cropped and resized to the image like
+        ops.scale_masks() and blended with the full-resolution image, so memory scales with image size rather than
+        detection count and the image itself is never letterboxed or resampled.
+
+        Args:
+            masks (torch.Tensor): Masks of shape [n, h, w], at image size or letterboxed at inference size.
+            colors (List[List[Int]]): Colors for the masks, [[r, g, b] * n], first masks are drawn on top.
+            alpha (float): Mask transparency: 0.0 fully transparent, 1.0 opaque
+        """
+        if self.pil:
+            # Convert to numpy first
+            self.im = np.asarray(self.im).copy()
+        if len(masks):
+            n, masks = len(masks), masks.float()
+            colors = torch.tensor([*colors, (0, 0, 0)], device=masks.device, dtype=torch.float32) * alpha  # (n+1,3)
+            top = torch.zeros(masks.shape[1:], device=masks.device)  # n - index of the first covering mask, else 0
+            for i, mask in enumerate(masks):
+                torch.maximum(top, mask * (n - i), out=top)
+            count = masks.sum(0)  # number of masks covering each pixel
+            blend = torch.cat([colors[n - top.long()].permute(2, 0, 1), (1 - alpha) ** count[None]])  # shape(4,h,w)
+            h, w = self.im.shape[:2]
+            if blend.shape[1:] != (h, w):
+                blend = ops.scale_masks(blend[None], (h, w))[0]
+            im = torch.from_numpy(self.im).to(masks.device)
+            im = im * blend[3, ..., None] + blend[:3].permute(1, 2, 0)
+            self.im[:] = im.clamp_(0, 255).byte().cpu().numpy()
+        if self.pil:
+            # Convert im back to PIL and update draw
+            self.fromarray(self.im)
+
     def kpts(self, kpts, shape=(640, 640), radius=5, kpt_line=True):
         """
         Plot keypoints on the image.
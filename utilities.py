@@ -1,21 +1,265 @@
+import queue
 import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
 from ultralytics import YOLO
+from ultralytics.engine.pool import InferencePool
 import streamlit as st
+import numpy as np
 import cv2
 
 import configurations
 
-def initialize_detector(detector_path):
+
+class PoolHandle:
+    """
+    A session's handle to a shared InferencePool, forwarding predict() and other attributes to the pool.
+
+    The registry counts live handles of each pool, so an evicted pool is only closed once no session holds it.
+    """
+
+    def __init__(self, pool):
+        """Wrap `pool` for one user."""
+        self.pool = pool
+
+    def __getattr__(self, name):
+        """Forward attribute access to the pool."""
+        return getattr(self.pool, name)
+
+
+class SharedModel:
+    """
+    A single YOLO model shared by all sessions, running each call's arguments and prediction under one lock.
+
+    Model.predict() writes its arguments to the shared predictor before taking the predictor lock, so without this
+    lock concurrent sessions could predict with each other's confidence thresholds. Calls run one at a time, as they
+    would on the predictor lock anyway. Other attributes are forwarded to the model.
+    """
+
+    def __init__(self, model):
+        """Wrap `model` for sharing between sessions."""
+        self.model = model
+        self.lock = threading.Lock()
+
+    def predict(self, *args, **kwargs):
+        """Predict with the model, see Model.predict(). Use stream=False, a stream would run outside the lock."""
+        with self.lock:
+            return self.model.predict(*args, **kwargs)
+
+    def predict_frame(self, frame, **kwargs):
+        """Predict one frame with the model, see Model.predict_frame()."""
+        with self.lock:
+            return self.model.predict_frame(frame, **kwargs)
+
+    def __getattr__(self, name):
+        """Forward attribute access to the model."""
+        return getattr(self.model, name)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded YOLO models shared by all Streamlit sessions.
+
+    Models are keyed by (model path, task, device, half) and kept in least-recently-used order. When the summed
+    size of the cached weights exceeds `max_bytes`, the least recently used models are evicted, always keeping the
+    model that was requested last. A single model is shared as a SharedModel, which keeps the prediction arguments
+    of concurrent sessions apart. Inference pools are handed out as PoolHandles, and an evicted pool is closed
+    only after the last handle to it is released, in a background thread so nobody waits for its workers.
+
+    Attributes:
+        max_bytes (int): Memory budget for all cached models, in bytes.
+        models (OrderedDict): Cached models in LRU order, mapping key -> (SharedModel or InferencePool, size in bytes).
+    """
+
+    def __init__(self, max_bytes=configurations.MODEL_CACHE_MAX_BYTES):
+        """
+        Initialize an empty registry.
+
+        Args:
+            max_bytes (int): Memory budget for all cached models, in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.models = OrderedDict()
+        self._lock = threading.Lock()  # guards self.models
+        self._load_locks = {}  # one lock per key so a model is only ever loaded once
+        self._users = {}  # InferencePool -> number of live PoolHandles
+        self._evicted = set()  # pools removed from the cache but still held by sessions
+
+    @staticmethod
+    def make_key(model_path, task=None, device=None, half=False):
+        """Return the cache key for a model configuration."""
+        return str(Path(model_path).resolve()), task, None if device is None else str(device), bool(half)
+
+    @staticmethod
+    def model_size(model):
+        """Return the memory used by the weights of a shared model, or of all replicas of a pool, in bytes."""
+        tensors = [x for m in getattr(model, "models", [model]) for x in (*m.model.parameters(), *m.model.buffers())]
+        return sum(x.numel() * x.element_size() for x in tensors)
+
+    @property
+    def total_bytes(self):
+        """Return the memory used by all cached models, in bytes."""
+        return sum(size for _, size in self.models.values())
+
+    def get(self, model_path, task=None, device=None, half=False):
+        """
+        Return a cached YOLO model, loading, fusing and warming it up on first use.
+
+        Args:
+            model_path (str | Path): Path to the YOLO model weights.
+            task (str, optional): Model task, e.g. 'detect' or 'segment'. Guessed from the weights if None.
+            device (str, optional): Device to run on, e.g. 'cpu' or '0'. Auto-selected if None.
+            half (bool): Whether to use FP16 inference.
+
+        Returns:
+            SharedModel | PoolHandle: The shared model, or a handle to the shared pool of replicas.
+        """
+        key = self.make_key(model_path, task, device, half)
+        with self._lock:
+            if key in self.models:
+                self.models.move_to_end(key)
+                return self.acquire(self.models[key][0])
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:  # concurrent sessions asking for the same model wait for a single load
+            with self._lock:
+                if key in self.models:
+                    self.models.move_to_end(key)
+                    return self.acquire(self.models[key][0])
+            model = self.load(model_path, task, device, half)
+            with self._lock:
+                self.models[key] = (model, self.model_size(model))
+                self._load_locks.pop(key, None)
+                handle = self.acquire(model)
+                idle = self.evict()
+        self.close(idle)
+        return handle
+
+    def acquire(self, model):
+        """Return `model`, or a new counted PoolHandle if it is an InferencePool. Call with the lock held."""
+        if not isinstance(model, InferencePool):
+            return model
+        handle = PoolHandle(model)
+        self._users[model] = self._users.get(model, 0) + 1
+        weakref.finalize(handle, self.release, model)
+        return handle
+
+    def release(self, pool):
+        """Count one handle of `pool` as released, closing the pool if it was evicted and this was the last one."""
+        with self._lock:
+            self._users[pool] -= 1
+            idle = self._users[pool] == 0 and pool in self._evicted
+            if idle:
+                self._evicted.discard(pool)
+            if not self._users[pool]:
+                del self._users[pool]
+        if idle:
+            self.close([pool])
+
+    @staticmethod
+    def close(pools):
+        """Close inference pools in background threads, without holding the registry lock."""
+        for pool in pools:
+            threading.Thread(target=pool.close, daemon=True).start()
+
+    @staticmethod
+    def load(model_path, task=None, device=None, half=False):
+        """
+        Load a YOLO model and run one dummy prediction so the predictor is set up, fused and warmed up.
+
+        The model is wrapped in a SharedModel, or with configurations.MODEL_POOL_REPLICAS > 1 in an InferencePool,
+        which has the same predict() and predict_frame() methods but serves concurrent sessions from several replicas
+        in parallel.
+        """
+        model = YOLO(model_path, task=task)
+        model.predict(np.zeros((64, 64, 3), dtype=np.uint8), device=device, half=half, verbose=False)
+        if configurations.MODEL_POOL_REPLICAS > 1:
+            model = InferencePool(
+                model,
+                replicas=configurations.MODEL_POOL_REPLICAS,
+                threads=configurations.MODEL_POOL_THREADS,
+                max_batch=configurations.MODEL_POOL_MAX_BATCH,
+                max_wait=configurations.MODEL_POOL_MAX_WAIT,
+                max_queue=configurations.MODEL_POOL_MAX_QUEUE,
+                device=device,
+                half=half,
+            )
+        return model if isinstance(model, InferencePool) else SharedModel(model)
+
+    def evict(self):
+        """
+        Drop least recently used models until the cache fits in the memory budget. Call with the lock held.
+
+        Returns:
+            (list): Evicted inference pools that no session holds, to close with close() after releasing the lock.
+        """
+        idle = []
+        while len(self.models) > 1 and self.total_bytes > self.max_bytes:
+            idle += self.discard(self.models.popitem(last=False)[1][0])
+        return idle
+
+    def discard(self, model):
+        """Return [model] if it is an InferencePool nobody holds, else mark held pools for closing on release."""
+        if not isinstance(model, InferencePool):
+            return []
+        if self._users.get(model):
+            self._evicted.add(model)
+            return []
+        return [model]
+
+    def clear(self):
+        """Remove all cached models, closing pools once no session holds them."""
+        with self._lock:
+            idle = [pool for model, _ in self.models.values() for pool in self.discard(model)]
+            self.models.clear()
+        self.close(idle)
+
+
+MODEL_REGISTRY = ModelRegistry()
+
+
+def initialize_detector(detector_path, task=None, device=configurations.MODEL_DEVICE, half=configurations.MODEL_HALF):
     """
-    Initialize the YOLO object detection model.
+    Initialize the YOLO object detection model, reusing the process-wide cached instance when available.
 
     Args:
         detector_path (str): Path to the YOLO model weights.
+        task (str, optional): Model task, guessed from the weights if None.
+        device (str, optional): Device to run on, auto-selected if None.
+        half (bool): Whether to use FP16 inference.
+
+    Returns:
+        SharedModel | PoolHandle: The shared YOLO model, see ModelRegistry.get().
+    """
+    return MODEL_REGISTRY.get(detector_path, task=task, device=device, half=half)
+
+
+def annotate_frames(confidence, detector, frames):
+    """
+    Run object detection on a batch of frames and draw the results on them.
+
+    All frames are passed to the detector in a single call, so preprocessing, inference and NMS run batched.
+
+    Args:
+        confidence (float): Detection confidence threshold.
+        detector (YOLO): YOLO object detection model.
+        frames (list): Input frames for object detection, all of the same size.
 
     Returns:
-        YOLO: Initialized YOLO model.
+        (list): Annotated frames in BGR format, in input order.
     """
-    return YOLO(detector_path)
+    # Use the detector to identify objects in the frames, single frames go through the cached fast path
+    if len(frames) == 1:
+        detection_results = [detector.predict_frame(frames[0], conf=confidence)]
+    else:
+        detection_results = detector.predict(frames, conf=confidence)
+
+    # Draw the results on the frames themselves, with all boxes and labels of a frame drawn in one pass
+    return [result.plot(fast=True, inplace=True) for result in detection_results]
 
 
 def show_detection_results(confidence, detector, streamlit_frame, frame):
@@ -29,43 +273,256 @@ def show_detection_results(confidence, detector, streamlit_frame, frame):
         frame: Input frame for object detection.
     """
     # Adjust the frame size
-    frame = cv2.resize(frame, (720, int(720 * (9 / 16))))
-
-    # Use the detector to identify objects in the frame
-    detection_results = detector.predict(frame, conf=confidence)
+    frame = cv2.resize(frame, (configurations.FRAME_WIDTH, configurations.FRAME_HEIGHT))
 
     # Display the results on the frame
-    plotted_results = detection_results[0].plot()
+    plotted_results = annotate_frames(confidence, detector, [frame])[0]
     streamlit_frame.image(plotted_results,
                         caption='Detection Output',
                         channels="BGR",
                         use_column_width=True)
 
 
-def play_video(confidence, model, video_source):
+class StageStats:
+    """
+    Throughput and latency counters for one stage of a VideoPipeline.
+
+    Attributes:
+        name (str): Name of the stage.
+        count (int): Number of frames processed by the stage.
+        busy (float): Total time spent processing frames, in seconds.
+        latency (float): Time per frame spent on the most recent frame or batch, in seconds.
+        start (float): Time the stage processed its first frame.
+    """
+
+    def __init__(self, name):
+        """Initialize empty counters for the stage called `name`."""
+        self.name = name
+        self.count = 0
+        self.busy = 0.0
+        self.latency = 0.0
+        self.start = None
+
+    def update(self, t0, t1, n=1):
+        """Record `n` frames processed together between times `t0` and `t1`."""
+        if self.start is None:
+            self.start = t0
+        self.count += n
+        self.latency = (t1 - t0) / n
+        self.busy += t1 - t0
+
+    @property
+    def fps(self):
+        """Return the frames per second produced by the stage since its first frame."""
+        elapsed = time.perf_counter() - self.start if self.start is not None else 0.0
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def mean_latency_ms(self):
+        """Return the average processing time per frame, in milliseconds."""
+        return self.busy / self.count * 1e3 if self.count else 0.0
+
+    def __str__(self):
+        """Return a one-line summary of the stage."""
+        return f"{self.name}: {self.fps:.1f} FPS, {self.mean_latency_ms:.1f} ms"
+
+
+class VideoPipeline:
+    """
+    Decoupled capture -> inference -> display pipeline for videos and webcams.
+
+    Frames are read by a capture thread and annotated by an inference thread, joined to the consumer by bounded
+    queues, so decoding, inference and rendering overlap and throughput is set by the slowest stage. Live sources
+    drop the oldest queued frame when a queue is full to keep latency low; files block instead so no frame is lost.
+    The display stage runs in the caller's thread, as Streamlit elements can only be updated from the script thread.
+
+    With `batch_size` > 1 the inference thread groups consecutive frames into a single predict call and yields the
+    annotated frames back in order. Files wait for a full batch; live sources only batch frames that are already
+    queued, so batching never adds latency to a webcam.
+
+    Attributes:
+        source (str | int): Video file path or camera index.
+        live (bool): Whether the source is live and frames may be dropped.
+        batch_size (int): Maximum number of frames per inference call.
+        stats (dict): StageStats for the 'capture', 'inference' and 'display' stages.
+        dropped (int): Number of frames dropped because a downstream stage was busy.
+
+    Examples:
+        ```python
+        pipeline = VideoPipeline(source, model, confidence, live=True)
+        for frame in pipeline:
+            st_frame.image(frame, channels="BGR")
+        ```
+    """
+
+    _END = object()  # end-of-stream sentinel
+
+    def __init__(
+        self, source, model, confidence, live=False, batch_size=1, queue_size=configurations.PIPELINE_QUEUE_SIZE
+    ):
+        """
+        Initialize the pipeline; threads are started when iteration begins.
+
+        Args:
+            source (str | int): Video file path or camera index.
+            model (YOLO): YOLO object detection model.
+            confidence (float): Detection confidence threshold.
+            live (bool): Drop the oldest frames when a stage falls behind instead of blocking.
+            batch_size (int): Maximum number of frames per inference call.
+            queue_size (int): Maximum number of frames buffered between two stages.
+        """
+        self.source = source
+        self.model = model
+        self.confidence = confidence
+        self.live = live
+        self.batch_size = max(int(batch_size), 1)
+        queue_size = max(queue_size, self.batch_size)  # room for a full batch on both sides of inference
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.results = queue.Queue(maxsize=queue_size)
+        self.stats = {name: StageStats(name) for name in ("capture", "inference", "display")}
+        self.dropped = 0
+        self.error = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _put(self, q, item):
+        """Put `item` on queue `q`, dropping the oldest item for live sources or blocking until there is room."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if self.live and item is not self._END:
+                    try:
+                        q.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def _get(self, q):
+        """Get the next item from queue `q`, returning the end sentinel if the pipeline is stopped."""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return self._END
+
+    def _capture(self):
+        """Capture thread: read and resize frames from the source."""
+        vid_cap = cv2.VideoCapture(self.source)
+        try:
+            while vid_cap.isOpened() and not self._stop.is_set():
+                t0 = time.perf_counter()
+                success, image = vid_cap.read()
+                if not success:
+                    break
+                image = cv2.resize(image, (configurations.FRAME_WIDTH, configurations.FRAME_HEIGHT))
+                self.stats["capture"].update(t0, time.perf_counter())
+                self._put(self.frames, image)
+        except Exception as e:
+            self.error = e
+        finally:
+            vid_cap.release()
+            self._put(self.frames, self._END)
+
+    def _next_batch(self):
+        """Collect up to `batch_size` captured frames, returning the batch and whether the source has ended."""
+        batch = []
+        while len(batch) < self.batch_size:
+            if batch and self.live:  # only take frames that are already waiting
+                try:
+                    image = self.frames.get_nowait()
+                except queue.Empty:
+                    break
+            else:
+                image = self._get(self.frames)
+            if image is self._END:
+                return batch, True
+            batch.append(image)
+        return batch, False
+
+    def _infer(self):
+        """Inference thread: run batched detection on captured frames and draw the results."""
+        try:
+            ended = False
+            while not ended:
+                batch, ended = self._next_batch()
+                if not batch:
+                    continue
+                t0 = time.perf_counter()
+                plotted = annotate_frames(self.confidence, self.model, batch)
+                self.stats["inference"].update(t0, time.perf_counter(), n=len(batch))
+                for image in plotted:
+                    self._put(self.results, image)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._put(self.results, self._END)
+
+    def start(self):
+        """Start the capture and inference threads."""
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._capture, daemon=True),
+            threading.Thread(target=self._infer, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Stop the pipeline and wait for its threads to finish."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def __iter__(self):
+        """Yield annotated BGR frames in order, timing the caller's display of each frame as the display stage."""
+        self.start()
+        try:
+            while True:
+                plotted = self._get(self.results)
+                if plotted is self._END:
+                    break
+                t0 = time.perf_counter()
+                yield plotted
+                self.stats["display"].update(t0, time.perf_counter())
+        finally:
+            self.stop()
+        if self.error is not None:
+            raise self.error
+
+    def summary(self):
+        """Return a one-line summary of the per-stage FPS and latency."""
+        dropped = f", {self.dropped} dropped" if self.live else ""
+        return " | ".join(str(s) for s in self.stats.values()) + dropped
+
+
+def play_video(confidence, model, video_source, batch_size=1):
     """
     Play video and perform object detection on each frame.
 
+    Capture, inference and display run concurrently through a VideoPipeline. Webcam frames are dropped when
+    inference falls behind so the displayed output stays live.
+
     Args:
         confidence (float): Detection confidence threshold.
         model (YOLO): YOLO object detection model.
         video_source (str): Source of the video ('webcam' or file path).
+        batch_size (int): Number of frames passed to the model per inference call.
     """
-    if video_source == "webcam":
-        source = configurations.WEBCAM_PATH
-    else:
-        source = video_source
+    live = video_source == "webcam"
+    source = configurations.WEBCAM_PATH if live else video_source
 
     try:
-        vid_cap = cv2.VideoCapture(source)
+        pipeline = VideoPipeline(source, model, confidence, live=live, batch_size=batch_size)
         st_frame = st.empty()
-        while vid_cap.isOpened():
-            success, image = vid_cap.read()
-            if success:
-                show_detection_results(confidence, model, st_frame, image)
-            else:
-                vid_cap.release()
-                break
+        st_stats = st.empty()
+        for i, image in enumerate(pipeline):
+            st_frame.image(image, caption='Detection Output', channels="BGR", use_column_width=True)
+            if i % configurations.PIPELINE_STATS_INTERVAL == 0:
+                st_stats.caption(pipeline.summary())
+        st_stats.caption(pipeline.summary())
     except Exception as e:
         st.sidebar.error(f"Error loading video: {str(e)}")
 